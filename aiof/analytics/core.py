@@ -264,10 +264,11 @@ def life_event(
         liabilities = req.liabilities)
 
     assets_df = helpers.assets_to_df(req.assets)
+    assets_totals = helpers.assets_totals_by_type(assets_df)
     
-    total_cash = assets_df.loc[assets_df["typeName"] == _asset_type.CASH]["value"].sum()
-    total_stock = assets_df.loc[assets_df["typeName"] == _asset_type.STOCK]["value"].sum()
-    total_investment = assets_df.loc[assets_df["typeName"] == _asset_type.INVESTMENT]["value"].sum()
+    total_cash = assets_totals.get(_asset_type.CASH, 0)
+    total_stock = assets_totals.get(_asset_type.STOCK, 0)
+    total_investment = assets_totals.get(_asset_type.INVESTMENT, 0)
 
     # Having a child
     if req.type.lower() == _life_event_type.HAVING_A_CHILD:
@@ -1,7 +1,7 @@
 import os
 
 from pydantic import BaseSettings
-from typing import List
+from typing import List, Optional
 from functools import lru_cache
 
 
@@ -14,9 +14,13 @@ class Settings(BaseSettings):
     DefaultInvestmentFee: float = os.getenv("DefaultFee", 0.50)
     DefaultTaxDrag: float = os.getenv("DefaultTaxDrag", 0.50)
     DefaultChild: int = os.getenv("DefaultChild", 2)
+    DefaultExportChunkSize: int = os.getenv("DefaultExportChunkSize", 1000)
+    DefaultSimulationChunkSize: int = os.getenv("DefaultSimulationChunkSize", 2000)
+    HistoricalReturnsPath: Optional[str] = os.getenv("HistoricalReturnsPath", None)
 
     DefaultYears: List[int] = [ 2, 5, 10, 20, 30 ]
     DefaultShortYears: List[int] = [ 5, 10, 30 ]
+    DefaultPercentiles: List[int] = [ 10, 25, 50, 75, 90 ]
     DefaultInterests: list = [ 
         2,
         4,
@@ -59,6 +63,14 @@ class Settings(BaseSettings):
         "yearly": "year"
     }
 
+    # Export
+    ExportFormats: dict = {
+        "csv": "text/csv",
+        "ndjson": "application/x-ndjson",
+        "arrow": "application/vnd.apache.arrow.stream",
+        "parquet": "application/vnd.apache.parquet"
+    }
+
     # FI specific
     DefaultTenMillion: list = [
         1000000,
@@ -73,6 +85,7 @@ class Settings(BaseSettings):
         10000000,
         100000000,
     ]
+    TenMillionDreamCacheSize: int = os.getenv("TenMillionDreamCacheSize", 256)
     DefaultTenMillionInterests: list = [
         0,
         1,
@@ -88,6 +101,22 @@ class Settings(BaseSettings):
     ]
     # End FI specific
 
+    # Retirement specific
+    # Ordinary income tax brackets as [taxable income threshold, rate in %]. 2023 federal, single filer
+    TaxBrackets: List[List[float]] = [
+        [0, 10],
+        [11000, 12],
+        [44725, 22],
+        [95375, 24],
+        [182100, 32],
+        [231250, 35],
+        [578125, 37]
+    ]
+    StandardDeduction: float = os.getenv("StandardDeduction", 13850)
+    DefaultCapitalGainsRate: float = os.getenv("DefaultCapitalGainsRate", 15)
+    DefaultRothConversions: List[float] = [ 0, 10000, 20000, 30000, 40000, 50000, 60000, 70000, 80000, 90000, 100000 ]
+    # End Retirement specific
+
     cors_origins: list = [
         "http://localhost:4100",
         "http://localhost:1337"
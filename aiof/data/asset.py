@@ -1,7 +1,7 @@
 from datetime import datetime
 
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Union
 
 
 # Assets
@@ -37,6 +37,11 @@ class Asset(BaseModel):
     def add(self, value):
         self.value + value
 
+class AssetsColumnar(BaseModel):
+    names: Optional[List[Optional[str]]]
+    typeNames: List[str]
+    values: List[float]
+
 class AssetFv(BaseModel):
     year: Optional[int]
     typeName: Optional[str]
@@ -60,19 +65,19 @@ class ComparableAsset(BaseModel):
 
     marketValue: Optional[float] = None                         # What if asset's value is invested in the market at [interest]% return?
     marketBeginValue: Optional[float] = None                       # When the compounding is at the beginning
-    marketValueBreakdown: Optional[list] = None                    # Breakdown of each year
+    marketValueBreakdown: Optional[Union[dict, list]] = None       # Breakdown of each year
 
     marketWithContributionValue: Optional[float] = None         # What if asset's value is invested in the market at [interest]% return with monthly contributions?
     marketBeginWithContributionValue: Optional[float] = None        # When the compounding is at the beginning
-    marketWithContributionValueBreakdown: Optional[list] = None     # Breakdown of each year
+    marketWithContributionValueBreakdown: Optional[Union[dict, list]] = None # Breakdown of each year
 
     hysValue: Optional[float] = None                            # What if asset's value is put in a High Yield Savings Account at 1.75% interest?
     hysBeginValue: Optional[float] = None                           # When the compounding is at the beginning
-    hysValueBreakdown: Optional[list] = None                        # Breakdown of each year
+    hysValueBreakdown: Optional[Union[dict, list]] = None           # Breakdown of each year
 
     hysWithContributionValue: Optional[float] = None            # What if asset's value is put in a High Yield Savings Account at 1.75% interest with monthly contributions?
     hysBeginWithContributionValue: Optional[float] = None           # When the compounding is at the beginning
-    hysWithContributionValueBreakdown: Optional[list] = None        # Breakdown of each year
+    hysWithContributionValueBreakdown: Optional[Union[dict, list]] = None # Breakdown of each year
 
     def init_values(self):
         self.interest = self.interest if self.interest is not None else _default_interest
@@ -1,7 +1,7 @@
 import datetime
 
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Union
 
 
 class FiTime(BaseModel):
@@ -10,6 +10,26 @@ class FiTime(BaseModel):
     desiredYearsExpensesForFi: Optional[int] = None
     desiredAnnualSpending: Optional[float] = None
 
+class FiTimeBatch(BaseModel):
+    startingAmounts: Optional[List[float]] = None
+    monthlyInvestments: Optional[List[float]] = None
+    desiredYearsExpensesForFi: Optional[List[int]] = None
+    desiredAnnualSpendings: Optional[List[float]] = None
+    interests: Optional[List[float]] = None
+
+class FiTimeMonteCarlo(BaseModel):
+    startingAmount: Optional[float] = None
+    monthlyInvestment: Optional[float] = None
+    desiredYearsExpensesForFi: Optional[int] = None
+    desiredAnnualSpending: Optional[float] = None
+    mean: Optional[float] = None
+    volatility: Optional[float] = None
+    distribution: Optional[str] = None
+    paths: Optional[int] = None
+    maxYears: Optional[int] = None
+    percentiles: Optional[List[float]] = None
+    seed: Optional[int] = None
+
 class FiRuleOf72(BaseModel):
     startingAmount: Optional[float] = None
     interest: Optional[float] = None
@@ -26,6 +46,15 @@ class FiCompoundInterest(BaseModel):
     investmentFees: Optional[float] = None
     taxDrag: Optional[float] = None
 
+class FiCompoundInterestGrid(BaseModel):
+    startingAmount: Optional[float] = None
+    monthlyInvestment: Optional[float] = None
+    interests: Optional[List[float]] = None
+    numbersOfYears: Optional[List[int]] = None
+    investmentFees: Optional[List[float]] = None
+    taxDrag: Optional[float] = None
+    frequencies: Optional[List[int]] = None
+
 class FiInvestmentFeesEffect(BaseModel):
     ageAtCareerStart: Optional[int] = None
     interestReturnWhileWorking: Optional[float] = None
@@ -34,6 +63,8 @@ class FiInvestmentFeesEffect(BaseModel):
     annualSavingsFirstDecade: Optional[float] = None
     annualSavingsSecondDecade: Optional[float] = None
     annualWithdrawalThirdDecade: Optional[float] = None
+    fees: Optional[List[float]] = None
+    retirementDecades: Optional[int] = None
 
 class FiRaisingChildren(BaseModel):
     annualExpensesStart: Optional[float] = None
@@ -41,6 +72,13 @@ class FiRaisingChildren(BaseModel):
     children: Optional[list] = None
     interests: Optional[list] = None
 
+class FiRaisingChildrenGrid(BaseModel):
+    annualExpensesStart: Optional[float] = None
+    annualExpensesIncrement: Optional[float] = None
+    children: Optional[List[int]] = None
+    interests: Optional[List[float]] = None
+    years: Optional[List[int]] = None
+
 class SavingsRate(BaseModel):
     salary: Optional[float] = None
     matchAndProfitSharing: Optional[float] = None
@@ -62,6 +100,28 @@ class SavingsRate(BaseModel):
     otherPostTaxInvestment: Optional[float] = None
     currentNestEgg: Optional[float] = None
 
+class SavingsRateBatch(BaseModel):
+    salary: Optional[List[float]] = None
+    matchAndProfitSharing: Optional[List[float]] = None
+    federalIncomeTax: Optional[List[float]] = None
+    stateIncomeTax: Optional[List[float]] = None
+    fica: Optional[List[float]] = None
+    healthAndDentalInsurance: Optional[List[float]] = None
+    otherDeductibleBenefits: Optional[List[float]] = None
+    hsaInvestment: Optional[List[float]] = None
+    fourOhOneKOrFourOhThreeB: Optional[List[float]] = None
+    fourFiveSevenB: Optional[List[float]] = None
+    sepIra: Optional[List[float]] = None
+    otherTaxDeferred: Optional[List[float]] = None
+    rothIra: Optional[List[float]] = None
+    taxableAccount: Optional[List[float]] = None
+    education: Optional[List[float]] = None
+    mortgagePrincipal: Optional[List[float]] = None
+    studentLoanPrincipal: Optional[List[float]] = None
+    otherPostTaxInvestment: Optional[List[float]] = None
+    currentNestEgg: Optional[List[float]] = None
+    interests: Optional[List[float]] = None
+
 
 class BmiImperial(BaseModel):
     weight: float
@@ -91,4 +151,23 @@ class CoastFireSavings(BaseModel):
 class CoastFireSavingsRequest(BaseModel):
     savings: List[CoastFireSavings]
     initialInterestRate: Optional[float]    = 0.02
-    currentBalance: Optional[float]         = 100000
\ No newline at end of file
+    currentBalance: Optional[float]         = 100000
+
+class CoastFireSavingsColumnar(BaseModel):
+    ages: List[int]
+    years: List[int]
+    contributions: Union[List[List[float]], List[float]]    # One row per what-if variant, or a single plan
+    yearlyReturns: Union[List[List[float]], List[float]]    # Yearly returns as decimals, broadcast against contributions
+    initialInterestRate: Optional[float]                    = 0.02
+    currentBalance: Optional[Union[List[float], float]]     = 100000
+
+class CoastFireTargetRequest(BaseModel):
+    currentAge: int
+    retirementAge: int
+    targetSpending: float
+    yearlyReturns: Optional[Union[List[float], float]]      = 0.07
+    withdrawalRate: Optional[float]                         = 4
+    coastAges: Optional[List[int]]
+    solveFor: Optional[str]                                 = "contribution"
+    currentBalance: Optional[float]                         = 100000
+    contribution: Optional[float]                           = 0
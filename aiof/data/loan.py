@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+
+# Loan
+# Generic level-payment loan models
+
+
+class LoanPaymentsRequest(BaseModel):
+    loanAmount: float
+    numberOfYears: int
+    rateOfInterest: float
+    frequency: Optional[str] = "monthly"
+
+class LoanPaymentsTotalsRequest(BaseModel):
+    loanAmounts: List[float]
+    numberOfYears: List[float]
+    ratesOfInterest: List[float]
+    frequencies: List[str]
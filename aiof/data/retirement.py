@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List, Dict
 
 
 class WithdrawalRequest(BaseModel):
@@ -7,6 +7,47 @@ class WithdrawalRequest(BaseModel):
     takeOutPercentage: float
     numberOfYears: float
 
+class WithdrawalBatchRequest(BaseModel):
+    retirementNumbers: Optional[List[float]]
+    takeOutPercentages: Optional[List[float]]
+    numberOfYears: Optional[int]
+    interests: Optional[List[float]]
+
+class WithdrawalBacktestRequest(BaseModel):
+    retirementNumber: Optional[float]
+    takeOutPercentage: Optional[float]
+    numberOfYears: Optional[int]
+    stocksAllocation: Optional[float]
+    inflationAdjusted: Optional[bool] = True
+
+class SafeWithdrawalRateRequest(BaseModel):
+    numbersOfYears: Optional[List[int]]
+    successRates: Optional[List[float]]
+    method: Optional[str]
+    retirementNumber: Optional[float]
+    interests: Optional[List[float]]
+    mean: Optional[float]
+    volatility: Optional[float]
+    distribution: Optional[str]
+    paths: Optional[int]
+    seed: Optional[int]
+    stocksAllocations: Optional[List[float]]
+    inflationAdjusted: Optional[bool] = True
+
+class WithdrawalStrategiesRequest(BaseModel):
+    strategies: Optional[List[str]]
+    retirementNumber: Optional[float]
+    takeOutPercentage: Optional[float]
+    numberOfYears: Optional[int]
+    method: Optional[str]
+    mean: Optional[float]
+    volatility: Optional[float]
+    distribution: Optional[str]
+    paths: Optional[int]
+    seed: Optional[int]
+    stocksAllocation: Optional[float]
+    params: Optional[Dict[str, Dict[str, float]]]
+
 class CommonInvestmentsRequest(BaseModel):
     interest: Optional[float]
     startYear: Optional[int]
@@ -19,10 +60,45 @@ class CommonInvestmentsRequest(BaseModel):
     brokerageStartingAmount: Optional[float]
     brokerageMonthlyContributions: Optional[float]
 
+class InvestmentAccountsRequest(BaseModel):
+    names: Optional[List[str]]
+    startingAmounts: Optional[List[float]]
+    monthlyContributions: Optional[List[float]]
+    interests: Optional[List[float]]
+    contributionGrowths: Optional[List[float]]
+    startYear: Optional[int]
+    endYear: Optional[int]
+    compoundingPeriods: Optional[int]
+
+class DecumulationRequest(BaseModel):
+    fourOhOneKBalance: Optional[float]
+    rothIraBalance: Optional[float]
+    brokerageBalance: Optional[float]
+    brokerageBasisPercentage: Optional[float]
+    annualSpending: Optional[float]
+    otherIncome: Optional[float]
+    numberOfYears: Optional[int]
+    interest: Optional[float]
+    inflation: Optional[float]
+    orderings: Optional[List[List[str]]]
+    conversions: Optional[List[float]]
+    taxBrackets: Optional[List[List[float]]]
+    standardDeduction: Optional[float]
+    capitalGainsRate: Optional[float]
+    endingTaxRate: Optional[float]
+
 class NumberSimpleRequest(BaseModel):
     currentSalary: Optional[float]
 
 class NumberRequest(BaseModel):
     desiredRetirementAge:   Optional[int]
     desiredMonthlyIncome:   Optional[float]
-    retirementEndAge:       Optional[int]
\ No newline at end of file
+    retirementEndAge:       Optional[int]
+
+class NumberBatchRequest(BaseModel):
+    currentAges:            Optional[List[int]]
+    desiredRetirementAges:  Optional[List[int]]
+    retirementEndAges:      Optional[List[int]]
+    desiredMonthlyIncomes:  Optional[List[float]]
+    inflations:             Optional[List[float]]
+    interests:              Optional[List[float]]
\ No newline at end of file
@@ -1,9 +1,12 @@
 import math
+import numpy as np
 import numpy_financial as npf
 import pandas as pd
 
 import aiof.config as config
+import aiof.helpers as helpers
 
+from functools import lru_cache
 from typing import List
 
 
@@ -16,6 +19,9 @@ _fees = _settings.DefaultFees
 _children = _settings.DefaultChildren
 _ten_million = _settings.DefaultTenMillion
 _ten_million_interests = _settings.DefaultTenMillionInterests
+_ten_million_cache_size = _settings.TenMillionDreamCacheSize
+_percentiles = _settings.DefaultPercentiles
+_simulation_chunk_size = _settings.DefaultSimulationChunkSize
 
 
 # Financial Indepdence (FI) core
@@ -52,18 +58,18 @@ def time_to_fi(
     desired_retirement_savings_for_fi = desired_years_expenses_for_fi * desired_annual_spending
     current_deficit = desired_retirement_savings_for_fi - starting_amount
 
-    years_to_goal_obj = []
-    for interest in _interests:
-        years_to_goal = npf.nper(
-            (interest / 100)/12, 
-            monthly_investment * -1,
-            starting_amount * -1,
-            desired_retirement_savings_for_fi) / 12
+    years_to_goal = npf.nper(
+        (np.asarray(_interests) / 100)/12, 
+        monthly_investment * -1,
+        starting_amount * -1,
+        desired_retirement_savings_for_fi) / 12
 
+    years_to_goal_obj = []
+    for interest, years in zip(_interests, years_to_goal):
         years_to_goal_obj.append(
             {
                 "interest": interest,
-                "years": round(years_to_goal, 1),
+                "years": round(years, 1),
             })
 
     return {
@@ -77,6 +83,185 @@ def time_to_fi(
     }
 
 
+def time_to_fi_monte_carlo(
+    starting_amount: float = None,
+    monthly_investment: float = None,
+    desired_years_expenses_for_fi: int = None,
+    desired_annual_spending: float = None,
+    mean: float = None,
+    volatility: float = None,
+    distribution: str = None,
+    paths: int = None,
+    max_years: int = None,
+    percentiles: List[float] = None,
+    seed: int = None,
+    chunk_size: int = None):
+    """
+    Find out how likely you are to reach FI (financial independence) by each year, simulating many 
+    sequences of monthly real returns instead of a single fixed return
+
+    Parameters
+    ----------
+    `starting_amount` : float or None.
+        starting amount. defaults to `800,000`\n
+    `monthly_investment` : float or None.
+        monthly investment over the years. defaults to `5,000`\n
+    `desired_years_expenses_for_fi` : int or None.
+        desired years of expenses after one retires. defaults to `25`\n
+    `desired_annual_spending` : float or None.
+        desired annual spending amount after one retires. defaults to `100,000`\n
+    `mean` : float or None.
+        mean annual real return, in %. defaults to `5`\n
+    `volatility` : float or None.
+        annual volatility (standard deviation) of the real return, in %. defaults to `15`\n
+    `distribution` : str or None.
+        `normal` or `lognormal` returns. defaults to `lognormal`\n
+    `paths` : int or None.
+        number of simulated paths. defaults to `10,000`\n
+    `max_years` : int or None.
+        number of years to simulate. defaults to `50`\n
+    `percentiles` : list or None.
+        percentiles of the years to FI to report. defaults to `[10,25,50,75,90]`\n
+    `seed` : int or None.
+        seed of the random generator, for reproducible results\n
+    `chunk_size` : int or None.
+        number of paths simulated at once. bounds memory to `chunk_size` x months. defaults to `Settings.DefaultSimulationChunkSize`
+
+    Notes
+    ----------
+    Each chunk is a paths x months matrix of returns. Balances follow from the cumulative growth factor 
+    `G_t` in closed form, `B_t = G_t * (B_0 + pmt * sum(1 / G_s))`, so no month by month loop is needed. 
+    Only the month each path reaches FI is kept between chunks. Percentiles that are never reached 
+    within `max_years` are `None`
+    """
+    starting_amount = starting_amount if starting_amount is not None else 800000
+    monthly_investment = monthly_investment if monthly_investment is not None else 5000
+    desired_years_expenses_for_fi = desired_years_expenses_for_fi if desired_years_expenses_for_fi is not None else 25
+    desired_annual_spending = desired_annual_spending if desired_annual_spending is not None else 100000
+    mean = mean if mean is not None else 5
+    volatility = volatility if volatility is not None else 15
+    distribution = distribution if distribution is not None else "lognormal"
+    paths = paths if paths is not None else 10000
+    max_years = max_years if max_years is not None else 50
+    percentiles = percentiles if percentiles is not None else _percentiles
+    chunk_size = chunk_size if chunk_size is not None else _simulation_chunk_size
+
+    if paths < 1:
+        raise ValueError("Paths must be at least 1")
+    if max_years < 1:
+        raise ValueError("Max years must be at least 1")
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+
+    desired_retirement_savings_for_fi = desired_years_expenses_for_fi * desired_annual_spending
+    months = max_years * 12
+    rng = np.random.default_rng(seed)
+
+    # Month in which each path first reaches FI. `months + 1` marks paths that never do
+    months_to_fi = np.empty(paths, dtype=np.int64)
+    for start in range(0, paths, chunk_size):
+        size = min(chunk_size, paths - start)
+        returns = helpers.simulate_returns(mean, volatility, size, months, distribution, seed=rng)
+        growth = np.cumprod(1 + returns, axis=1)
+        balances = growth * (starting_amount + monthly_investment * np.cumsum(1 / growth, axis=1))
+        reached = balances >= desired_retirement_savings_for_fi
+        months_to_fi[start:start + size] = np.where(reached.any(axis=1), reached.argmax(axis=1) + 1, months + 1)
+    if starting_amount >= desired_retirement_savings_for_fi:
+        months_to_fi[:] = 0
+
+    years = np.arange(1, max_years + 1)
+    probabilities = np.searchsorted(np.sort(months_to_fi), years * 12, side="right") / paths
+
+    # Nearest-rank percentiles of the years to FI
+    ranks = np.clip(np.ceil(np.asarray(percentiles, dtype=float) / 100 * paths).astype(int) - 1, 0, paths - 1)
+    percentile_years = np.sort(months_to_fi)[ranks] / 12
+    percentile_years = np.where(percentile_years <= max_years, np.round(percentile_years, 1), np.nan)
+
+    return {
+        "startingAmount": starting_amount,
+        "monthlyInvestment": monthly_investment,
+        "desiredYearsExpensesForFi": desired_years_expenses_for_fi,
+        "desiredAnnualSpending": desired_annual_spending,
+        "desiredRetirementSavingsForFi": desired_retirement_savings_for_fi,
+        "mean": mean,
+        "volatility": volatility,
+        "distribution": distribution,
+        "paths": paths,
+        "probabilities": [{ "year": int(year), "probability": round(float(p), 4) } for year, p in zip(years, probabilities)],
+        "percentiles": [{ "percentile": p, "years": y } for p, y in zip(percentiles, _finite_or_none(percentile_years))]
+    }
+
+
+def time_to_fi_batch(
+    starting_amounts: List[float] = None,
+    monthly_investments: List[float] = None,
+    desired_years_expenses_for_fi: List[int] = None,
+    desired_annual_spendings: List[float] = None,
+    interests: List[float] = None):
+    """
+    Find out how many years many investor profiles have left in their path to FI (financial independence), 
+    at various real returns on their investments, in one call
+
+    Parameters
+    ----------
+    `starting_amounts` : list or None.
+        starting amount of each profile. defaults to `800,000`\n
+    `monthly_investments` : list or None.
+        monthly investment of each profile. defaults to `5,000`\n
+    `desired_years_expenses_for_fi` : list or None.
+        desired years of expenses after each profile retires. defaults to `25`\n
+    `desired_annual_spendings` : list or None.
+        desired annual spending after each profile retires. defaults to `100,000`\n
+    `interests` : list or None.
+        real returns to evaluate every profile at. defaults to `[2,4,6,8]`
+
+    Notes
+    ----------
+    The profile inputs are broadcast against each other, so a single value applies to every profile. 
+    Every profile x interest pair is evaluated in one `helpers.nper` call and `years` is returned as a 
+    profiles x interests matrix. Goals that can't be reached are `None`
+    """
+    starting_amounts = starting_amounts if starting_amounts is not None else 800000
+    monthly_investments = monthly_investments if monthly_investments is not None else 5000
+    desired_years_expenses_for_fi = desired_years_expenses_for_fi if desired_years_expenses_for_fi is not None else 25
+    desired_annual_spendings = desired_annual_spendings if desired_annual_spendings is not None else 100000
+    interests = interests if interests is not None else _interests
+
+    starting_amounts, monthly_investments, desired_years_expenses_for_fi, desired_annual_spendings = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(starting_amounts, dtype=float)),
+        np.asarray(monthly_investments, dtype=float),
+        np.asarray(desired_years_expenses_for_fi, dtype=float),
+        np.asarray(desired_annual_spendings, dtype=float))
+    interests = np.asarray(interests, dtype=float)
+
+    desired_retirement_savings_for_fi = desired_years_expenses_for_fi * desired_annual_spendings
+    current_deficit = desired_retirement_savings_for_fi - starting_amounts
+
+    years_to_goal = helpers.nper(
+        (interests[None, :] / 100) / 12,
+        -monthly_investments[:, None],
+        -starting_amounts[:, None],
+        desired_retirement_savings_for_fi[:, None]) / 12
+
+    return {
+        "interests": interests.tolist(),
+        "startingAmounts": starting_amounts.tolist(),
+        "monthlyInvestments": monthly_investments.tolist(),
+        "desiredYearsExpensesForFi": desired_years_expenses_for_fi.tolist(),
+        "desiredAnnualSpendings": desired_annual_spendings.tolist(),
+        "desiredRetirementSavingsForFi": desired_retirement_savings_for_fi.tolist(),
+        "currentDeficits": current_deficit.tolist(),
+        "years": _finite_or_none(np.round(years_to_goal, 1))
+    }
+
+
+def _finite_or_none(values: np.ndarray) -> list:
+    """
+    Convert an array to (nested) lists, replacing `nan` and `inf` with `None` so it can be serialized
+    """
+    return np.where(np.isfinite(values), values, None).tolist()
+
+
 def rule_of_72(
     starting_amount: float,
     interest: float):
@@ -173,30 +358,48 @@ def ten_million_dream(monthly_investment: float):
     Notes
     ----------
     Based on Physician on FIRE's calculator: https://www.physicianonfire.com/calculators/10-million-dream/
+
+    The whole goal x interest grid is evaluated in one `helpers.nper` call. Results are kept in a bounded LRU 
+    cache keyed on `monthly_investment` (`Settings.TenMillionDreamCacheSize` entries), so repeated inputs 
+    are answered without computing anything. The returned list is shared between calls and must not be 
+    modified. See `ten_million_dream_cache_info()` for the hit and miss counters
     """
     monthly_investment = monthly_investment if monthly_investment is not None else 10000
+    return _ten_million_dream(float(monthly_investment))
+
+
+@lru_cache(maxsize=_ten_million_cache_size)
+def _ten_million_dream(monthly_investment: float):
+    years = helpers.nper(
+        (np.asarray(_ten_million_interests)[None, :] / 100)/12, 
+        -monthly_investment,
+        0,
+        np.asarray(_ten_million)[:, None],
+        when='begin') / 12
+    years = _finite_or_none(np.round(years, 1))
 
     ten_million_obj = []
-    for million in _ten_million:
-        million_interests_obj = []
-        for interest in _ten_million_interests:
-            years = npf.nper(
-                (interest / 100)/12, 
-                -monthly_investment,
-                0,
-                million,
-                when='begin') / 12
-            million_interests_obj.append({
-                    "interest": interest,
-                    "years": round(years, 1)
-                })
+    for million, million_years in zip(_ten_million, years):
         ten_million_obj.append({
             "million": million,
-            "years": million_interests_obj
+            "years": [{ "interest": interest, "years": y } for interest, y in zip(_ten_million_interests, million_years)]
         })
     return ten_million_obj
 
 
+def ten_million_dream_cache_info() -> dict:
+    """
+    Hit and miss counters of the `ten_million_dream()` result cache
+    """
+    info = _ten_million_dream.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "maxSize": info.maxsize,
+        "currentSize": info.currsize
+    }
+
+
 def compound_interest(
     starting_amount: float,
     monthly_investment: float,
@@ -234,25 +437,106 @@ def compound_interest(
     investment_fees = investment_fees if investment_fees is not None else 0.50
     tax_drag = tax_drag if tax_drag is not None else 0.50
 
-    compound_interest_obj = []
-    for frequency in _frequencies:
-        rate = ((interest_rate - investment_fees - tax_drag) / 100) / frequency
-        nper = number_of_years * frequency
-        pmt = (monthly_investment * 12) / frequency
-        fv_begin = -npf.fv(rate, nper, pmt, starting_amount, when='begin')
-        fv_end = -npf.fv(rate, nper, pmt, starting_amount, when='end')
-        compound_interest_obj.append({
-            "startingAmount": starting_amount,
-            "monthlyInvestment": monthly_investment,
-            "interest": interest_rate,
-            "numberOfYears": number_of_years,
-            "investmentFees": investment_fees,
-            "taxDrag": tax_drag,
-            "frequency": frequency,
-            "compoundedBeginning": math.ceil(fv_begin),
-            "compoundedEnd": math.ceil(fv_end)
+    return compound_interest_grid(
+        starting_amount,
+        monthly_investment,
+        [interest_rate],
+        [number_of_years],
+        [investment_fees],
+        tax_drag,
+        as_records=True)
+
+
+def compound_interest_grid(
+    starting_amount: float = None,
+    monthly_investment: float = None,
+    interest_rates: List[float] = None,
+    numbers_of_years: List[int] = None,
+    investment_fees: List[float] = None,
+    tax_drag: float = None,
+    frequencies: List[int] = None,
+    as_records: bool = False):
+    """
+    Compound interest calculator over every combination of interest rates, numbers of years, investment fees 
+    and compounding frequencies, with additions made at the beginning or end of each period
+
+    Parameters
+    ----------
+    `starting_amount` : float or None.
+        starting amount. defaults to `0`\n
+    `monthly_investment` : float or None.
+        monthly investment over the years. defaults to `5,000`\n
+    `interest_rates` : list or None.
+        interest rates at which the compounding is calculated. defaults to `[7]`\n
+    `numbers_of_years` : list or None.
+        numbers of years for which the compounding is calculated. defaults to `[25]`\n
+    `investment_fees` : list or None.
+        investment fees (if any) to subtract from the interest rate. defaults to `[0.50]`\n
+    `tax_drag` : float or None.
+        tax drag (if any) to subtract from the interest rate. defaults to `0.50`\n
+    `frequencies` : list or None.
+        compounding periods per year. defaults to `Settings.DefaultFrequencies`\n
+    `as_records` : bool.
+        return a flat list of records, one per combination, instead of the dense grid. defaults to `False`
+
+    Notes
+    ----------
+    The grid is evaluated in one broadcast `npf.fv` call over interest rates x numbers of years x investment fees x 
+    frequencies x beginning/end timing. `compoundedBeginning` and `compoundedEnd` are indexed 
+    `[interestRates, numbersOfYears, investmentFees, frequencies]`
+    """
+    starting_amount = starting_amount if starting_amount is not None else 0
+    monthly_investment = monthly_investment if monthly_investment is not None else 5000
+    interest_rates = np.asarray(interest_rates if interest_rates is not None else [7])
+    numbers_of_years = np.asarray(numbers_of_years if numbers_of_years is not None else [25])
+    investment_fees = np.asarray(investment_fees if investment_fees is not None else [0.50])
+    tax_drag = tax_drag if tax_drag is not None else 0.50
+    frequencies = np.asarray(frequencies if frequencies is not None else _frequencies)
+
+    if frequencies.size == 0 or np.any(frequencies <= 0) or np.any(frequencies != np.round(frequencies)):
+        raise ValueError("Frequencies must be positive whole numbers")
+    frequencies = frequencies.astype(int)
+
+    # Axes: interest rate, number of years, investment fees, frequency, when (begin, end)
+    rate = ((interest_rates[:, None, None, None, None] - investment_fees[None, None, :, None, None] - tax_drag) / 100) \
+        / frequencies[None, None, None, :, None]
+    nper = numbers_of_years[None, :, None, None, None] * frequencies[None, None, None, :, None]
+    pmt = (monthly_investment * 12) / frequencies[None, None, None, :, None]
+    when = np.array([1, 0])
+
+    # Future value, like `-npf.fv`, with the zero-rate case handled on its own instead of dividing by 0
+    zero_rate = rate == 0
+    safe_rate = np.where(zero_rate, 1, rate)
+    growth = (1 + rate) ** nper
+    annuity = np.where(zero_rate, nper, (1 + safe_rate * when) * (growth - 1) / safe_rate)
+    compounded = np.ceil(starting_amount * growth + pmt * annuity).astype(np.int64)
+    compounded_beginning, compounded_end = compounded[..., 0], compounded[..., 1]
+
+    if as_records:
+        r, y, f, q = np.indices(compounded_beginning.shape).reshape(4, -1)
+        size = len(r)
+        return helpers._columns_to_records({
+            "startingAmount": [starting_amount] * size,
+            "monthlyInvestment": [monthly_investment] * size,
+            "interest": interest_rates[r].tolist(),
+            "numberOfYears": numbers_of_years[y].tolist(),
+            "investmentFees": investment_fees[f].tolist(),
+            "taxDrag": [tax_drag] * size,
+            "frequency": frequencies[q].tolist(),
+            "compoundedBeginning": compounded_beginning.ravel().tolist(),
+            "compoundedEnd": compounded_end.ravel().tolist()
         })
-    return compound_interest_obj
+    return {
+        "startingAmount": starting_amount,
+        "monthlyInvestment": monthly_investment,
+        "interestRates": interest_rates.tolist(),
+        "numbersOfYears": numbers_of_years.tolist(),
+        "investmentFees": investment_fees.tolist(),
+        "taxDrag": tax_drag,
+        "frequencies": frequencies.tolist(),
+        "compoundedBeginning": compounded_beginning.tolist(),
+        "compoundedEnd": compounded_end.tolist()
+    }
 
 
 def investment_fees_effect(
@@ -262,7 +546,9 @@ def investment_fees_effect(
     tax_drag: float,
     annual_savings_1_decade: float,
     annual_savings_2_decade: float,
-    annual_withdrawal_3_decade: float):
+    annual_withdrawal_3_decade: float,
+    fees: List[float] = None,
+    retirement_decades: int = None):
     """
     Effects of investment fees
 
@@ -283,10 +569,16 @@ def investment_fees_effect(
     `annual_withdrawal_3_decade` : float or None.
         the amount of withdrawal in the 3rd decade of retirement. the other decades are calculated accordingly - 
         additional percentages. defaults to `70,000`\n
+    `fees` : list or None.
+        investment fees to compare. defaults to `[0.10,0.50,1.00,1.50,2.00,2.50,3.00]`\n
+    `retirement_decades` : int or None.
+        number of decades to project after the two working decades. defaults to `5`
 
     Notes
     ----------
     Based on Physician on FIRE's calculator: https://www.physicianonfire.com/calculators/fees-effect-calculator/
+
+    Every fee x decade pair is evaluated in broadcast `npf.fv` calls, so long fee lists are cheap
     """
     age_at_career_start = age_at_career_start if age_at_career_start is not None else 32
     interest_return_while_working = interest_return_while_working if interest_return_while_working is not None else 8
@@ -295,109 +587,50 @@ def investment_fees_effect(
     annual_savings_1_decade = annual_savings_1_decade if annual_savings_1_decade is not None else 50000
     annual_savings_2_decade = annual_savings_2_decade if annual_savings_2_decade is not None else 100000
     annual_withdrawal_3_decade = annual_withdrawal_3_decade if annual_withdrawal_3_decade is not None else 70000
+    fees = fees if fees is not None else _fees
+    retirement_decades = retirement_decades if retirement_decades is not None else 5
+
+    if retirement_decades < 1:
+        raise ValueError("Retirement decades must be at least 1")
 
     annual_withdrawal_4_decade = math.ceil(1.25 * annual_withdrawal_3_decade)
     annual_withdrawal_5_decade = math.ceil(1.25 * annual_withdrawal_4_decade)
     annual_withdrawal_6_decade = annual_withdrawal_5_decade
     annual_withdrawal_7_decade = annual_withdrawal_5_decade
 
-    fees_obj = []
-    for fee in _fees:
-        work_interest_return = (interest_return_while_working - tax_drag - fee) / 100
-        retired_interest_return =  (interest_return_while_retired - tax_drag - fee) / 100
-        value_obj = []
-
-        fv_after_10_years = -npf.fv(
-            work_interest_return / 12,
-            120,
-            annual_savings_1_decade / 12,
-            0,
+    # Withdrawals step up for the first three decades of retirement and stay flat afterwards
+    annual_withdrawals = np.full(retirement_decades, annual_withdrawal_5_decade, dtype=float)
+    annual_withdrawals[:3] = [annual_withdrawal_3_decade, annual_withdrawal_4_decade, annual_withdrawal_5_decade][:retirement_decades]
+    retired_months = 120 * np.arange(1, retirement_decades + 1)
+
+    fees_arr = np.asarray(fees, dtype=float)
+    work_interest_return = (interest_return_while_working - tax_drag - fees_arr) / 100
+    retired_interest_return = (interest_return_while_retired - tax_drag - fees_arr) / 100
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fv_after_10_years = -npf.fv(work_interest_return / 12, 120, annual_savings_1_decade / 12, 0, when='begin')
+        fv_after_20_years = -npf.fv(work_interest_return / 12, 120, annual_savings_2_decade / 12, fv_after_10_years, when='begin')
+        retired_fv = npf.fv(
+            retired_interest_return[:, None] / 12,
+            retired_months[None, :],
+            annual_withdrawals[None, :] / 12,
+            -fv_after_20_years[:, None],
             when='begin')
 
-        fv_after_20_years = -npf.fv(
-            work_interest_return / 12,
-            120,
-            annual_savings_2_decade / 12,
-            fv_after_10_years,
-            when='begin')
+    values = np.ceil(np.column_stack((fv_after_10_years, fv_after_20_years, retired_fv))).astype(int).tolist()
+    interests = np.column_stack((
+        np.repeat(work_interest_return[:, None], 2, axis=1),
+        np.repeat(retired_interest_return[:, None], retirement_decades, axis=1)))
+    interests = np.round(interests * 100, _round_dig).tolist()
+    ages = (age_at_career_start + 10 * np.arange(1, retirement_decades + 3)).tolist()
 
-        retired_fv_30_years = npf.fv(
-            retired_interest_return / 12,
-            120,
-            annual_withdrawal_3_decade / 12,
-            -fv_after_20_years,
-            when='begin'
-        )
-        retired_fv_40_years = npf.fv(
-            retired_interest_return / 12,
-            240,
-            annual_withdrawal_4_decade / 12,
-            -fv_after_20_years,
-            when='begin'
-        )
-        retired_fv_50_years = npf.fv(
-            retired_interest_return / 12,
-            360,
-            annual_withdrawal_5_decade / 12,
-            -fv_after_20_years,
-            when='begin'
-        )
-        retired_fv_60_years = npf.fv(
-            retired_interest_return / 12,
-            480,
-            annual_withdrawal_6_decade / 12,
-            -fv_after_20_years,
-            when='begin'
-        )
-        retired_fv_70_years = npf.fv(
-            retired_interest_return / 12,
-            600,
-            annual_withdrawal_7_decade / 12,
-            -fv_after_20_years,
-            when='begin'
-        )
-
-        return_work_interest_return = round(work_interest_return * 100, 1)
-        return_retired_interest_return = round(retired_interest_return * 100, 1)
-        value_obj.append({
-            "age": age_at_career_start + 10, 
-            "value": math.ceil(fv_after_10_years),
-            "interest": return_work_interest_return
-        })
-        value_obj.append({
-            "age": age_at_career_start + 20, 
-            "value": math.ceil(fv_after_20_years),
-            "interest": return_work_interest_return
-        })
-        value_obj.append({
-            "age": age_at_career_start + 30, 
-            "value": math.ceil(retired_fv_30_years),
-            "interest": return_retired_interest_return
-        })
-        value_obj.append({
-            "age": age_at_career_start + 40, 
-            "value": math.ceil(retired_fv_40_years),
-            "interest": return_retired_interest_return
-        })
-        value_obj.append({
-            "age": age_at_career_start + 50, 
-            "value": math.ceil(retired_fv_50_years),
-            "interest": return_retired_interest_return
-        })
-        value_obj.append({
-            "age": age_at_career_start + 60, 
-            "value": math.ceil(retired_fv_60_years),
-            "interest": return_retired_interest_return
-        })
-        value_obj.append({
-            "age": age_at_career_start + 70, 
-            "value": math.ceil(retired_fv_70_years),
-            "interest": return_retired_interest_return
-        })
-        fees_obj.append({
+    fees_obj = [
+        {
             "fee": fee,
-            "values": value_obj
-        })
+            "values": [{ "age": age, "value": value, "interest": interest } for age, value, interest in zip(ages, fee_values, fee_interests)]
+        }
+        for fee, fee_values, fee_interests in zip(fees_arr.tolist(), values, interests)
+    ]
 
     return {
         "ageAtCareerStart": age_at_career_start,
@@ -411,6 +644,8 @@ def investment_fees_effect(
         "annualSavingsSixthDecade": annual_withdrawal_6_decade,
         "annualSavingsSeventhDecade": annual_withdrawal_7_decade,
         "annualWithdrawalThirdDecade": annual_withdrawal_3_decade,
+        "annualWithdrawals": annual_withdrawals.tolist(),
+        "retirementDecades": retirement_decades,
         "fees": fees_obj
     }
 
@@ -442,44 +677,100 @@ def cost_of_raising_children(
     ----------
     Based on Physician on FIRE's calculator: https://www.physicianonfire.com/calculators/cost-of-raising-children/
     """
-    annual_expenses_start = annual_expenses_start if annual_expenses_start is not None else 5000
-    annual_expenses_increment = annual_expenses_increment if annual_expenses_increment is not None else 4000
-    children = children if children is not None else _children
-    interests = interests if interests is not None else _interests
-
+    years = years if years is not None else 18
+    grid = cost_of_raising_children_grid(
+        annual_expenses_start,
+        annual_expenses_increment,
+        children,
+        interests,
+        [years],
+        as_arrays=True)
+
+    interests = grid["interests"].tolist()
     children_obj = []
-    for child in children:
-        annual_expenses = 0
-        total_expenses = 0
-        if child == 1:
-            annual_expenses = annual_expenses_start
-            total_expenses = annual_expenses_start * 18
-        else:
-            annual_expenses = annual_expenses_start + (annual_expenses_increment * (child - 1))
-            total_expenses = annual_expenses * 18
-        
-        cost_obj = []
-        for interest in interests:
-            fv = -npf.fv(
-                (interest / 100) / 12,
-                years * 12,
-                annual_expenses / 12,
-                0,
-                when='begin')
-            cost_obj.append({
-                "interest": interest,
-                "value": round(fv, _round_dig)
-            })
-
+    for child, annual_expenses, total_expenses, cost in zip(
+        grid["children"].tolist(),
+        grid["annualExpenses"].tolist(),
+        grid["totalExpenses"][:, 0].tolist(),
+        grid["cost"][:, :, 0].tolist()):
         children_obj.append({
             "children": child,
             "years": years,
-            "annualExpenses": round(annual_expenses, _round_dig),
-            "totalExpenses": round(total_expenses, _round_dig),
-            "cost": cost_obj
+            "annualExpenses": annual_expenses,
+            "totalExpenses": total_expenses,
+            "cost": [{ "interest": interest, "value": value } for interest, value in zip(interests, cost)]
         })
     return children_obj
 
+def cost_of_raising_children_grid(
+    annual_expenses_start: float = None,
+    annual_expenses_increment: float = None,
+    children: List[int] = None,
+    interests: List[float] = None,
+    years: List[int] = None,
+    as_records: bool = False,
+    as_arrays: bool = False):
+    """
+    Cost of raising children over a children x interests x years grid
+
+    Parameters
+    ----------
+    `annual_expenses_start` : float
+        annual expenses start per child. defaults to `5,000`\n
+    `annual_expenses_increment` : float or None.
+        annual expenses increment per child. defaults to `4,000`\n
+    `children` : list or None.
+        the number of children for which to calculate the cost of raising. defaults to `[1,2,3,4]`\n
+    `interests` : list or None.
+        the interest rates at which to calculate the opportunity cost. defaults to `[2,4,6,8]`\n
+    `years` : list or None.
+        the numbers of years to calculate the cost on. defaults to `[18]`\n
+    `as_records` : bool.
+        return a flat list of records, one per grid cell, instead of the dense grid. defaults to `False`\n
+    `as_arrays` : bool.
+        keep the dense grid as `numpy.ndarray` instead of nested lists. defaults to `False`
+
+    Notes
+    ----------
+    The whole grid is evaluated in one broadcast `npf.fv` call. `cost` is indexed `[children, interests, years]` 
+    and `totalExpenses` is indexed `[children, years]`
+    """
+    annual_expenses_start = annual_expenses_start if annual_expenses_start is not None else 5000
+    annual_expenses_increment = annual_expenses_increment if annual_expenses_increment is not None else 4000
+    children = np.asarray(children if children is not None else _children, dtype=int)
+    interests = np.asarray(interests if interests is not None else _interests)
+    years = np.asarray(years if years is not None else [18], dtype=int)
+
+    annual_expenses = annual_expenses_start + annual_expenses_increment * (children - 1)
+    total_expenses = annual_expenses[:, None] * years[None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cost = -npf.fv(
+            (interests[None, :, None] / 100) / 12,
+            years[None, None, :] * 12,
+            annual_expenses[:, None, None] / 12,
+            0,
+            when='begin')
+
+    grid = {
+        "children": children,
+        "interests": interests,
+        "years": years,
+        "annualExpenses": np.round(annual_expenses, _round_dig),
+        "totalExpenses": np.round(total_expenses, _round_dig),
+        "cost": np.round(cost, _round_dig)
+    }
+    if as_records:
+        c, i, y = np.indices(cost.shape).reshape(3, -1)
+        return helpers._columns_to_records({
+            "children": children[c].tolist(),
+            "interest": interests[i].tolist(),
+            "years": years[y].tolist(),
+            "annualExpenses": grid["annualExpenses"][c].tolist(),
+            "totalExpenses": grid["totalExpenses"][c, y].tolist(),
+            "value": grid["cost"].ravel().tolist()
+        })
+    return grid if as_arrays else { key: value.tolist() for key, value in grid.items() }
+
 def cost_of_raising_children_faimilies():
     families = [
         {
@@ -640,4 +931,122 @@ def savings_rate(
         "savingsRateGross": round(savings_rate_gross, _round_dig),
         "years": years_obj
     }
+
+
+def savings_rate_batch(
+    salary: List[float] = None,
+    match_and_profit_sharing: List[float] = None,
+    federal_income_tax: List[float] = None,
+    state_income_tax: List[float] = None,
+    fica: List[float] = None,
+    health_and_dental_insurance: List[float] = None,
+    other_deductible_benefits: List[float] = None,
+    hsa_investment: List[float] = None,
+    four_oh_one_k_or_four_oh_three_b: List[float] = None,
+    four_five_seven_b: List[float] = None,
+    sep_ira: List[float] = None,
+    other_tax_deferred: List[float] = None,
+    roth_ira: List[float] = None,
+    taxable_account: List[float] = None,
+    education: List[float] = None,
+    mortgage_principal: List[float] = None,
+    student_loan_principal: List[float] = None,
+    other_post_tax_investment: List[float] = None,
+    current_nest_egg: List[float] = None,
+    interests: List[float] = None,
+    as_arrays: bool = False):
+    """
+    Calculate the savings rate of many households in one call
+
+    Parameters
+    ----------
+    Every household input is a column, with the same name and default as in `savings_rate()`. 
+    Columns are broadcast against each other, so a single value applies to every household\n
+    `interests` : list or None.
+        returns to evaluate the years to FI (financial independence) at. defaults to `[2,4,6,8]`\n
+    `as_arrays` : bool.
+        return `numpy.ndarray` columns instead of lists. defaults to `False`
+
+    Notes
+    ----------
+    All totals are computed with column arithmetic and `years` is a households x interests matrix 
+    from one `helpers.nper` call. Rates and years that can't be computed are `None` (`nan` or `inf` with `as_arrays`)
+    """
+    salary = salary if salary is not None else 300000
+    match_and_profit_sharing = match_and_profit_sharing if match_and_profit_sharing is not None else 20000
+    federal_income_tax = federal_income_tax if federal_income_tax is not None else 50000
+    state_income_tax = state_income_tax if state_income_tax is not None else 10000
+    fica = fica if fica is not None else 12000
+    health_and_dental_insurance = health_and_dental_insurance if health_and_dental_insurance is not None else 15000
+    other_deductible_benefits = other_deductible_benefits if other_deductible_benefits is not None else 0
+    hsa_investment = hsa_investment if hsa_investment is not None else 7000
+    four_oh_one_k_or_four_oh_three_b = four_oh_one_k_or_four_oh_three_b if four_oh_one_k_or_four_oh_three_b is not None else 19500
+    four_five_seven_b = four_five_seven_b if four_five_seven_b is not None else 19500
+    sep_ira = sep_ira if sep_ira is not None else 0
+    other_tax_deferred = other_tax_deferred if other_tax_deferred is not None else 0
+    roth_ira = roth_ira if roth_ira is not None else 12000
+    taxable_account = taxable_account if taxable_account is not None else 16000
+    education = education if education is not None else 10000
+    mortgage_principal = mortgage_principal if mortgage_principal is not None else 18000
+    student_loan_principal = student_loan_principal if student_loan_principal is not None else 12000
+    other_post_tax_investment = other_post_tax_investment if other_post_tax_investment is not None else 0
+    current_nest_egg = current_nest_egg if current_nest_egg is not None else 0
+    interests = np.asarray(interests if interests is not None else _interests, dtype=float)
+
+    inputs = dict(zip(
+        [
+            "salary", "matchAndProfitSharing", "federalIncomeTax", "stateIncomeTax", "fica",
+            "healthAndDentalInsurance", "otherDeductibleBenefits",
+            "hsaInvestment", "fourOhOneKOrFourOhThreeB", "fourFiveSevenB", "sepIra", "otherTaxDeferred",
+            "rothIra", "taxableAccount", "education", "mortgagePrincipal", "studentLoanPrincipal", "otherPostTaxInvestment",
+            "currentNestEgg"
+        ],
+        np.broadcast_arrays(*[np.atleast_1d(np.asarray(column, dtype=float)) for column in (
+            salary, match_and_profit_sharing, federal_income_tax, state_income_tax, fica,
+            health_and_dental_insurance, other_deductible_benefits,
+            hsa_investment, four_oh_one_k_or_four_oh_three_b, four_five_seven_b, sep_ira, other_tax_deferred,
+            roth_ira, taxable_account, education, mortgage_principal, student_loan_principal, other_post_tax_investment,
+            current_nest_egg)])))
+
+    compensation = inputs["salary"] + inputs["matchAndProfitSharing"]
+    income_taxes = inputs["federalIncomeTax"] + inputs["stateIncomeTax"] + inputs["fica"]
+    post_tax_income = inputs["salary"] - income_taxes
+    pre_tax_spendings = inputs["healthAndDentalInsurance"] + inputs["otherDeductibleBenefits"]
+    pre_tax_investments = (inputs["hsaInvestment"] + inputs["fourOhOneKOrFourOhThreeB"] + inputs["fourFiveSevenB"] 
+        + inputs["sepIra"] + inputs["otherTaxDeferred"])
+    post_tax_investments = (inputs["rothIra"] + inputs["taxableAccount"] + inputs["education"] + inputs["mortgagePrincipal"] 
+        + inputs["studentLoanPrincipal"] + inputs["otherPostTaxInvestment"])
+
+    # Totals
+    take_home_pay = post_tax_income - pre_tax_spendings - pre_tax_investments
+    annual_spending = take_home_pay - post_tax_investments
+    all_contributions = inputs["matchAndProfitSharing"] + pre_tax_investments + post_tax_investments
+    monthly_contribution = all_contributions / 12
+    max_potential_contribution = take_home_pay + inputs["matchAndProfitSharing"] + pre_tax_investments
+    with np.errstate(divide="ignore", invalid="ignore"):
+        savings_rate_net = (all_contributions / max_potential_contribution) * 100
+        savings_rate_gross = (all_contributions / compensation) * 100
+    required_nest_egg_for_fi = annual_spending * 25
+
+    years_to_fi = helpers.nper(
+        (interests[None, :] / 100) / 12,
+        -monthly_contribution[:, None],
+        -inputs["currentNestEgg"][:, None],
+        required_nest_egg_for_fi[:, None]) / 12
+
+    outputs = {
+        **inputs,
+        "postTaxIncome": np.round(post_tax_income, _round_dig),
+        "takeHomePay": np.round(take_home_pay, _round_dig),
+        "annualSpending": np.round(annual_spending, _round_dig),
+        "allContributions": np.round(all_contributions, _round_dig),
+        "monthlyContribution": np.round(monthly_contribution, _round_dig),
+        "maxPotentialContribution": np.round(max_potential_contribution, _round_dig),
+        "savingsRateNet": np.round(savings_rate_net, _round_dig),
+        "savingsRateGross": np.round(savings_rate_gross, _round_dig),
+        "years": np.round(years_to_fi, _round_dig)
+    }
+    if as_arrays:
+        return { "interests": interests, **outputs }
+    return { "interests": interests.tolist(), **{ key: _finite_or_none(value) for key, value in outputs.items() } }
     
\ No newline at end of file
@@ -1,5 +1,6 @@
 import math
 import datetime
+import numpy as np
 import numpy_financial as npf
 
 import aiof.config as config
@@ -11,6 +12,17 @@ from typing import List
 # Configs
 _settings = config.get_settings()
 _round_dig = _settings.DefaultRoundingDigit
+_coast_fire_targets = [ "contribution", "balance" ]
+_coast_fire_savings_outputs = [
+    "total",
+    "initialEarning",
+    "withdrawFour",
+    "withdrawThree",
+    "withdrawTwo",
+    "presentValueFour",
+    "presentValueThree",
+    "presentValueTwo"
+]
 
 
 def coast_fire_savings(
@@ -33,33 +45,172 @@ def coast_fire_savings(
     ----------
     Based on https://www.reddit.com/r/financialindependence/comments/ja3nks/i_built_a_coastfire_compatible_savings_sheet/
     """
-    for i in range(0, len(coast_savings)):
-        if i == 0:
-            coast_savings[i].total = round((current_balance + coast_savings[i].contribution) * (coast_savings[i].yearlyReturn + 1), _round_dig)
-        else:
-            coast_savings[i].total = round((coast_savings[i-1].total + coast_savings[i].contribution) * (coast_savings[i].yearlyReturn + 1), _round_dig)
-        coast_savings[i].initialEarning = round(coast_savings[i].total * coast_savings[i].yearlyReturn, _round_dig)
-        coast_savings[i].withdrawFour = round(coast_savings[i].total * 0.04, _round_dig)
-        coast_savings[i].withdrawThree = round(coast_savings[i].total * 0.03, _round_dig)
-        coast_savings[i].withdrawTwo = round(coast_savings[i].total * 0.02, _round_dig)
-
-        coast_savings[i].presentValueFour = round(-npf.pv(
-            rate=initial_interest_rate,
-            nper=1,
-            pmt=0,
-            fv=coast_savings[i].withdrawFour,
-            when='end'), _round_dig)
-        coast_savings[i].presentValueThree = round(-npf.pv(
-            rate=initial_interest_rate,
-            nper=1,
-            pmt=0,
-            fv=coast_savings[i].withdrawThree,
-            when='end'), _round_dig)
-        coast_savings[i].presentValueTwo = round(-npf.pv(
-            rate=initial_interest_rate,
-            nper=1,
-            pmt=0,
-            fv=coast_savings[i].withdrawTwo,
-            when='end'), _round_dig)
+    columns = coast_fire_savings_columns(
+        ages                    = [c.age for c in coast_savings],
+        years                   = [c.year for c in coast_savings],
+        contributions           = [c.contribution for c in coast_savings],
+        yearly_returns          = [c.yearlyReturn for c in coast_savings],
+        initial_interest_rate   = initial_interest_rate,
+        current_balance         = current_balance)
+
+    for i, c in enumerate(coast_savings):
+        for field in _coast_fire_savings_outputs:
+            setattr(c, field, columns[field][i])
 
     return coast_savings
+
+
+def coast_fire_savings_columns(
+    ages: List[int],
+    years: List[int],
+    contributions: List[float],
+    yearly_returns: List[float],
+    initial_interest_rate: float = 0.02,
+    current_balance: float = 100000,
+    as_arrays: bool = False) -> dict:
+    """
+    Show how savings will be affected for Coast FIRE, from and to columns
+
+    Parameters
+    ----------
+    `ages` : list.
+        age of each year\n
+    `years` : list.
+        calendar year of each year\n
+    `contributions` : list.
+        yearly contribution of each year. a (variants x years) matrix evaluates many what-if plans at once\n
+    `yearly_returns` : list.
+        yearly return of each year, as a decimal. broadcast against `contributions`\n
+    `initial_interest_rate` : float.
+        initial interest amount used to discount the withdrawals. defaults to `0.02`\n
+    `current_balance` : float or list.
+        current starting balance, or one per variant. defaults to `100,000`\n
+    `as_arrays` : bool.
+        return `numpy.ndarray` columns instead of lists. defaults to `False`
+
+    Notes
+    ----------
+    With growth factors `G_i` over `(1 + yearlyReturn)` the running total is 
+    `total_i = G_i * (current_balance + sum(contribution_j / G_(j-1)))`, so no year by year loop is needed. 
+    Totals aren't rounded between years
+    """
+    contributions, yearly_returns = np.broadcast_arrays(
+        np.asarray(contributions, dtype=float),
+        np.asarray(yearly_returns, dtype=float))
+    current_balance = np.asarray(current_balance, dtype=float)[..., None]
+
+    growth = np.cumprod(1 + yearly_returns, axis=-1)
+    previous_growth = np.concatenate((np.ones_like(growth[..., :1]), growth[..., :-1]), axis=-1)
+    total = growth * (current_balance + np.cumsum(contributions / previous_growth, axis=-1))
+
+    withdraw_four, withdraw_three, withdraw_two = total * 0.04, total * 0.03, total * 0.02
+    discount = 1 + initial_interest_rate
+    columns = {
+        "age": np.asarray(ages, dtype=int),
+        "year": np.asarray(years, dtype=int),
+        "contribution": contributions,
+        "yearlyReturn": yearly_returns,
+        "total": np.round(total, _round_dig),
+        "initialEarning": np.round(total * yearly_returns, _round_dig),
+        "withdrawFour": np.round(withdraw_four, _round_dig),
+        "withdrawThree": np.round(withdraw_three, _round_dig),
+        "withdrawTwo": np.round(withdraw_two, _round_dig),
+        "presentValueFour": np.round(withdraw_four / discount, _round_dig),
+        "presentValueThree": np.round(withdraw_three / discount, _round_dig),
+        "presentValueTwo": np.round(withdraw_two / discount, _round_dig)
+    }
+    return columns if as_arrays else { key: value.tolist() for key, value in columns.items() }
+
+
+def coast_fire_target(
+    current_age: int,
+    retirement_age: int,
+    target_spending: float,
+    yearly_returns: List[float] = 0.07,
+    withdrawal_rate: float = 4,
+    coast_ages: List[int] = None,
+    solve_for: str = "contribution",
+    current_balance: float = 100000,
+    contribution: float = 0,
+    as_arrays: bool = False) -> dict:
+    """
+    Find, for each candidate coast age, the minimum level yearly contribution or the minimum current balance 
+    for the withdrawal at retirement to reach a target spending
+
+    Parameters
+    ----------
+    `current_age` : int.
+        current age, the first year of the plan\n
+    `retirement_age` : int.
+        age at which the withdrawals start\n
+    `target_spending` : float.
+        yearly spending the withdrawal at retirement must reach\n
+    `yearly_returns` : float or list.
+        yearly return as a decimal, or one per age from `current_age` to `retirement_age - 1`. defaults to `0.07`\n
+    `withdrawal_rate` : float.
+        withdrawal rate at retirement, in %. defaults to `4`\n
+    `coast_ages` : list or None.
+        candidate ages at which contributions stop. defaults to every age from `current_age` to `retirement_age`\n
+    `solve_for` : str.
+        `contribution` for the yearly contribution until the coast age, or `balance` for the current balance. 
+        defaults to `contribution`\n
+    `current_balance` : float.
+        current starting balance, used when solving for `contribution`. defaults to `100,000`\n
+    `contribution` : float.
+        yearly contribution until the coast age, used when solving for `balance`. defaults to `0`\n
+    `as_arrays` : bool.
+        return `numpy.ndarray` columns instead of lists. defaults to `False`
+
+    Notes
+    ----------
+    Years follow `coast_fire_savings_columns()`. The total at retirement is 
+    `G_R * (current_balance + contribution * sum(1 / G_(j-1)))` over the contribution years, which is linear in both 
+    the contribution and the current balance. So every candidate coast age is solved exactly at once, with no 
+    iterative root finding. Solutions are never negative and are `None` when no contribution can reach the target
+    """
+    if solve_for not in _coast_fire_targets:
+        raise ValueError("Solve for must be one of the following: " + ", ".join(_coast_fire_targets))
+    if retirement_age <= current_age:
+        raise ValueError("Retirement age must be bigger than current age")
+    if withdrawal_rate <= 0:
+        raise ValueError("Withdrawal rate must be bigger than 0")
+
+    years = retirement_age - current_age
+    coast_ages = np.asarray(coast_ages if coast_ages is not None else np.arange(current_age, retirement_age + 1), dtype=int)
+    if np.any(coast_ages < current_age) or np.any(coast_ages > retirement_age):
+        raise ValueError("Coast ages must be between current age and retirement age")
+
+    yearly_returns = np.broadcast_to(np.asarray(yearly_returns, dtype=float), (years,))
+    growth = np.cumprod(1 + yearly_returns)
+    previous_growth = np.concatenate(([1.0], growth[:-1]))
+    # Discounted value of contributing 1 a year until each coast age
+    contribution_factors = np.concatenate(([0.0], np.cumsum(1 / previous_growth)))[coast_ages - current_age]
+
+    target_total = target_spending / (withdrawal_rate / 100)
+    required = target_total / growth[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if solve_for == "contribution":
+            solved = np.maximum((required - current_balance) / contribution_factors, 0)
+            solved = np.where(current_balance >= required, 0, solved)
+        else:
+            solved = np.full(len(coast_ages), required) - contribution * contribution_factors
+            solved = np.maximum(solved, 0)
+    solved = np.round(solved, _round_dig)
+
+    columns = {
+        "coastAge": coast_ages,
+        "contributionYears": coast_ages - current_age,
+        "contribution": solved if solve_for == "contribution" else np.full(len(coast_ages), float(contribution)),
+        "currentBalance": solved if solve_for == "balance" else np.full(len(coast_ages), float(current_balance))
+    }
+    response = {
+        "currentAge": current_age,
+        "retirementAge": retirement_age,
+        "targetSpending": target_spending,
+        "withdrawalRate": withdrawal_rate,
+        "targetTotal": round(target_total, _round_dig),
+        "solveFor": solve_for
+    }
+    if as_arrays:
+        return { **response, **columns }
+    return { **response, **{ key: np.where(np.isfinite(value), value, None).tolist() for key, value in columns.items() } }
@@ -19,6 +19,9 @@ _settings = Settings()
 _round_dig = _settings.DefaultRoundingDigit
 _frequency = _settings.Frequencies
 _frequency_text = _settings.FrequenciesMap
+_export_formats = _settings.ExportFormats
+_export_chunk_size = _settings.DefaultExportChunkSize
+_distributions = [ "normal", "lognormal" ]
 
 
 def convert_frequency(frequency, as_decimal=False, as_int=False):
@@ -31,10 +34,39 @@ def convert_frequency(frequency, as_decimal=False, as_int=False):
     return float(_frequency[frequency])
 
 
+def convert_frequencies(frequencies, as_int=False):
+    """
+    Convert an array of frequency names to their number of periods per year
+
+    Parameters
+    ----------
+    `frequencies` : str or array_like of str.
+        frequency names. each must be one of `Settings.Frequencies`\n
+    `as_int` : bool.
+        whether to return integers instead of floats. defaults to `False`
+
+    Notes
+    -----
+    Each known frequency is matched with one vectorized comparison over the whole array, 
+    no matter how many times it repeats
+    """
+    frequencies = np.asarray(frequencies)
+    values = np.zeros(frequencies.shape, dtype=int if as_int else float)
+    matched = np.zeros(frequencies.shape, dtype=bool)
+    for name, value in _frequency.items():
+        mask = frequencies == name
+        values[mask] = value
+        matched |= mask
+    if not np.all(matched):
+        raise Exception("frequency must be one of the following: " + ", ".join(_frequency))
+    return values[()]
+
+
 def to_percentage(number):
-    if number < 0 or number > 100:
+    number = np.asarray(number, dtype=float)
+    if np.any(number < 0) or np.any(number > 100):
         raise Exception("number can't be less than 0 or bigger than 100")
-    return float(number) / 100
+    return number / 100
 
 
 # Default future value (fv) calculation
@@ -44,15 +76,60 @@ def to_percentage(number):
 #   frequency: daily, monthly, yearly etc.
 #   when: the compound interest is calculated
 def fv(interest, years, pmt, pv, frequency="monthly", when="end"):
-    freq = convert_frequency(frequency)
-    rate = (interest / 100) / freq
+    freq = convert_frequencies(frequency)
+    rate = (np.asarray(interest, dtype=float) / 100) / freq
     nper = years * freq
     return -npf.fv(rate, nper, pmt, pv, when=when)
 
 
+def nper(rate, pmt, pv, fv=0, when="end"):
+    """
+    Number of periodic payments, like `npf.nper`, broadcast over all of its inputs
+
+    Parameters
+    ----------
+    `rate` : float or array_like.
+        rate of interest per period\n
+    `pmt` : float or array_like.
+        payment per period\n
+    `pv` : float or array_like.
+        present value\n
+    `fv` : float or array_like.
+        future value. defaults to `0`\n
+    `when` : str, int or array_like.
+        when payments are due, `end` (0) or `begin` (1). defaults to `end`
+
+    Notes
+    -----
+    `npf.nper` switches every element to the zero-rate formula as soon as any one rate is `0`. 
+    Here the zero-rate formula is only applied to the elements whose rate is `0`
+    """
+    when = np.asarray(when)
+    if when.dtype.kind in "US":
+        when = np.where(when == "begin", 1, 0)
+    rate, pmt, pv, fv, when = np.broadcast_arrays(
+        np.asarray(rate, dtype=float),
+        np.asarray(pmt, dtype=float),
+        np.asarray(pv, dtype=float),
+        np.asarray(fv, dtype=float),
+        when.astype(float))
+
+    zero_rate = rate == 0
+    safe_rate = np.where(zero_rate, 1, rate)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = pmt * (1 + safe_rate * when) / safe_rate
+        periods = np.log((-fv + z) / (pv + z)) / np.log(1 + safe_rate)
+        zero_rate_periods = -(fv + pv) / pmt
+    return np.where(zero_rate, zero_rate_periods, periods)[()]
+
+
+# Interest helpers
+# - principal, rate, years, contribution and frequency can each be a scalar or an array_like
+# - inputs are broadcast against each other and frequencies are resolved once per batch
+# - scalar inputs return a scalar, array inputs return a `numpy.ndarray`
 def compound_interest_calc(principal_amount, number_of_years, rate_of_interest, frequency="yearly"):
-    frequency_float = convert_frequency(frequency)
-    return principal_amount * (pow(1 + ((rate_of_interest / 100) / frequency_float), frequency_float * number_of_years))
+    frequency_float = convert_frequencies(frequency)
+    return _compound_interest(principal_amount, number_of_years, rate_of_interest, frequency_float)
 
 def compound_interest_with_contributions_calc(
     principal_amount,
@@ -60,17 +137,25 @@ def compound_interest_with_contributions_calc(
     rate_of_interest,
     contribution,
     frequency="monthly"):
-    comp = compound_interest_calc(principal_amount, number_of_years, rate_of_interest, frequency)
-    frequency_int = convert_frequency(frequency, as_int=True)
-    r = rate_of_interest / 100
-    raisedtopower2 = frequency_int * number_of_years
+    frequency_int = convert_frequencies(frequency, as_int=True)
+    comp = _compound_interest(principal_amount, number_of_years, rate_of_interest, frequency_int)
+    r = np.asarray(rate_of_interest, dtype=float) / 100
+    raisedtopower2 = frequency_int * np.asarray(number_of_years, dtype=float)
     ratedividedbynumberoftimes = r / frequency_int
 
-    halfdone = ((((1 + (r / frequency_int)) ** raisedtopower2) -1) / ratedividedbynumberoftimes)
-    futurevaluewithdeposits = contribution * halfdone
+    # With no interest, the contributions just add up, so the 0 rate doesn't go through the division
+    zero_rate = ratedividedbynumberoftimes == 0
+    safe_rate = np.where(zero_rate, 1, ratedividedbynumberoftimes)
+    halfdone = np.where(zero_rate, raisedtopower2, (np.power(1 + ratedividedbynumberoftimes, raisedtopower2) - 1) / safe_rate)
+    futurevaluewithdeposits = np.asarray(contribution, dtype=float) * halfdone
 
     return comp + futurevaluewithdeposits
 
+def _compound_interest(principal_amount, number_of_years, rate_of_interest, frequency):
+    principal_amount = np.asarray(principal_amount, dtype=float)
+    rate = (np.asarray(rate_of_interest, dtype=float) / 100) / frequency
+    return principal_amount * np.power(1 + rate, frequency * np.asarray(number_of_years, dtype=float))
+
 
 def loan_payments_calc(
     loan_amount, 
@@ -81,33 +166,72 @@ def loan_payments_calc(
     return npf.pmt(rate = (to_percentage(rate_of_interest) / frequency_int), nper = number_of_years * frequency_int, pv = -loan_amount)
 
 
-def loan_payments_calc_as_table(loan_amount, number_of_years, rate_of_interest, frequency="monthly"):
+def loan_amortization_schedule(loan_amount, number_of_years, rate_of_interest, frequency="monthly"):
+    """
+    Calculate the amortization schedule of a level-payment loan as `numpy` arrays
+
+    Parameters
+    ----------
+    `loan_amount` : float.
+        loan amount\n
+    `number_of_years` : int.
+        number of years of the loan\n
+    `rate_of_interest` : float.
+        annual interest rate, from 0 to 100\n
+    `frequency` : str.
+        payment frequency. one of `Settings.Frequencies`. defaults to `monthly`
+
+    Returns
+    -------
+    `dict` of `numpy.ndarray` with keys `period`, `initialBalance`, `payment`, `interest`, `principal`
+    and `endingBalance`, one element per period
+
+    Notes
+    -----
+    Every column is computed in closed form with `npf.ipmt` / `npf.ppmt` / `npf.fv` over the whole
+    period range at once, instead of carrying the balance forward period by period. A 0 rate
+    is handled on its own, with no interest and equal principal payments
+    """
     payments = loan_payments_calc(loan_amount, number_of_years, rate_of_interest, frequency)
-    interest = to_percentage(rate_of_interest)
     frequency_int = convert_frequency(frequency, as_int=True)
-    frequency_num = frequency_int * number_of_years
+    frequency_num = int(frequency_int * number_of_years)
+    rate = to_percentage(rate_of_interest) / frequency_int
+    period = np.arange(1, frequency_num + 1)
+
+    if rate == 0:
+        # `npf.ipmt` divides by the rate, so the interest-free loan is just paid down in equal parts
+        interest = np.zeros(frequency_num)
+        principal = np.full(frequency_num, loan_amount / frequency_num)
+        ending_balance = loan_amount - principal * period
+    else:
+        interest = -npf.ipmt(rate, period, frequency_num, loan_amount)
+        principal = -npf.ppmt(rate, period, frequency_num, loan_amount)
+        ending_balance = npf.fv(rate, period, payments, -loan_amount)
+    initial_balance = np.concatenate(([loan_amount], ending_balance[:-1]))
+
+    return {
+        "period": period,
+        "initialBalance": initial_balance,
+        "payment": np.full(frequency_num, payments),
+        "interest": interest,
+        "principal": principal,
+        "endingBalance": ending_balance
+    }
+
+
+def loan_payments_calc_as_table(loan_amount, number_of_years, rate_of_interest, frequency="monthly"):
+    schedule = loan_amortization_schedule(loan_amount, number_of_years, rate_of_interest, frequency)
     frequency_text = _frequency_text[frequency]
 
-    loan_df = np.zeros((frequency_num, 6))
-    loan_df = pd.DataFrame(loan_df)
-    loan_df.columns = [frequency_text, "initialBalance", "payment", "interest",
-                                "principal", "endingBalance"]
-    loan_df.iloc[0, 0] = 1
-    loan_df.iloc[0, 1] = loan_amount
-    loan_df.iloc[0, 2] = payments
-    loan_df.iloc[0, 3] = loan_amount * (interest / frequency_int)
-    loan_df.iloc[0, 4] = payments - (loan_amount * (interest / frequency_int))
-    loan_df.iloc[0, 5] = loan_amount - (payments - (loan_amount * (interest / frequency_int)))
-    for i in range(1, frequency_num):
-        loan_df.iloc[i, 0] = i + 1
-        loan_df.iloc[i, 1] = loan_df.iloc[(i - 1), 5]
-        loan_df.iloc[i, 2] = payments
-        loan_df.iloc[i, 3] = loan_df.iloc[i, 1] * (interest / frequency_int)
-        loan_df.iloc[i, 4] = payments - (loan_df.iloc[i, 1] * (interest / frequency_int))
-        loan_df.iloc[i, 5] = loan_df.iloc[i, 1] - (payments - (loan_df.iloc[i, 1] * (interest / frequency_int)))
-    
+    loan_df = pd.DataFrame({
+        frequency_text: schedule["period"],
+        "initialBalance": schedule["initialBalance"],
+        "payment": schedule["payment"],
+        "interest": schedule["interest"],
+        "principal": schedule["principal"],
+        "endingBalance": schedule["endingBalance"]
+    })
     loan_df = loan_df.round(2)
-    loan_df[frequency_text] = loan_df[frequency_text].astype(int)
 
     with pd.option_context("display.max_rows", None, "display.max_columns", None):
         return loan_df
@@ -159,43 +283,78 @@ def loan_payments_calc_custom_multiple_stats(loan_amount, number_of_years, rate_
     if not all(len(l) == the_len for l in it):
         raise ValueError("not all new_* lists have same length")
 
-    payments_df = loan_payments_calc_as_table(loan_amount, number_of_years, rate_of_interest, frequency)
-
     data = {
-        "loan": [loan_amount],
-        "interest": [rate_of_interest],
-        "years": [number_of_years],
-        "frequency": [frequency],
-        "totalInterest": [payments_df["interest"].sum()],
-        "totalPayments": [payments_df["payment"].sum()],
-        "description": ["original loan payments"]
+        "loan": [loan_amount] + new_loan_amounts,
+        "interest": [rate_of_interest] + new_rate_of_interests,
+        "years": [number_of_years] + new_number_of_years,
+        "frequency": [frequency] + new_frequencies,
+        "description": ["original loan payments"] + ["updated loan payments"] * the_len
     }
 
-    for i in range(0, len(new_loan_amounts)):
-        updated_payments_df = loan_payments_calc_as_table(new_loan_amounts[i], 
-            new_number_of_years[i], 
-            new_rate_of_interests[i], 
-            new_frequencies[i])
-
-        data["loan"].append(new_loan_amounts[i])
-        data["interest"].append(new_rate_of_interests[i])
-        data["years"].append(new_number_of_years[i])
-        data["frequency"].append(new_frequencies[i])
-        data["totalInterest"].append(updated_payments_df["interest"].sum())
-        data["totalPayments"].append(updated_payments_df["payment"].sum())
-        data["description"].append("updated loan payments")
+    # Totals are summed from the rounded tables, same as loan_payments_calc_custom_stats()
+    payments_dfs = [loan_payments_calc_as_table(*loan) for loan in zip(data["loan"], data["years"], data["interest"], data["frequency"])]
+    data["totalInterest"] = [payments_df["interest"].sum() for payments_df in payments_dfs]
+    data["totalPayments"] = [payments_df["payment"].sum() for payments_df in payments_dfs]
 
     data_df = pd.DataFrame(data, columns=["loan", "interest", "years", "frequency", "totalInterest", "totalPayments", "description"])
     return data_df
 
 
+def loan_payments_totals(loan_amounts, numbers_of_years, rates_of_interest, frequencies, as_json=False):
+    """
+    Calculate the payment, total payments and total interest of many level-payment loans at once
+
+    Parameters
+    ----------
+    `loan_amounts` : float or array_like.
+        loan amounts\n
+    `numbers_of_years` : float or array_like.
+        number of years of each loan\n
+    `rates_of_interest` : float or array_like.
+        annual interest rate of each loan, from 0 to 100\n
+    `frequencies` : str or array_like of str.
+        payment frequency of each loan. each must be one of `Settings.Frequencies`\n
+    `as_json` : bool.
+        whether to return rounded lists instead of `numpy.ndarray`. defaults to `False`
+
+    Returns
+    -------
+    `dict` of `numpy.ndarray` with keys `payment`, `totalPayments` and `totalInterest`
+
+    Notes
+    -----
+    The inputs are broadcast against each other, so scalars can be mixed with arrays. 
+    The totals are in closed form (`payment * periods` and `totalPayments - loan`), so no 
+    amortization table is built for any of the loans
+    """
+    loan_amounts, numbers_of_years, rates_of_interest, frequencies = np.broadcast_arrays(
+        np.asarray(loan_amounts, dtype=float),
+        np.asarray(numbers_of_years, dtype=float),
+        to_percentage(rates_of_interest),
+        np.asarray(frequencies))
+    frequency_int = convert_frequencies(frequencies, as_int=True)
+    frequency_num = np.trunc(frequency_int * numbers_of_years)
+
+    payment = npf.pmt(rates_of_interest / frequency_int, frequency_int * numbers_of_years, -loan_amounts)
+    total_payments = payment * frequency_num
+
+    totals = {
+        "payment": payment,
+        "totalPayments": total_payments,
+        "totalInterest": total_payments - loan_amounts
+    }
+    return totals if not as_json else { key: np.round(value, _round_dig).tolist() for key, value in totals.items() }
+
+
 def simple_interest_calc(principal_amount, rate_of_interest, number_of_years):
-    return (principal_amount * to_percentage(rate_of_interest) * number_of_years) / 100
+    principal_amount = np.asarray(principal_amount, dtype=float)
+    return (principal_amount * to_percentage(rate_of_interest) * np.asarray(number_of_years, dtype=float)) / 100
 
 
 def equated_monthly_installment_calc(principal_amount, rate_of_interest, number_of_months):
     interest = to_percentage(rate_of_interest)
-    return (principal_amount * interest * (pow(1 + interest, number_of_months))) / ((pow(1 + interest, number_of_months)) - 1)
+    growth = np.power(1 + interest, np.asarray(number_of_months, dtype=float))
+    return (np.asarray(principal_amount, dtype=float) * interest * growth) / (growth - 1)
 
 
 def doubling_time_with_continuous_compounding(rate_of_interest, frequency="yearly"):
@@ -203,99 +362,214 @@ def doubling_time_with_continuous_compounding(rate_of_interest, frequency="yearl
     return (np.log(2) / interest)
 
 
+# Simulated returns
+# - Draws a paths x periods matrix of periodic returns from an annual `mean` and `volatility`, both in %
+# - `normal` draws periodic returns directly. `lognormal` draws periodic log returns, parametrized so the
+#   annual return has the given arithmetic mean and volatility
+# - `seed` is anything `numpy.random.default_rng` takes, including a `numpy.random.Generator`. Passing the same 
+#   generator to consecutive calls continues its stream, so results don't depend on how paths are chunked
+def simulate_returns(mean, volatility, paths, periods, distribution="normal", frequency=12, seed=None):
+    if distribution not in _distributions:
+        raise ValueError("distribution must be one of the following: " + ", ".join(_distributions))
+    rng = np.random.default_rng(seed)
+    mean = float(mean) / 100
+    volatility = float(volatility) / 100
+
+    if distribution == "normal":
+        return rng.normal(mean / frequency, volatility / np.sqrt(frequency), size=(paths, periods))
+    log_variance = np.log1p((volatility / (1 + mean)) ** 2)
+    log_mean = np.log1p(mean) - log_variance / 2
+    return np.expm1(rng.normal(log_mean / frequency, np.sqrt(log_variance / frequency), size=(paths, periods)))
+
+
 # Asset breakdown
 # - Takes in a ComparableAsset and generates future values (fv) for different scenarios
 # - For more information on each one, look at aiof.data.asset.Comparable class
+# - All eight scenarios (market/hys x with/without contribution x end/begin) are evaluated
+#   in one broadcast `npf.fv` call over a shared yearly `nper` grid
+# - Yearly breakdowns are columnar (`dict` of lists), or a list of records if `as_records` is set
 # Returns: aiof.data.asset.ComparableAsset with all fields populated
-def asset_breakdown(asset: ComparableAsset):
+def asset_breakdown(asset: ComparableAsset, as_records: bool = False):
     asset.init_values()
     rate = ((asset.interest - asset.investmentFees - asset.taxDrag) / 100) / asset.frequency
     hys_rate = (asset.hysInterest / 100) / asset.frequency
-    nper = asset.years * asset.frequency
-
-    fv_end = -npf.fv(rate, nper, 0, asset.value, when='end')
-    fv_begin = -npf.fv(rate, nper, 0, asset.value, when='begin')
-    fv_with_contribution_end = -npf.fv(rate, nper, asset.contribution, asset.value, when='end')
-    fv_with_contribution_begin = -npf.fv(rate, nper, asset.contribution, asset.value, when='begin')
-    hys_fv_end = -npf.fv(hys_rate, nper, 0, asset.value, when='end')
-    hys_fv_begin = -npf.fv(hys_rate, nper, 0, asset.value, when='begin')
-    hys_fv_with_contribution_end = -npf.fv(hys_rate, nper, asset.contribution, asset.value, when='end')
-    hys_fv_with_contribution_begin = -npf.fv(hys_rate, nper, asset.contribution, asset.value, when='begin')
-
-    asset.marketValue = round(fv_end, _round_dig)
-    asset.marketBeginValue = round(fv_begin, _round_dig)
-    asset.marketValueBreakdown = asset_fv_breakdown_as_table(
-        asset_value=asset.value,
-        contribution=0,
-        years=asset.years,
-        rate=rate,
-        frequency=asset.frequency).to_dict('records')
-
-    asset.marketWithContributionValue = round(fv_with_contribution_end, _round_dig)
-    asset.marketBeginWithContributionValue = round(fv_with_contribution_begin, _round_dig)
-    asset.marketWithContributionValueBreakdown = asset_fv_breakdown_as_table(
-        asset_value=asset.value,
-        contribution=asset.contribution,
-        years=asset.years,
-        rate=rate,
-        frequency=asset.frequency).to_dict('records')
-
-    asset.hysValue = round(hys_fv_end, _round_dig)
-    asset.hysBeginValue = round(hys_fv_begin, _round_dig)
-    asset.hysValueBreakdown = asset_fv_breakdown_as_table(
-        asset_value=asset.value,
-        contribution=0,
-        years=asset.years,
-        rate=hys_rate,
-        frequency=asset.frequency).to_dict('records')
-
-    asset.hysWithContributionValue = round(hys_fv_with_contribution_end, _round_dig)
-    asset.hysBeginWithContributionValue = round(hys_fv_with_contribution_begin, _round_dig)
-    asset.hysWithContributionValueBreakdown = asset_fv_breakdown_as_table(
-        asset_value=asset.value,
-        contribution=asset.contribution,
-        years=asset.years,
-        rate=hys_rate,
-        frequency=asset.frequency).to_dict('records')
+    years = np.arange(0, asset.years + 1)
+
+    # Axes: (market, hys) x (without, with contribution) x (end, begin) x year
+    rates = np.array([rate, hys_rate])
+    contributions = np.array([0, asset.contribution])
+    fvs = -npf.fv(
+        rate=rates.reshape(2, 1, 1, 1),
+        nper=years * asset.frequency,
+        pmt=contributions.reshape(1, 2, 1, 1),
+        pv=asset.value,
+        when=np.array([0, 1]).reshape(1, 1, 2, 1))
+    values = fvs[:, :, :, -1].round(_round_dig)
+
+    def breakdown(i, j):
+        columns = _fv_breakdown_columns(years[1:], contributions[j], rates[i], fvs[i, j, 0, 1:])
+        return columns if not as_records else _columns_to_records(columns)
+
+    asset.marketValue = values[0, 0, 0]
+    asset.marketBeginValue = values[0, 0, 1]
+    asset.marketValueBreakdown = breakdown(0, 0)
+
+    asset.marketWithContributionValue = values[0, 1, 0]
+    asset.marketBeginWithContributionValue = values[0, 1, 1]
+    asset.marketWithContributionValueBreakdown = breakdown(0, 1)
+
+    asset.hysValue = values[1, 0, 0]
+    asset.hysBeginValue = values[1, 0, 1]
+    asset.hysValueBreakdown = breakdown(1, 0)
+
+    asset.hysWithContributionValue = values[1, 1, 0]
+    asset.hysBeginWithContributionValue = values[1, 1, 1]
+    asset.hysWithContributionValueBreakdown = breakdown(1, 1)
 
     return asset
 
 
-# Future value (fv) as a pandas.DataFrame table
+def _fv_breakdown_columns(years, contribution, rate, values, as_arrays=False) -> dict:
+    """
+    Build the columnar yearly breakdown of a future value (fv) from its arrays
+    """
+    n = len(years)
+    columns = {
+        "year": np.asarray(years, dtype=int),
+        "contribution": np.full(n, round(float(contribution), _round_dig)),
+        "rate": np.full(n, round(float(rate), 4)),
+        "value": np.round(values, _round_dig)
+    }
+    return columns if as_arrays else { key: value.tolist() for key, value in columns.items() }
+
+
+def _columns_to_records(columns: dict) -> list:
+    """
+    Convert a columnar `dict` of equal length lists to a list of records
+    """
+    keys = list(columns.keys())
+    return [dict(zip(keys, row)) for row in zip(*columns.values())]
+
+
+# Future value (fv) breakdown as columns
 # - Takes in the inputs and breaks down the future value (fv) for each year
-def asset_fv_breakdown_as_table(
+# - Returns a `dict` of lists with `year`, `contribution`, `rate` and `value` columns, 
+#   or of `numpy.ndarray` if `as_arrays` is set
+def asset_fv_breakdown(
     asset_value,
     contribution,
     years,
     rate,
     frequency,
-    when="end"):
-    df = pd.DataFrame(np.zeros((years, 4)))
-    df.columns = ["year", "contribution", "rate", "value"]
-    asset_breakdown = -npf.fv(
-        rate=rate, 
-        nper=np.arange(frequency, ((years + 1) * frequency), frequency),
+    when="end",
+    as_arrays=False):
+    year = np.arange(1, years + 1)
+    values = -npf.fv(
+        rate=rate,
+        nper=year * frequency,
         pmt=contribution,
         pv=asset_value,
         when=when)
-    for i in range(0, years):
-        df.iloc[i, 0] = i + 1
-        df.iloc[i, 1] = contribution
-        df.iloc[i, 2] = rate
-        df.iloc[i, 3] = asset_breakdown[i]
-    df = df.round({"contribution": _round_dig, "rate": 4, "value": _round_dig})
-    df["year"] = df["year"].astype(int)
-    return df
+    return _fv_breakdown_columns(year, contribution, rate, values, as_arrays)
+
+
+# Future value (fv) as a pandas.DataFrame table
+# - Takes in the inputs and breaks down the future value (fv) for each year
+def asset_fv_breakdown_as_table(
+    asset_value,
+    contribution,
+    years,
+    rate,
+    frequency,
+    when="end"):
+    return pd.DataFrame(asset_fv_breakdown(asset_value, contribution, years, rate, frequency, when, as_arrays=True))
 
 
 # Export to .csv
 # input: pandas DataFrame
-# output: csv bytes
+# output: csv str chunks
 # can/will be used in FastAPI StreamResponse
 def export_to_csv(df):
-    stream = io.StringIO()
-    df.to_csv(stream, index=False)
-    return iter([stream.getvalue()])
+    return export_chunks(df, format="csv")
+
+
+def export_chunks(df: DataFrame, format: str = "csv", chunk_size: int = None):
+    """
+    Export a `pandas.DataFrame` as a stream of bounded row chunks
+
+    Parameters
+    ----------
+    `df` : pandas.DataFrame.
+        the table to export\n
+    `format` : str.
+        one of `Settings.ExportFormats` - `csv`, `ndjson` (newline-delimited JSON), `arrow` (Arrow IPC stream) 
+        or `parquet`. defaults to `csv`\n
+    `chunk_size` : int.
+        maximum number of rows serialized per chunk. defaults to `Settings.DefaultExportChunkSize`
+
+    Returns
+    -------
+    generator of `str` for `csv` and `ndjson`, of `bytes` for `arrow` and `parquet`
+
+    Notes
+    -----
+    Rows are serialized lazily, one chunk at a time, so the first chunk can be sent before the rest of 
+    the table is encoded and only one chunk is held as text at any time. The `csv` header is only written 
+    with the first chunk. Parameters are validated before the first chunk is requested
+
+    `arrow` writes one record batch per chunk, keeping the typed float64/int64 columns as they are in the 
+    `pandas.DataFrame`. `parquet` has its metadata at the end of the file, so it is written as a single 
+    chunk with one row group per `chunk_size` rows. Both require `pyarrow`
+    """
+    chunk_size = chunk_size if chunk_size is not None else _export_chunk_size
+    if format not in _export_formats:
+        raise ValueError("format must be one of the following: " + ", ".join(_export_formats))
+    elif chunk_size <= 0:
+        raise ValueError("chunk size must be bigger than 0")
+    if format == "arrow":
+        return _export_arrow_chunks(df, chunk_size)
+    elif format == "parquet":
+        return _export_parquet_chunks(df, chunk_size)
+    return _export_chunks(df, format, chunk_size)
+
+
+def _export_chunks(df: DataFrame, format: str, chunk_size: int):
+    if format == "csv" and len(df) == 0:
+        yield df.to_csv(index=False)
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        if format == "csv":
+            yield chunk.to_csv(index=False, header=(start == 0))
+        else:
+            yield chunk.to_json(orient="records", lines=True, date_format="iso").rstrip("\n") + "\n"
+
+
+def _export_arrow_chunks(df: DataFrame, chunk_size: int):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=chunk_size):
+            writer.write_batch(batch)
+            yield _drain(sink)
+    yield _drain(sink)
+
+
+def _export_parquet_chunks(df: DataFrame, chunk_size: int):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = io.BytesIO()
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), sink, row_group_size=chunk_size)
+    yield sink.getvalue()
+
+
+def _drain(sink: io.BytesIO) -> bytes:
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
 
 
 def get_current_month_first() -> datetime:
@@ -349,16 +623,60 @@ def assets_to_df(assets: List[Asset]) -> DataFrame:
     -------
     `pandas.DataFrame`
     """
-    df = pd.DataFrame(columns=["name", "typeName", "value"])
-    nameList = []
-    typeNameList = []
-    valueList = []
-    for asset in assets:
-        nameList.append(asset.name)
-        typeNameList.append(asset.typeName)
-        valueList.append(asset.value)
-    df["name"] = nameList
-    df["typeName"] = typeNameList
-    df["value"] = valueList
-    df["value"] = df["value"].astype(float)
-    return df
+    return assets_columns_to_df(
+        names       = [asset.name for asset in assets],
+        type_names  = [asset.typeName for asset in assets],
+        values      = [asset.value for asset in assets])
+
+
+def assets_columns_to_df(names, type_names, values) -> DataFrame:
+    """
+    Convert parallel asset columns to a `pandas.DataFrame` in one constructor call
+
+    Parameters
+    -------
+    `names` : array_like of str or None
+        asset names. `None` leaves every name empty\n
+    `type_names` : array_like of str
+        asset types\n
+    `values` : array_like of float
+        asset values
+
+    Returns
+    -------
+    `pandas.DataFrame` with `name`, categorical `typeName` and float `value` columns
+
+    Notes
+    -----
+    `typeName` is stored as a `pandas.Categorical`, so each distinct type is kept once and grouping 
+    by type works on integer codes. Use `assets_totals_by_type()` to get the per-type totals
+    """
+    values = np.asarray(values, dtype=float)
+    type_names = pd.Categorical(type_names)
+    if names is None:
+        names = [None] * len(values)
+    if not len(names) == len(type_names) == len(values):
+        raise ValueError("names, type names and values must all have the same length")
+
+    return pd.DataFrame({
+        "name": pd.Series(names, dtype=object),
+        "typeName": type_names,
+        "value": values
+    }, columns=["name", "typeName", "value"])
+
+
+def assets_totals_by_type(df: DataFrame) -> dict:
+    """
+    Total asset value per `typeName`, computed once with a single group by
+
+    Parameters
+    -------
+    `df` : pandas.DataFrame
+        assets as returned by `assets_to_df()` or `assets_columns_to_df()`
+
+    Returns
+    -------
+    `dict` of `typeName` to total value. types with no assets are not included
+    """
+    totals = df.groupby("typeName", observed=True, sort=False)["value"].sum()
+    return { str(type_name): float(total) for type_name, total in totals.items() }
@@ -0,0 +1,159 @@
+import os
+import numpy as np
+import pandas as pd
+
+import aiof.config as config
+
+from functools import lru_cache
+from numpy.lib.stride_tricks import as_strided
+
+
+# Configs
+_settings = config.get_settings()
+_round_dig = _settings.DefaultRoundingDigit
+_returns_path = _settings.HistoricalReturnsPath
+_bundled_returns_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "annual_returns.csv")
+_returns_columns = [ "year", "stocks", "bonds", "inflation" ]
+
+
+@lru_cache()
+def load_annual_returns(path: str = None) -> pd.DataFrame:
+    """
+    Load annual returns, in %, with `year`, `stocks`, `bonds` and `inflation` columns
+
+    Parameters
+    ----------
+    `path` : str or None.
+        local .csv file to read. defaults to `Settings.HistoricalReturnsPath` or, if that's not set,
+        the bundled `aiof/data/annual_returns.csv`
+
+    Notes
+    ----------
+    The bundled file holds approximate US figures for 1928-2023: S&P 500 total returns, 10-year Treasury bond
+    total returns and CPI inflation. Loaded files are cached by path, so the returned frame must not be modified
+    """
+    path = path or _returns_path or _bundled_returns_path
+    df = pd.read_csv(path)
+
+    missing = [c for c in _returns_columns if c not in df.columns]
+    if missing:
+        raise ValueError("Annual returns file is missing the following columns: " + ", ".join(missing))
+
+    df = df[_returns_columns].sort_values("year").reset_index(drop=True)
+    if not (df["year"].diff().dropna() == 1).all():
+        raise ValueError("Annual returns file must have one row per consecutive year")
+    return df
+
+
+def rolling_windows(values: np.ndarray, size: int) -> np.ndarray:
+    """
+    Every rolling window of `size` consecutive values as a read-only (windows x size) view over `values`.
+    Nothing is copied
+    """
+    values = np.ascontiguousarray(values)
+    stride = values.strides[0]
+    return as_strided(values, shape=(len(values) - size + 1, size), strides=(stride, stride), writeable=False)
+
+
+def withdrawal_backtest(
+    retirement_number: float = None,
+    take_out_percentage: float = None,
+    number_of_years: int = None,
+    stocks_allocation: float = None,
+    inflation_adjusted: bool = True,
+    returns_path: str = None,
+    as_json: bool = False):
+    """
+    Backtest a withdrawal plan against every rolling start year of historical returns
+
+    Parameters
+    ----------
+    `retirement_number` : float.
+        retirement number. defaults to `1,000,000`\n
+    `take_out_percentage` : float.
+        take out percentage of the retirement number in the first year. defaults to `4%`\n
+    `number_of_years` : int.
+        number of years to take money out. defaults to `30`\n
+    `stocks_allocation` : float.
+        percentage of the portfolio in stocks, the rest is in bonds. rebalanced yearly. defaults to `60%`\n
+    `inflation_adjusted` : bool.
+        whether the withdrawal grows with inflation every year. defaults to `True`\n
+    `returns_path` : str or None.
+        local .csv file with annual returns. see `load_annual_returns()`\n
+    `as_json` : bool.
+        whether to return the windows as JSON records instead of a `pandas.DataFrame`. defaults to `False`
+
+    Notes
+    ----------
+    Withdrawals are taken at the beginning of each year, like `withdrawal_calc()`. All windows are evaluated
+    together on strided (windows x years) views. With growth factors `G_t` the balance is
+    `B_t = G_t * (B_0 - sum(w_s / G_(s-1)))`. Once a balance drops to 0 it can't recover, so a plan
+    succeeds when its ending balance is positive and `yearsLasted` counts the fully funded years. Balances are 
+    nominal; `realEndingBalance` is in start year dollars
+    """
+    # Check for None
+    retirement_number   = retirement_number if retirement_number is not None else 1000000
+    take_out_percentage = take_out_percentage if take_out_percentage is not None else 4
+    number_of_years     = number_of_years if number_of_years is not None else 30
+    stocks_allocation   = stocks_allocation if stocks_allocation is not None else 60
+
+    returns = load_annual_returns(returns_path)
+
+    if retirement_number <= 0:
+        raise ValueError("Retirement number must be greater than 0")
+    elif take_out_percentage <= 0 or take_out_percentage > 100:
+        raise ValueError("Take out percentage must be greater than 0 and at most 100")
+    elif number_of_years <= 0 or number_of_years > len(returns):
+        raise ValueError(f"Number of years must be between 1 and {len(returns)}")
+    elif stocks_allocation < 0 or stocks_allocation > 100:
+        raise ValueError("Stocks allocation must be between 0 and 100")
+
+    number_of_years = int(number_of_years)
+    stocks = stocks_allocation / 100
+    portfolio_returns = (stocks * returns["stocks"].to_numpy() + (1 - stocks) * returns["bonds"].to_numpy()) / 100
+    inflation = returns["inflation"].to_numpy() / 100
+
+    growth = np.cumprod(1 + rolling_windows(portfolio_returns, number_of_years), axis=1)
+    prices = np.cumprod(1 + rolling_windows(inflation, number_of_years), axis=1)
+
+    withdrawal = retirement_number * take_out_percentage / 100
+    withdrawals = np.full(growth.shape, withdrawal)
+    if inflation_adjusted:
+        withdrawals[:, 1:] *= prices[:, :-1]
+    previous_growth = np.hstack((np.ones((len(growth), 1)), growth[:, :-1]))
+    balances = growth * (retirement_number - np.cumsum(withdrawals / previous_growth, axis=1))
+
+    depleted = balances <= 0
+    success = ~depleted[:, -1]
+    ending_balances = np.maximum(balances[:, -1], 0)
+    years_lasted = np.where(success, number_of_years, depleted.argmax(axis=1))
+
+    df = pd.DataFrame({
+        "startYear": returns["year"].to_numpy()[:len(growth)].astype(int),
+        "endYear": returns["year"].to_numpy()[number_of_years - 1:].astype(int),
+        "success": success,
+        "yearsLasted": years_lasted,
+        "plannedWithdrawals": withdrawals.sum(axis=1),
+        "endingBalance": ending_balances,
+        "realEndingBalance": ending_balances / prices[:, -1]
+    }).round(_round_dig)
+
+    if not as_json:
+        return df
+
+    # Ties at a depleted balance go to the window that ran out first
+    worst = int(np.lexsort((years_lasted, ending_balances))[0])
+    return {
+        "retirementNumber": retirement_number,
+        "takeOutPercentage": take_out_percentage,
+        "numberOfYears": number_of_years,
+        "stocksAllocation": stocks_allocation,
+        "inflationAdjusted": inflation_adjusted,
+        "windows": len(df),
+        "successRate": round(float(success.mean()) * 100, _round_dig),
+        "worstEndingBalance": float(df["endingBalance"].iloc[worst]),
+        "worstStartYear": int(df["startYear"].iloc[worst]),
+        "worstYearsLasted": int(df["yearsLasted"].iloc[worst]),
+        "medianEndingBalance": round(float(np.median(ending_balances)), _round_dig),
+        "results": df.to_dict(orient="records")
+    }
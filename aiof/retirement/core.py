@@ -1,4 +1,5 @@
 import datetime
+import numpy as np
 import pandas as pd
 import numpy_financial as npf
 
@@ -6,11 +7,14 @@ import aiof.config as config
 
 from aiof.retirement.parameter_check import float_check, age_check
 
+from typing import List
+
 
 # Configs
 _settings = config.get_settings()
 _default_interest = _settings.DefaultInterest
 _round_dig = _settings.DefaultRoundingDigit
+_investment_accounts_columns = { "year", "compoundingPeriods", "total", "totalMonthlyContributions" }
 
 
 def withdrawal_calc(
@@ -45,37 +49,206 @@ def withdrawal_calc(
     elif number_of_years <= 0 or number_of_years > 100:
         raise ValueError("Number of years must be between 1 and 100")
 
-    # Initial data frame
-    df = pd.DataFrame(columns=["year", "takeOutPercentage", "startingRetirementNumber", "withdrawal", "endingRetirementNumber"], dtype="float")
+    # A 10% take out percentage is only projected for the first year
+    if take_out_percentage == 0.1:
+        number_of_years = 1
+
+    balances = withdrawal_balances(
+        retirement_numbers      = retirement_number,
+        take_out_percentages    = take_out_percentage * 100,
+        number_of_years         = number_of_years,
+        as_arrays               = True)
+
+    df = pd.DataFrame({
+        "year": balances["year"],
+        "takeOutPercentage": take_out_percentage,
+        "startingRetirementNumber": balances["startingRetirementNumber"][0],
+        "withdrawal": balances["withdrawal"][0],
+        "endingRetirementNumber": balances["endingRetirementNumber"][0]
+    }).round(_round_dig)
 
-    withdrawal = retirement_number * take_out_percentage
+    return df if not as_json else df.to_dict(orient="records")
 
-    df.loc[0, "year"] = 1
-    df.loc[0, "takeOutPercentage"] = take_out_percentage
-    df.loc[0, "startingRetirementNumber"] = retirement_number
-    df.loc[0, "withdrawal"] = withdrawal
-    df.loc[0, "endingRetirementNumber"] =-npf.fv(
-            rate=_default_interest / 100,
-            nper=1,
-            pmt=0,
-            pv=retirement_number - withdrawal,
-            when='end')
 
-    if take_out_percentage == 0.1:
-        return df if not as_json else df.to_dict(orient="records")
-
-    for year in range(1, int(number_of_years)):
-        df.loc[year, "year"] = year + 1
-        df.loc[year, "takeOutPercentage"] = take_out_percentage
-        df.loc[year, "startingRetirementNumber"] = df.loc[year - 1, "endingRetirementNumber"]
-        df.loc[year, "withdrawal"] = withdrawal
-        df.loc[year, "endingRetirementNumber"] = -npf.fv(
-            rate=_default_interest / 100,
-            nper=1,
-            pmt=0,
-            pv=df.loc[year, "startingRetirementNumber"] - df.loc[year, "withdrawal"],
-            when='end')
-    df["year"] = df["year"].astype(int)
+def withdrawal_balances(
+    retirement_numbers: List[float] = None,
+    take_out_percentages: List[float] = None,
+    number_of_years: int = None,
+    interests: List[float] = None,
+    as_arrays: bool = False) -> dict:
+    """
+    Project the retirement balances of many clients at once
+
+    Parameters
+    ----------
+    `retirement_numbers` : list.
+        retirement number of each client. defaults to `1,000,000`\n
+    `take_out_percentages` : list.
+        take out percentage of each client's retirement number, in %. defaults to `3`\n
+    `number_of_years` : int.
+        number of years to take money out. defaults to `35`\n
+    `interests` : list.
+        yearly return of each client, in %. defaults to `Settings.DefaultInterest`\n
+    `as_arrays` : bool.
+        return `numpy.ndarray` columns instead of lists. defaults to `False`
+
+    Notes
+    ----------
+    Client inputs are broadcast against each other and every column is a (clients x years) matrix. 
+    The withdrawal `w` is taken at the beginning of each year, `B[t+1] = (B[t] - w)(1 + r)`, which has the 
+    closed form `B[t] = B* + (1 + r)^t (B[0] - B*)` with `B* = w(1 + r) / r`, or `B[t] = B[0] - w t` when `r` is `0`. 
+    Balances aren't floored at 0
+    """
+    retirement_numbers = retirement_numbers if retirement_numbers is not None else 1000000
+    take_out_percentages = take_out_percentages if take_out_percentages is not None else 3
+    number_of_years = int(number_of_years if number_of_years is not None else 35)
+    interests = interests if interests is not None else _default_interest
+
+    if number_of_years <= 0 or number_of_years > 100:
+        raise ValueError("Number of years must be between 1 and 100")
+
+    retirement_numbers, take_out_percentages, interests = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(retirement_numbers, dtype=float)),
+        np.asarray(take_out_percentages, dtype=float),
+        np.asarray(interests, dtype=float))
+
+    b0 = retirement_numbers[:, None]
+    rate = interests[:, None] / 100
+    withdrawal = b0 * take_out_percentages[:, None] / 100
+    years = np.arange(1, number_of_years + 1)
+
+    zero_rate = rate == 0
+    safe_rate = np.where(zero_rate, 1, rate)
+    steady_state = withdrawal * (1 + safe_rate) / safe_rate
+    ending = np.where(
+        zero_rate,
+        b0 - withdrawal * years,
+        steady_state + (1 + safe_rate) ** years * (b0 - steady_state))
+    starting = np.concatenate((b0, ending[:, :-1]), axis=1)
+
+    columns = {
+        "retirementNumber": retirement_numbers,
+        "takeOutPercentage": take_out_percentages,
+        "interest": interests,
+        "year": years,
+        "startingRetirementNumber": starting,
+        "withdrawal": np.broadcast_to(withdrawal, ending.shape),
+        "endingRetirementNumber": ending
+    }
+    if as_arrays:
+        return columns
+    return { key: np.round(value, _round_dig).tolist() for key, value in columns.items() }
+
+
+def investment_accounts(
+    names: List[str] = None,
+    starting_amounts: List[float] = None,
+    monthly_contributions: List[float] = None,
+    interests: List[float] = None,
+    contribution_growths: List[float] = None,
+    start_year: int = None,
+    end_year: int = None,
+    compouding_periods: int = None,
+    as_json: bool = False,
+    as_arrays: bool = False) -> pd.DataFrame:
+    """
+    Calculate any number of investment accounts - 401(k), Roth IRA, HSA, 457(b), SEP IRA, 529, Brokerage, etc.
+
+    Parameters
+    ----------
+    `names` : list or None.
+        account names, used as column names. defaults to `account1`, `account2`, ...\n
+    `starting_amounts` : list or None.
+        starting amount per account. defaults to `[0]`\n
+    `monthly_contributions` : list or None.
+        monthly contributions per account in the first year. defaults to `[500]`\n
+    `interests` : list or None.
+        interest per account, from 0 to 100. defaults to `[7]`\n
+    `contribution_growths` : list or None.
+        yearly growth of the contributions per account, in %. defaults to `[0]`\n
+    `start_year` : int.
+        start year. defaults to `datetime.datetime.today().year`\n
+    `end_year` : int.
+        end year. defaults to `start_year + 10`\n
+    `compouding_periods` : int.
+        compouding periods. defaults to `12`\n
+    `as_json` : bool.
+        whether to return the data as JSON. defaults to `False`\n
+    `as_arrays` : bool.
+        return `numpy.ndarray` (years x accounts) `balances` and `monthlyContributions` instead of a
+        `pandas.DataFrame`. defaults to `False`
+
+    Notes
+    ----------
+    Account inputs are broadcast against each other. With the yearly growth factor `g` and the future value
+    `f` of one year of contributions, the balance is `B_t = g^t * (B_0 + f * sum(c_s / g^s))`, so every year
+    of every account comes from one `cumsum` over a years x accounts array
+    """
+    # Check for None
+    starting_amounts = starting_amounts if starting_amounts is not None else [0]
+    monthly_contributions = monthly_contributions if monthly_contributions is not None else [500]
+    interests = interests if interests is not None else [_default_interest]
+    contribution_growths = contribution_growths if contribution_growths is not None else [0]
+    start_year = start_year if start_year is not None else datetime.datetime.today().year
+    end_year = end_year if end_year is not None else start_year + 10
+    compouding_periods = compouding_periods if compouding_periods is not None else 12
+
+    starting_amounts, monthly_contributions, interests, contribution_growths = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(starting_amounts, dtype=float)),
+        np.asarray(monthly_contributions, dtype=float),
+        np.asarray(interests, dtype=float),
+        np.asarray(contribution_growths, dtype=float))
+    if names is None:
+        names = [f"account{i + 1}" for i in range(len(starting_amounts))]
+
+    # Check and fix parameters
+    if len(names) != len(starting_amounts):
+        raise ValueError("There must be one name per account")
+    elif len(set(names)) != len(names):
+        raise ValueError("Account names must be unique")
+    elif not set(names).isdisjoint(_investment_accounts_columns | { name + "MonthlyContributions" for name in names }):
+        raise ValueError("Account names cannot be any of the following: " + ", ".join(sorted(_investment_accounts_columns)) +
+            ", or another account name followed by MonthlyContributions")
+    elif np.any(interests > 100) or np.any(interests < 0):
+        raise ValueError("Interest must be between 0% and 100%")
+    elif end_year <= start_year:
+        raise ValueError("Start year cannot be less than end year")
+    elif compouding_periods <= 0:
+        raise ValueError("Compouding periods must be greater than 0")
+    elif np.any(starting_amounts < 0):
+        raise ValueError("Starting amount cannot be less than 0")
+    elif np.any(monthly_contributions < 0):
+        raise ValueError("Monthly contributions cannot be less than 0")
+    elif np.any(contribution_growths <= -100):
+        raise ValueError("Contribution growth must be greater than -100%")
+
+    number_of_years = int(end_year - start_year)
+    years = np.arange(start_year, end_year + 1)
+    t = np.arange(number_of_years + 1)[:, None]
+
+    rate = interests / 100 / compouding_periods
+    growth = (1 + rate) ** compouding_periods
+    year_factor = np.where(rate == 0, compouding_periods, (growth - 1) / np.where(rate == 0, 1, rate))
+
+    # Contributions of year `t` are made during year `t` and the first row holds the starting amounts
+    contributions = monthly_contributions * (1 + contribution_growths / 100) ** np.maximum(t - 1, 0)
+    discounted = np.where(t > 0, contributions * year_factor / growth ** t, 0)
+    balances = growth ** t * (starting_amounts + np.cumsum(discounted, axis=0))
+
+    if as_arrays:
+        return {
+            "names": list(names),
+            "years": years,
+            "balances": balances,
+            "monthlyContributions": contributions
+        }
+
+    df = pd.DataFrame({ "year": years, "compoundingPeriods": compouding_periods })
+    for i, name in enumerate(names):
+        df[name] = balances[:, i]
+        df[name + "MonthlyContributions"] = contributions[:, i]
+    df["total"] = balances.sum(axis=1)
+    df["totalMonthlyContributions"] = contributions.sum(axis=1)
     df = df.round(_round_dig)
 
     return df if not as_json else df.to_dict(orient="records")
@@ -151,68 +324,15 @@ def common_investments(
     elif (brokerage_monthly_contributions < 0):
         raise ValueError("Brokerage monthly contributions cannot be less than 0")
 
-    interest = interest / 100
-
-    # Initial data frame
-    df = pd.DataFrame(columns=[
-        "year", 
-        "compoundingPeriods", 
-        "fourohoneK", 
-        "fourohoneKMonthlyContributions", 
-        "rothIra", 
-        "rothIraMonthlyContributions", 
-        "brokerage", 
-        "brokerageMonthlyContributions",
-        "total",
-        "totalMonthlyContributions"], dtype="float")
-
-    df.loc[0, "year"] = start_year
-    df.loc[0, "compoundingPeriods"] = compouding_periods
-    df.loc[0, "fourohoneK"] = fourohone_k_starting_amount
-    df.loc[0, "fourohoneKMonthlyContributions"] = fourohone_k_monthly_contributions
-    df.loc[0, "rothIra"] = roth_ira_starting_amount
-    df.loc[0, "rothIraMonthlyContributions"] = roth_ira_monthly_contributions
-    df.loc[0, "brokerage"] = brokerage_starting_amount
-    df.loc[0, "brokerageMonthlyContributions"] = brokerage_monthly_contributions
-    df.loc[0, "total"] = fourohone_k_starting_amount + roth_ira_starting_amount + brokerage_starting_amount
-    df.loc[0, "totalMonthlyContributions"] = fourohone_k_monthly_contributions + roth_ira_monthly_contributions + brokerage_monthly_contributions
-
-    for i in range(1, int(end_year - start_year) + 1):
-        df.loc[i, "year"] = start_year + i
-        df.loc[i, "compoundingPeriods"] = compouding_periods
-
-        df.loc[i, "fourohoneK"] = -npf.fv(
-            rate=interest / compouding_periods,
-            nper=compouding_periods,
-            pmt=fourohone_k_monthly_contributions,
-            pv=df.loc[i - 1, "fourohoneK"],
-            when='end')
-        df.loc[i, "fourohoneKMonthlyContributions"] = fourohone_k_monthly_contributions
-
-        df.loc[i, "rothIra"] = -npf.fv(
-            rate=interest / compouding_periods,
-            nper=compouding_periods,
-            pmt=roth_ira_monthly_contributions,
-            pv=df.loc[i - 1, "rothIra"],
-            when='end')
-        df.loc[i, "rothIraMonthlyContributions"] = roth_ira_monthly_contributions
-        
-        df.loc[i, "brokerage"] = -npf.fv(
-            rate=interest / compouding_periods,
-            nper=compouding_periods,
-            pmt=brokerage_monthly_contributions,
-            pv=df.loc[i - 1, "brokerage"],
-            when='end')
-        df.loc[i, "brokerageMonthlyContributions"] = brokerage_monthly_contributions
-
-        df.loc[i, "total"] = df.loc[i, "fourohoneK"] + df.loc[i, "rothIra"] + df.loc[i, "brokerage"]
-        df.loc[i, "totalMonthlyContributions"] = df.loc[i, "fourohoneKMonthlyContributions"] + df.loc[i, "rothIraMonthlyContributions"] + df.loc[i, "brokerageMonthlyContributions"]
-
-    df["year"] = df["year"].astype(int)
-    df["compoundingPeriods"] = df["compoundingPeriods"].astype(int)
-    df = df.round(_round_dig)
-
-    return df if not as_json else df.to_dict(orient="records")
+    return investment_accounts(
+        names                   = ["fourohoneK", "rothIra", "brokerage"],
+        starting_amounts        = [fourohone_k_starting_amount, roth_ira_starting_amount, brokerage_starting_amount],
+        monthly_contributions   = [fourohone_k_monthly_contributions, roth_ira_monthly_contributions, brokerage_monthly_contributions],
+        interests               = [interest],
+        start_year              = start_year,
+        end_year                = end_year,
+        compouding_periods      = compouding_periods,
+        as_json                 = as_json)
 
 
 def number_simple(
@@ -262,4 +382,100 @@ def number(
     age_diff = retirement_end_age - desired_retirement_age
     desired_salary = desired_monthly_income * 12
 
-    return age_diff * desired_salary
\ No newline at end of file
+    return age_diff * desired_salary
+
+
+def number_batch(
+    current_ages: List[int] = None,
+    desired_retirement_ages: List[int] = None,
+    retirement_end_ages: List[int] = None,
+    desired_monthly_incomes: List[float] = None,
+    inflations: List[float] = None,
+    interests: List[float] = None,
+    as_arrays: bool = False):
+    """
+    Calculate the inflation and return aware retirement number of many people in one call
+
+    Parameters
+    ----------
+    `current_ages` : list or None.
+        current ages. defaults to `[35]`\n
+    `desired_retirement_ages` : list or None.
+        desired retirement ages. defaults to `[65]`\n
+    `retirement_end_ages` : list or None.
+        retirement end ages. defaults to `[95]`\n
+    `desired_monthly_incomes` : list or None.
+        desired monthly incomes, in today's dollars. defaults to `[5,000]`\n
+    `inflations` : list or None.
+        yearly inflation, in %. defaults to `[3]`\n
+    `interests` : list or None.
+        yearly return during retirement and until then, in %. defaults to `[7]`\n
+    `as_arrays` : bool.
+        return `numpy.ndarray` columns instead of lists. defaults to `False`
+
+    Notes
+    ----------
+    Inputs are broadcast against each other. The first year's income is the desired income grown with inflation
+    until retirement and it keeps growing with inflation, taken at the beginning of each year. `retirementNumber`
+    is the present value of that growing annuity due at retirement, `W * (1 + r) * (1 - ((1 + g) / (1 + r))^n) / (r - g)`,
+    or `W * n` when `r = g`. With no inflation and no return it is the same as `number()`. `realRetirementNumber`
+    is in today's dollars and `presentValue` is the lump sum needed today
+    """
+    current_ages = current_ages if current_ages is not None else [35]
+    desired_retirement_ages = desired_retirement_ages if desired_retirement_ages is not None else [65]
+    retirement_end_ages = retirement_end_ages if retirement_end_ages is not None else [95]
+    desired_monthly_incomes = desired_monthly_incomes if desired_monthly_incomes is not None else [5000]
+    inflations = inflations if inflations is not None else [3]
+    interests = interests if interests is not None else [_default_interest]
+
+    current_ages, desired_retirement_ages, retirement_end_ages, desired_monthly_incomes, inflations, interests = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(current_ages, dtype=int)),
+        np.asarray(desired_retirement_ages, dtype=int),
+        np.asarray(retirement_end_ages, dtype=int),
+        np.asarray(desired_monthly_incomes, dtype=float),
+        np.asarray(inflations, dtype=float),
+        np.asarray(interests, dtype=float))
+
+    if np.any(current_ages <= 0):
+        raise ValueError("current age cannot be negative or 0")
+    elif np.any(desired_retirement_ages < current_ages):
+        raise ValueError("desired retirement age cannot be smaller than current age")
+    elif np.any(retirement_end_ages < desired_retirement_ages):
+        raise ValueError("retirement end age cannot be smaller than desired retirement age")
+    elif np.any(desired_monthly_incomes < 0):
+        raise ValueError("desired monthly income cannot be negative")
+    elif np.any(inflations <= -100) or np.any(interests <= -100):
+        raise ValueError("inflation and interest must be greater than -100")
+
+    years_to_retirement = desired_retirement_ages - current_ages
+    years_in_retirement = retirement_end_ages - desired_retirement_ages
+    g = inflations / 100
+    r = interests / 100
+
+    price_index = (1 + g) ** years_to_retirement
+    first_year_income = desired_monthly_incomes * 12 * price_index
+
+    # Growing annuity due, with the `r = g` limit handled separately
+    same_rate = np.isclose(r, g)
+    safe_spread = np.where(same_rate, 1, r - g)
+    annuity_factor = np.where(
+        same_rate,
+        years_in_retirement,
+        (1 + r) * (1 - ((1 + g) / (1 + r)) ** years_in_retirement) / safe_spread)
+    retirement_number = first_year_income * annuity_factor
+
+    columns = {
+        "currentAge": current_ages,
+        "desiredRetirementAge": desired_retirement_ages,
+        "retirementEndAge": retirement_end_ages,
+        "desiredMonthlyIncome": desired_monthly_incomes,
+        "inflation": inflations,
+        "interest": interests,
+        "firstYearIncome": np.round(first_year_income, _round_dig),
+        "retirementNumber": np.round(retirement_number, _round_dig),
+        "realRetirementNumber": np.round(retirement_number / price_index, _round_dig),
+        "presentValue": np.round(retirement_number / (1 + r) ** years_to_retirement, _round_dig)
+    }
+    if as_arrays:
+        return columns
+    return { key: value.tolist() for key, value in columns.items() }
@@ -0,0 +1,260 @@
+import itertools
+import numpy as np
+
+import aiof.config as config
+
+from typing import List
+
+
+# Configs
+_settings = config.get_settings()
+_round_dig = _settings.DefaultRoundingDigit
+_default_interest = _settings.DefaultInterest
+_accounts = [ "fourohoneK", "rothIra", "brokerage" ]
+_max_income = 1e12
+
+
+def tax_table(tax_brackets: List[List[float]] = None, standard_deduction: float = None):
+    """
+    Breakpoints of the ordinary income tax and of the after-tax income, both piecewise linear in income
+
+    Parameters
+    ----------
+    `tax_brackets` : list or None.
+        [taxable income threshold, rate in %] pairs, starting at `0`. defaults to `Settings.TaxBrackets`\n
+    `standard_deduction` : float or None.
+        deducted from income before the brackets apply. defaults to `Settings.StandardDeduction`
+
+    Returns
+    ----------
+    `Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]` of the income breakpoints, the tax and the after-tax
+    income at each of them. `np.interp` over them gives the exact tax of any income, and the exact income
+    needed for any after-tax amount
+    """
+    tax_brackets = tax_brackets if tax_brackets is not None else _settings.TaxBrackets
+    standard_deduction = standard_deduction if standard_deduction is not None else _settings.StandardDeduction
+
+    brackets = np.asarray(tax_brackets, dtype=float)
+    if brackets.ndim != 2 or brackets.shape[1] != 2 or len(brackets) == 0:
+        raise ValueError("Tax brackets must be a list of [threshold, rate] pairs")
+    thresholds, rates = brackets[:, 0], brackets[:, 1] / 100
+    if thresholds[0] != 0 or np.any(np.diff(thresholds) <= 0):
+        raise ValueError("Tax bracket thresholds must start at 0 and increase")
+    elif np.any(rates < 0) or np.any(rates >= 1):
+        raise ValueError("Tax bracket rates must be between 0 and 100")
+    elif standard_deduction < 0:
+        raise ValueError("Standard deduction cannot be less than 0")
+
+    incomes = np.concatenate(([0], standard_deduction + thresholds, [_max_income]))
+    taxable = np.diff(np.concatenate((thresholds, [_max_income])))
+    taxes = np.concatenate(([0, 0], np.cumsum(rates * taxable)))
+    return incomes, taxes, incomes - taxes
+
+
+def decumulation_plan(
+    fourohone_k_balance: float = None,
+    roth_ira_balance: float = None,
+    brokerage_balance: float = None,
+    brokerage_basis_percentage: float = None,
+    annual_spending: float = None,
+    other_income: float = None,
+    number_of_years: int = None,
+    interest: float = None,
+    inflation: float = None,
+    orderings: List[List[str]] = None,
+    conversions: List[float] = None,
+    tax_brackets: List[List[float]] = None,
+    standard_deduction: float = None,
+    capital_gains_rate: float = None,
+    ending_tax_rate: float = None):
+    """
+    Find the withdrawal order and yearly Roth conversion that minimize lifetime tax across
+    401(k), Roth IRA and Brokerage accounts
+
+    Parameters
+    ----------
+    `fourohone_k_balance` : float or None.
+        401(k), or other pre-tax, balance. defaults to `500,000`\n
+    `roth_ira_balance` : float or None.
+        Roth IRA balance. defaults to `100,000`\n
+    `brokerage_balance` : float or None.
+        Brokerage balance. defaults to `200,000`\n
+    `brokerage_basis_percentage` : float or None.
+        cost basis as a percentage of the Brokerage balance. defaults to `50`\n
+    `annual_spending` : float or None.
+        after-tax spending in the first year, in today's dollars. defaults to `40,000`\n
+    `other_income` : float or None.
+        other ordinary taxable income per year (pension, etc.), in today's dollars. defaults to `0`\n
+    `number_of_years` : int or None.
+        number of years to plan. defaults to `30`\n
+    `interest` : float or None.
+        yearly return of every account, in %. defaults to `7`\n
+    `inflation` : float or None.
+        yearly inflation, in %. spending, other income, conversions, brackets and the standard deduction grow with it.
+        defaults to `3`\n
+    `orderings` : list or None.
+        withdrawal orders to consider, each a permutation of `fourohoneK`, `rothIra` and `brokerage`. defaults to all `6`\n
+    `conversions` : list or None.
+        yearly Roth conversion amounts to consider, in today's dollars. defaults to `Settings.DefaultRothConversions`\n
+    `tax_brackets`, `standard_deduction` :
+        ordinary income tax table, see `tax_table()`\n
+    `capital_gains_rate` : float or None.
+        flat tax on realized Brokerage gains, in %. defaults to `Settings.DefaultCapitalGainsRate`\n
+    `ending_tax_rate` : float or None.
+        tax rate the ending 401(k) balance is assumed to be taxed at, in %. defaults to `22`
+
+    Notes
+    ----------
+    Every ordering x conversion candidate is planned at once on (candidates x accounts) arrays. Years are stepped
+    in order since balances carry over, but nothing is looped per candidate. Each year the conversion moves money
+    from the 401(k) to the Roth IRA, then spending and taxes are drawn from the accounts in order, at the beginning
+    of the year. 401(k) withdrawals are grossed up for their marginal tax exactly, by inverting the piecewise linear
+    after-tax income with `np.interp`. `totalTax` is the lifetime tax plus the tax still owed on the ending balances.
+    Candidates are ranked by its `presentValueTax`, discounted at `interest`, so paying tax early costs its lost growth.
+    Candidates that can't fully fund the spending come last, ranked by shortfall
+    """
+    # Check for None
+    fourohone_k_balance = fourohone_k_balance if fourohone_k_balance is not None else 500000
+    roth_ira_balance = roth_ira_balance if roth_ira_balance is not None else 100000
+    brokerage_balance = brokerage_balance if brokerage_balance is not None else 200000
+    brokerage_basis_percentage = brokerage_basis_percentage if brokerage_basis_percentage is not None else 50
+    annual_spending = annual_spending if annual_spending is not None else 40000
+    other_income = other_income if other_income is not None else 0
+    number_of_years = int(number_of_years if number_of_years is not None else 30)
+    interest = interest if interest is not None else _default_interest
+    inflation = inflation if inflation is not None else 3
+    orderings = orderings if orderings is not None else [list(o) for o in itertools.permutations(_accounts)]
+    conversions = conversions if conversions is not None else _settings.DefaultRothConversions
+    capital_gains_rate = capital_gains_rate if capital_gains_rate is not None else _settings.DefaultCapitalGainsRate
+    ending_tax_rate = ending_tax_rate if ending_tax_rate is not None else 22
+
+    # Check and fix parameters
+    if fourohone_k_balance < 0 or roth_ira_balance < 0 or brokerage_balance < 0:
+        raise ValueError("Account balances cannot be less than 0")
+    elif brokerage_basis_percentage < 0 or brokerage_basis_percentage > 100:
+        raise ValueError("Brokerage basis percentage must be between 0 and 100")
+    elif annual_spending < 0 or other_income < 0:
+        raise ValueError("Annual spending and other income cannot be less than 0")
+    elif number_of_years <= 0 or number_of_years > 100:
+        raise ValueError("Number of years must be between 1 and 100")
+    elif interest <= -100 or inflation <= -100:
+        raise ValueError("Interest and inflation must be greater than -100")
+    elif len(orderings) == 0 or any(sorted(o) != sorted(_accounts) for o in orderings):
+        raise ValueError("Orderings must be permutations of the following: " + ", ".join(_accounts))
+    elif len(conversions) == 0 or min(conversions) < 0:
+        raise ValueError("Conversions cannot be empty or less than 0")
+    elif capital_gains_rate < 0 or capital_gains_rate >= 100 or ending_tax_rate < 0 or ending_tax_rate > 100:
+        raise ValueError("Capital gains and ending tax rates must be between 0 and 100")
+
+    incomes, taxes, after_tax = tax_table(tax_brackets, standard_deduction)
+    cg_rate = capital_gains_rate / 100
+
+    # Candidates: every ordering x conversion pair
+    order_index = np.array([[_accounts.index(a) for a in o] for o in orderings])
+    candidate_orders = np.repeat(order_index, len(conversions), axis=0)
+    candidate_conversions = np.tile(np.asarray(conversions, dtype=float), len(orderings))
+    n = len(candidate_conversions)
+
+    balances = np.tile([fourohone_k_balance, roth_ira_balance, brokerage_balance], (n, 1)).astype(float)
+    basis = balances[:, 2] * brokerage_basis_percentage / 100
+    shape = (number_of_years, n)
+    withdrawals = np.zeros(shape + (3,))
+    converted = np.zeros(shape)
+    yearly_taxes = np.zeros(shape)
+    shortfalls = np.zeros(shape)
+    ending_balances = np.zeros(shape + (3,))
+
+    for year in range(number_of_years):
+        # Brackets, deduction and amounts are indexed with inflation
+        s = (1 + inflation / 100) ** year
+
+        conversion = np.minimum(candidate_conversions * s, balances[:, 0])
+        balances[:, 0] -= conversion
+        balances[:, 1] += conversion
+        income = other_income * s + conversion
+
+        # Other income left after spending and the tax so far is reinvested in the Brokerage account
+        need = annual_spending * s + _indexed(income, s, incomes, taxes) - other_income * s
+        surplus = np.maximum(-need, 0)
+        balances[:, 2] += surplus
+        basis += surplus
+        need = np.maximum(need, 0)
+        gains_tax = np.zeros(n)
+
+        for position in range(3):
+            account = candidate_orders[:, position]
+
+            # 401(k): the after-tax amount is the change in after-tax income
+            available = _indexed(income + balances[:, 0], s, incomes, after_tax) - _indexed(income, s, incomes, after_tax)
+            take = np.minimum(need, available)
+            fourohone_k = np.where(account == 0, np.minimum(_indexed(_indexed(income, s, incomes, after_tax) + take, s, after_tax, incomes) - income, balances[:, 0]), 0)
+
+            # Roth IRA: tax free
+            roth_ira = np.where(account == 1, np.minimum(need, balances[:, 1]), 0)
+
+            # Brokerage: only the gains share of a withdrawal is taxed. Losses, when the basis is above the balance,
+            # aren't taxed or credited, but still use up their share of the basis
+            with np.errstate(divide="ignore", invalid="ignore"):
+                basis_ratio = np.where(balances[:, 2] > 0, basis / balances[:, 2], 1)
+            basis_share = np.minimum(basis_ratio, 1)
+            net_share = 1 - (1 - basis_share) * cg_rate
+            brokerage = np.where(account == 2, np.minimum(need / net_share, balances[:, 2]), 0)
+
+            income += fourohone_k
+            gains_tax += brokerage * (1 - basis_share) * cg_rate
+            basis -= brokerage * basis_ratio
+            need = np.maximum(need - np.where(account == 0, take, 0) - roth_ira - brokerage * net_share, 0)
+
+            drawn = np.stack((fourohone_k, roth_ira, brokerage), axis=1)
+            balances -= drawn
+            withdrawals[year] += drawn
+
+        converted[year] = conversion
+        yearly_taxes[year] = _indexed(income, s, incomes, taxes) + gains_tax
+        shortfalls[year] = np.where(need > 0.005, need, 0)
+        balances *= 1 + interest / 100
+        ending_balances[year] = balances
+
+    lifetime_tax = yearly_taxes.sum(axis=0)
+    deferred_tax = balances[:, 0] * ending_tax_rate / 100 + np.maximum(balances[:, 2] - basis, 0) * cg_rate
+    total_tax = lifetime_tax + deferred_tax
+    discount = (1 + interest / 100) ** -np.arange(number_of_years + 1)
+    present_value_tax = discount[:-1] @ yearly_taxes + discount[-1] * deferred_tax
+    shortfall = shortfalls.sum(axis=0)
+    after_tax_ending = balances.sum(axis=1) - deferred_tax
+    ranking = np.lexsort((present_value_tax, np.round(shortfall, _round_dig)))
+    best = ranking[0]
+
+    candidates = [{
+        "ordering": [_accounts[a] for a in candidate_orders[i]],
+        "conversion": float(candidate_conversions[i]),
+        "lifetimeTax": round(float(lifetime_tax[i]), _round_dig),
+        "deferredTax": round(float(deferred_tax[i]), _round_dig),
+        "totalTax": round(float(total_tax[i]), _round_dig),
+        "presentValueTax": round(float(present_value_tax[i]), _round_dig),
+        "shortfall": round(float(shortfall[i]), _round_dig),
+        "afterTaxEndingBalance": round(float(after_tax_ending[i]), _round_dig)
+    } for i in ranking]
+
+    plan = [{
+        "year": year + 1,
+        "spending": round(annual_spending * (1 + inflation / 100) ** year, _round_dig),
+        "conversion": round(float(converted[year, best]), _round_dig),
+        **{ a + "Withdrawal": round(float(withdrawals[year, best, i]), _round_dig) for i, a in enumerate(_accounts) },
+        "tax": round(float(yearly_taxes[year, best]), _round_dig),
+        "shortfall": round(float(shortfalls[year, best]), _round_dig),
+        **{ a: round(float(ending_balances[year, best, i]), _round_dig) for i, a in enumerate(_accounts) }
+    } for year in range(number_of_years)]
+
+    return {
+        "best": candidates[0],
+        "plan": plan,
+        "candidates": candidates
+    }
+
+
+def _indexed(x: np.ndarray, scale: float, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    """
+    Piecewise linear `fp(xp)` with brackets indexed by `scale`, i.e. `scale * f(x / scale)`
+    """
+    return scale * np.interp(x / scale, xp, fp)
@@ -0,0 +1,187 @@
+import numpy as np
+
+import aiof.config as config
+import aiof.helpers as helpers
+import aiof.retirement.backtest as backtest
+
+from typing import List
+
+
+# Configs
+_settings = config.get_settings()
+_round_dig = _settings.DefaultRoundingDigit
+_default_interest = _settings.DefaultInterest
+_methods = [ "deterministic", "simulated", "historical" ]
+
+
+def sustainable_rates(returns: np.ndarray, inflation: np.ndarray = None) -> np.ndarray:
+    """
+    Highest sustainable withdrawal rate of every path, for every horizon, in one pass
+
+    Parameters
+    ----------
+    `returns` : numpy.ndarray.
+        yearly returns, as decimals, with years on the last axis. any leading axes are paths, portfolios, etc.\n
+    `inflation` : numpy.ndarray or None.
+        yearly inflation, as decimals, broadcastable to `returns`. withdrawals grow with it when set
+
+    Returns
+    ----------
+    `numpy.ndarray` shaped like `returns`, where `[..., t]` is the highest rate, as a decimal of the starting
+    balance, that lasts `t + 1` years. `nan` returns give `nan` rates
+
+    Notes
+    ----------
+    Withdrawals are taken at the beginning of each year, like `withdrawal_calc()`. With growth factors `G_t`
+    and withdrawal growth `c_t` the ending balance is `G_T * (B_0 - w * sum(c_t / G_(t-1)))`. It is linear in `w`,
+    so the rate that ends at exactly `0` is `1 / sum(c_t / G_(t-1))` and no search is needed
+    """
+    growth = np.cumprod(1 + returns, axis=-1)
+    previous_growth = np.concatenate((np.ones_like(growth[..., :1]), growth[..., :-1]), axis=-1)
+    withdrawal_growth = np.ones_like(growth)
+    if inflation is not None:
+        prices = np.cumprod(1 + np.broadcast_to(inflation, growth.shape), axis=-1)
+        withdrawal_growth[..., 1:] = prices[..., :-1]
+    return 1 / np.cumsum(withdrawal_growth / previous_growth, axis=-1)
+
+
+def rate_at_success(rates: np.ndarray, success_rates: np.ndarray) -> np.ndarray:
+    """
+    Highest rate that at least `success_rates` % of the paths sustain
+
+    Parameters
+    ----------
+    `rates` : numpy.ndarray.
+        (portfolios x paths) sustainable rates. `nan` marks paths that don't apply to a portfolio\n
+    `success_rates` : numpy.ndarray.
+        (portfolios) target success rate of each portfolio, in %
+    """
+    rates = np.sort(rates, axis=1)
+    valid = np.sum(~np.isnan(rates), axis=1)
+    index = np.floor(valid * (1 - success_rates / 100) + 1e-9).astype(int)
+    index = np.clip(index, 0, np.maximum(valid - 1, 0))
+    return np.take_along_axis(rates, index[:, None], axis=1)[:, 0]
+
+
+def safe_withdrawal_rate(
+    numbers_of_years: List[int] = None,
+    success_rates: List[float] = None,
+    method: str = None,
+    retirement_number: float = None,
+    interests: List[float] = None,
+    mean: float = None,
+    volatility: float = None,
+    distribution: str = None,
+    paths: int = None,
+    seed: int = None,
+    stocks_allocations: List[float] = None,
+    inflation_adjusted: bool = True,
+    returns_path: str = None):
+    """
+    Find the highest take out percentage a batch of portfolios can sustain for their number of years,
+    at a target success rate
+
+    Parameters
+    ----------
+    `numbers_of_years` : list or None.
+        number of years to take money out, per portfolio. defaults to `[30]`\n
+    `success_rates` : list or None.
+        share of the paths, in %, that must last, per portfolio. defaults to `[95]`\n
+    `method` : str or None.
+        `deterministic` for a constant return, `simulated` for simulated real returns or `historical` for
+        every rolling window of historical returns. defaults to `deterministic`\n
+    `retirement_number` : float or None.
+        retirement number the first year's withdrawal is based on. defaults to `1,000,000`\n
+    `interests` : list or None.
+        constant return per portfolio for the `deterministic` method, in %. defaults to `[7]`\n
+    `mean`, `volatility`, `distribution`, `paths`, `seed` :
+        simulated annual real returns for the `simulated` method, see `aiof.helpers.simulate_returns()`.
+        default to `5`, `15`, `lognormal`, `10,000` and `None`\n
+    `stocks_allocations` : list or None.
+        percentage in stocks per portfolio for the `historical` method. defaults to `[60]`\n
+    `inflation_adjusted` : bool.
+        whether withdrawals grow with historical inflation for the `historical` method. defaults to `True`\n
+    `returns_path` : str or None.
+        local .csv file with annual returns for the `historical` method. see `aiof.retirement.backtest.load_annual_returns()`
+
+    Notes
+    ----------
+    Portfolio inputs are broadcast against each other. Sustainable rates for every path and horizon come from
+    `sustainable_rates()` in one pass, so the whole batch is solved exactly, with no repeated runs of the plan
+    """
+    numbers_of_years = numbers_of_years if numbers_of_years is not None else [30]
+    success_rates = success_rates if success_rates is not None else [95]
+    method = method if method is not None else "deterministic"
+    retirement_number = retirement_number if retirement_number is not None else 1000000
+
+    if method not in _methods:
+        raise ValueError("Method must be one of the following: " + ", ".join(_methods))
+
+    if method == "deterministic":
+        interests = interests if interests is not None else [_default_interest]
+        numbers_of_years, success_rates, interests = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(numbers_of_years, dtype=int)),
+            np.asarray(success_rates, dtype=float),
+            np.asarray(interests, dtype=float))
+        _check(numbers_of_years, success_rates, 100)
+
+        returns = np.repeat(interests[:, None] / 100, numbers_of_years.max(), axis=1)
+        rates = sustainable_rates(returns)[np.arange(len(numbers_of_years)), numbers_of_years - 1]
+        inputs = { "interests": interests.tolist() }
+    elif method == "simulated":
+        mean = mean if mean is not None else 5
+        volatility = volatility if volatility is not None else 15
+        distribution = distribution if distribution is not None else "lognormal"
+        paths = paths if paths is not None else 10000
+        numbers_of_years, success_rates = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(numbers_of_years, dtype=int)),
+            np.asarray(success_rates, dtype=float))
+        _check(numbers_of_years, success_rates, 100)
+
+        # Every portfolio shares the same simulated paths
+        returns = helpers.simulate_returns(mean, volatility, paths, numbers_of_years.max(), distribution, frequency=1, seed=seed)
+        path_rates = sustainable_rates(returns)
+        rates = rate_at_success(path_rates[:, numbers_of_years - 1].T, success_rates)
+        inputs = { "mean": mean, "volatility": volatility, "distribution": distribution, "paths": paths }
+    else:
+        stocks_allocations = stocks_allocations if stocks_allocations is not None else [60]
+        annual_returns = backtest.load_annual_returns(returns_path)
+        numbers_of_years, success_rates, stocks_allocations = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(numbers_of_years, dtype=int)),
+            np.asarray(success_rates, dtype=float),
+            np.asarray(stocks_allocations, dtype=float))
+        _check(numbers_of_years, success_rates, len(annual_returns))
+        if np.any(stocks_allocations < 0) or np.any(stocks_allocations > 100):
+            raise ValueError("Stocks allocation must be between 0 and 100")
+
+        # Rolling windows over returns padded with `nan`, so windows running past the last year are left out
+        max_years = numbers_of_years.max()
+        padding = np.full(max_years - 1, np.nan)
+        stocks = np.concatenate((annual_returns["stocks"].to_numpy() / 100, padding))
+        bonds = np.concatenate((annual_returns["bonds"].to_numpy() / 100, padding))
+        inflation = np.concatenate((annual_returns["inflation"].to_numpy() / 100, padding))
+        allocation = stocks_allocations[:, None, None] / 100
+        returns = allocation * backtest.rolling_windows(stocks, max_years) \
+            + (1 - allocation) * backtest.rolling_windows(bonds, max_years)
+        path_rates = sustainable_rates(
+            returns,
+            backtest.rolling_windows(inflation, max_years) if inflation_adjusted else None)
+        rates = rate_at_success(path_rates[np.arange(len(numbers_of_years)), :, numbers_of_years - 1], success_rates)
+        inputs = { "stocksAllocations": stocks_allocations.tolist(), "inflationAdjusted": inflation_adjusted }
+
+    return {
+        "method": method,
+        "retirementNumber": retirement_number,
+        **inputs,
+        "numbersOfYears": numbers_of_years.tolist(),
+        "successRates": success_rates.tolist(),
+        "takeOutPercentages": np.round(rates * 100, _round_dig).tolist(),
+        "withdrawals": np.round(rates * retirement_number, _round_dig).tolist()
+    }
+
+
+def _check(numbers_of_years: np.ndarray, success_rates: np.ndarray, max_years: int):
+    if np.any(numbers_of_years <= 0) or np.any(numbers_of_years > max_years):
+        raise ValueError(f"Number of years must be between 1 and {max_years}")
+    elif np.any(success_rates <= 0) or np.any(success_rates > 100):
+        raise ValueError("Success rate must be greater than 0 and at most 100")
@@ -0,0 +1,308 @@
+import inspect
+import numpy as np
+
+import aiof.config as config
+import aiof.helpers as helpers
+import aiof.retirement.backtest as backtest
+
+from typing import List
+
+
+# Configs
+_settings = config.get_settings()
+_round_dig = _settings.DefaultRoundingDigit
+_methods = [ "simulated", "historical" ]
+_kernel_arguments = [
+    "balances", "year", "years_left", "take_out_percentage", "initial_withdrawals",
+    "previous_withdrawals", "previous_returns", "previous_inflation", "prices"
+]
+
+
+# Withdrawal strategy kernels
+# - Each kernel returns the planned withdrawal of the current year for every path at once
+# - Every kernel gets the same keyword arguments from `run_strategy()` and picks the ones it needs:
+#   `balances`, `year` (0 based), `years_left` (including the current year), `take_out_percentage`,
+#   `initial_withdrawals`, `previous_withdrawals`, `previous_returns`, `previous_inflation` and `prices`
+#   (cumulative inflation up to the start of the current year)
+# - Strategy specific parameters are passed through as keyword arguments
+def constant_dollar(initial_withdrawals, prices, **_):
+    """
+    The first year's withdrawal, kept constant in real terms
+    """
+    return initial_withdrawals * prices
+
+
+def constant_percentage(balances, take_out_percentage, **_):
+    """
+    A constant percentage of the current balance
+    """
+    return np.maximum(balances, 0) * take_out_percentage / 100
+
+
+def guyton_klinger(
+    balances,
+    year,
+    years_left,
+    take_out_percentage,
+    initial_withdrawals,
+    previous_withdrawals,
+    previous_returns,
+    previous_inflation,
+    guardrail=20,
+    adjustment=10,
+    preservation_years=15,
+    **_):
+    """
+    Guyton-Klinger decision rules
+
+    - Inflation rule: last year's withdrawal grows with inflation, unless last year's return was negative and
+      the current withdrawal rate is above the initial one
+    - Capital preservation rule: when the withdrawal rate rises `guardrail` % above the initial rate, the
+      withdrawal is cut by `adjustment` %. Not applied in the last `preservation_years` years
+    - Prosperity rule: when the withdrawal rate falls `guardrail` % below the initial rate, the withdrawal
+      is raised by `adjustment` %
+    """
+    if year == 0:
+        return initial_withdrawals.copy()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        current_rate = np.where(balances > 0, previous_withdrawals / balances, np.inf)
+    initial_rate = take_out_percentage / 100
+
+    freeze = (previous_returns < 0) & (current_rate > initial_rate)
+    withdrawals = np.where(freeze, previous_withdrawals, previous_withdrawals * (1 + previous_inflation))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        current_rate = np.where(balances > 0, withdrawals / balances, np.inf)
+    if years_left > preservation_years:
+        withdrawals = np.where(current_rate > initial_rate * (1 + guardrail / 100), withdrawals * (1 - adjustment / 100), withdrawals)
+    return np.where(current_rate < initial_rate * (1 - guardrail / 100), withdrawals * (1 + adjustment / 100), withdrawals)
+
+
+def vpw(balances, years_left, expected_return=5, **_):
+    """
+    Variable percentage withdrawal. The balance is spread over the remaining years as an annuity due
+    at `expected_return` %, so the percentage rises as the horizon shortens
+    """
+    rate = expected_return / 100
+    if rate == 0:
+        return np.maximum(balances, 0) / years_left
+    return np.maximum(balances, 0) * rate / ((1 + rate) * (1 - (1 + rate) ** -years_left))
+
+
+def floor_ceiling(balances, take_out_percentage, initial_withdrawals, prices, floor=85, ceiling=125, **_):
+    """
+    A constant percentage of the current balance, kept between `floor` % and `ceiling` % of the first year's
+    withdrawal in real terms
+    """
+    real_initial = initial_withdrawals * prices
+    return np.clip(np.maximum(balances, 0) * take_out_percentage / 100, real_initial * floor / 100, real_initial * ceiling / 100)
+
+
+strategies = {
+    "constant_dollar": constant_dollar,
+    "constant_percentage": constant_percentage,
+    "guyton_klinger": guyton_klinger,
+    "vpw": vpw,
+    "floor_ceiling": floor_ceiling,
+}
+
+
+def strategy_parameters(strategy: str) -> List[str]:
+    """
+    Strategy specific parameters a kernel takes, besides the ones every kernel gets from `run_strategy()`
+    """
+    return [
+        name for name, parameter in inspect.signature(strategies[strategy]).parameters.items()
+        if parameter.kind != inspect.Parameter.VAR_KEYWORD and name not in _kernel_arguments
+    ]
+
+
+def run_strategy(
+    strategy: str,
+    returns: np.ndarray,
+    retirement_number: float = 1000000,
+    take_out_percentage: float = 4,
+    inflation: np.ndarray = None,
+    **params) -> dict:
+    """
+    Step many portfolios or paths through a withdrawal strategy
+
+    Parameters
+    ----------
+    `strategy` : str.
+        one of `strategies`\n
+    `returns` : numpy.ndarray.
+        (paths x years) yearly returns, as decimals\n
+    `retirement_number` : float or numpy.ndarray.
+        starting balance, or one per path. defaults to `1,000,000`\n
+    `take_out_percentage` : float.
+        first year's withdrawal as a percentage of the starting balance, in %. defaults to `4`\n
+    `inflation` : numpy.ndarray or None.
+        (paths x years) yearly inflation, as decimals. `None` when `returns` are already real\n
+    `params` :
+        strategy specific parameters, see each kernel
+
+    Returns
+    ----------
+    `dict` of (paths x years) `withdrawals`, `plannedWithdrawals` and `endingBalances`, and of the `prices`
+    index at the start of each year
+
+    Notes
+    ----------
+    Withdrawals are taken at the beginning of each year, like `withdrawal_calc()`, and capped at the balance.
+    Years are stepped in order because the rules depend on last year's outcome, but every step is array
+    math over all paths
+    """
+    if strategy not in strategies:
+        raise ValueError("Strategy must be one of the following: " + ", ".join(strategies))
+    kernel = strategies[strategy]
+
+    returns = np.atleast_2d(np.asarray(returns, dtype=float))
+    paths, number_of_years = returns.shape
+    inflation = np.zeros_like(returns) if inflation is None else np.broadcast_to(np.asarray(inflation, dtype=float), returns.shape)
+    prices = np.concatenate((np.ones((paths, 1)), np.cumprod(1 + inflation, axis=1)[:, :-1]), axis=1)
+
+    balances = np.broadcast_to(np.asarray(retirement_number, dtype=float), (paths,)).copy()
+    initial_withdrawals = balances * take_out_percentage / 100
+    previous_withdrawals = initial_withdrawals
+    planned = np.empty_like(returns)
+    withdrawals = np.empty_like(returns)
+    ending_balances = np.empty_like(returns)
+
+    for year in range(number_of_years):
+        planned[:, year] = kernel(
+            balances                = balances,
+            year                    = year,
+            years_left              = number_of_years - year,
+            take_out_percentage     = take_out_percentage,
+            initial_withdrawals     = initial_withdrawals,
+            previous_withdrawals    = previous_withdrawals,
+            previous_returns        = returns[:, year - 1] if year > 0 else np.zeros(paths),
+            previous_inflation      = inflation[:, year - 1] if year > 0 else np.zeros(paths),
+            prices                  = prices[:, year],
+            **params)
+        withdrawals[:, year] = np.minimum(planned[:, year], np.maximum(balances, 0))
+        balances = (balances - withdrawals[:, year]) * (1 + returns[:, year])
+        ending_balances[:, year] = balances
+        previous_withdrawals = planned[:, year]
+
+    return {
+        "withdrawals": withdrawals,
+        "plannedWithdrawals": planned,
+        "endingBalances": ending_balances,
+        "prices": prices
+    }
+
+
+def compare_strategies(
+    strategy_names: List[str] = None,
+    retirement_number: float = None,
+    take_out_percentage: float = None,
+    number_of_years: int = None,
+    method: str = None,
+    mean: float = None,
+    volatility: float = None,
+    distribution: str = None,
+    paths: int = None,
+    seed: int = None,
+    stocks_allocation: float = None,
+    returns_path: str = None,
+    params: dict = None):
+    """
+    Compare withdrawal strategies on the same set of return paths
+
+    Parameters
+    ----------
+    `strategy_names` : list or None.
+        strategies to compare. defaults to all of `strategies`\n
+    `retirement_number` : float or None.
+        starting balance. defaults to `1,000,000`\n
+    `take_out_percentage` : float or None.
+        first year's withdrawal as a percentage of the starting balance, in %. defaults to `4`\n
+    `number_of_years` : int or None.
+        number of years to take money out. defaults to `30`\n
+    `method` : str or None.
+        `simulated` real returns or every rolling window of `historical` returns. defaults to `simulated`\n
+    `mean`, `volatility`, `distribution`, `paths`, `seed` :
+        simulated annual real returns, see `aiof.helpers.simulate_returns()`. default to `5`, `15`, `lognormal`,
+        `10,000` and `None`\n
+    `stocks_allocation` : float or None.
+        percentage in stocks for `historical` returns. defaults to `60`\n
+    `returns_path` : str or None.
+        local .csv file with annual returns for the `historical` method. see `aiof.retirement.backtest.load_annual_returns()`\n
+    `params` : dict or None.
+        strategy specific parameters, keyed by strategy name
+
+    Notes
+    ----------
+    All amounts are reported in real, start year, dollars. A path succeeds when every planned withdrawal
+    is fully paid
+    """
+    strategy_names = strategy_names if strategy_names is not None else list(strategies)
+    retirement_number = retirement_number if retirement_number is not None else 1000000
+    take_out_percentage = take_out_percentage if take_out_percentage is not None else 4
+    number_of_years = number_of_years if number_of_years is not None else 30
+    method = method if method is not None else "simulated"
+    paths = paths if paths is not None else 10000
+    stocks_allocation = stocks_allocation if stocks_allocation is not None else 60
+    params = params if params is not None else {}
+
+    if method not in _methods:
+        raise ValueError("Method must be one of the following: " + ", ".join(_methods))
+    elif number_of_years <= 0 or number_of_years > 100:
+        raise ValueError("Number of years must be between 1 and 100")
+    elif paths < 1:
+        raise ValueError("Paths must be at least 1")
+    elif stocks_allocation < 0 or stocks_allocation > 100:
+        raise ValueError("Stocks allocation must be between 0 and 100")
+    for name, strategy_params in params.items():
+        if name not in strategies:
+            raise ValueError("Strategy must be one of the following: " + ", ".join(strategies))
+        unknown = [key for key in strategy_params if key not in strategy_parameters(name)]
+        if unknown:
+            raise ValueError(f"Unknown {name} parameters: " + ", ".join(unknown))
+
+    if method == "simulated":
+        returns = helpers.simulate_returns(
+            mean if mean is not None else 5,
+            volatility if volatility is not None else 15,
+            paths,
+            number_of_years,
+            distribution if distribution is not None else "lognormal",
+            frequency=1,
+            seed=seed)
+        inflation = None
+    else:
+        annual_returns = backtest.load_annual_returns(returns_path)
+        if number_of_years > len(annual_returns):
+            raise ValueError(f"Number of years must be between 1 and {len(annual_returns)}")
+        stocks = stocks_allocation / 100
+        portfolio_returns = (stocks * annual_returns["stocks"].to_numpy() + (1 - stocks) * annual_returns["bonds"].to_numpy()) / 100
+        returns = backtest.rolling_windows(portfolio_returns, number_of_years)
+        inflation = backtest.rolling_windows(annual_returns["inflation"].to_numpy() / 100, number_of_years)
+
+    results = []
+    for name in strategy_names:
+        run = run_strategy(name, returns, retirement_number, take_out_percentage, inflation, **params.get(name, {}))
+        real_withdrawals = run["withdrawals"] / run["prices"]
+        real_ending_balances = np.maximum(run["endingBalances"][:, -1], 0) / (run["prices"][:, -1] * (1 + (inflation[:, -1] if inflation is not None else 0)))
+        success = np.all(run["withdrawals"] >= run["plannedWithdrawals"] - 0.005, axis=1)
+        results.append({
+            "strategy": name,
+            "successRate": round(float(success.mean()) * 100, _round_dig),
+            "medianTotalWithdrawals": round(float(np.median(real_withdrawals.sum(axis=1))), _round_dig),
+            "medianMinimumWithdrawal": round(float(np.median(real_withdrawals.min(axis=1))), _round_dig),
+            "worstMinimumWithdrawal": round(float(real_withdrawals.min()), _round_dig),
+            "medianEndingBalance": round(float(np.median(real_ending_balances)), _round_dig),
+            "medianWithdrawals": np.round(np.median(real_withdrawals, axis=0), _round_dig).tolist()
+        })
+
+    return {
+        "retirementNumber": retirement_number,
+        "takeOutPercentage": take_out_percentage,
+        "numberOfYears": number_of_years,
+        "method": method,
+        "paths": len(returns),
+        "strategies": results
+    }
@@ -0,0 +1,60 @@
+import aiof.config as config
+import aiof.helpers as helpers
+
+from fastapi.responses import StreamingResponse
+from pandas.core.frame import DataFrame
+from typing import Optional
+
+
+# Configs
+_settings = config.get_settings()
+_export_formats = _settings.ExportFormats
+
+
+def resolve_format(format: Optional[str] = None, accept: Optional[str] = None) -> str:
+    """
+    Pick the export format from an explicit `format` parameter or, if there is none, from an `Accept` header
+
+    Parameters
+    ----------
+    `format` : str or None.
+        explicit format, one of `Settings.ExportFormats`. takes precedence over `accept`\n
+    `accept` : str or None.
+        the request's `Accept` header. the first listed media type that matches one of 
+        `Settings.ExportFormats` is used. defaults to `csv` when nothing matches
+    """
+    if format is not None:
+        return format
+    for media_type in (accept or "").split(","):
+        media_type = media_type.split(";")[0].strip().lower()
+        for name, export_media_type in _export_formats.items():
+            if media_type == export_media_type:
+                return name
+    return "csv"
+
+
+def export_response(
+    df: DataFrame,
+    name: str,
+    format: Optional[str] = None,
+    accept: Optional[str] = None) -> StreamingResponse:
+    """
+    Stream a `pandas.DataFrame` as a file download in bounded row chunks
+
+    Parameters
+    ----------
+    `df` : pandas.DataFrame.
+        the table to download\n
+    `name` : str.
+        the file name, without extension\n
+    `format` : str or None.
+        one of `Settings.ExportFormats`\n
+    `accept` : str or None.
+        the request's `Accept` header, used when `format` is not set
+    """
+    format = resolve_format(format, accept)
+    chunks = helpers.export_chunks(df, format=format)
+    return StreamingResponse(
+        chunks,
+        media_type=_export_formats[format],
+        headers={ "Content-Disposition": f"attachment; filename={name}.{format}" })
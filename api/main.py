@@ -1,14 +1,16 @@
 import time
 import aiof.config as config
 import aiof.helpers as help
+import api.precomputed as precomputed
 
 from aiof.data.asset import ComparableAsset
 from api.routers import helpers, fi, car, analytics, market, property, retirement, goal
 
-from fastapi import FastAPI, Request, HTTPException, Depends
+from fastapi import FastAPI, Request, HTTPException, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse, JSONResponse
 from logzero import logger
+from typing import Optional
 
 
 app = FastAPI()
@@ -23,6 +25,11 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+async def warm_precomputed():
+    logger.info("Warmed {0} precomputed responses".format(precomputed.warm()))
+
+
 @app.exception_handler(ValueError)
 async def unicorn_exception_handler(req: Request, ve: ValueError):
     return write_exception_response(status_code=400, message=ve)
@@ -58,21 +65,21 @@ async def health_check():
 
 
 @app.post("/api/asset/breakdown")
-async def asset_breakdown(asset: ComparableAsset):
-    return help.asset_breakdown(asset)
+async def asset_breakdown(asset: ComparableAsset, records: bool = False):
+    return help.asset_breakdown(asset, as_records=records)
 
 
 @app.get("/api/frequencies")
-async def frequencies():
-    return config.get_settings().Frequencies
+async def frequencies(if_none_match: Optional[str] = Header(None)):
+    return precomputed.response("frequencies", if_none_match)
 
 @app.get("/api/frequencies/map")
-async def frequencies_map():
-    return config.get_settings().FrequenciesMap
+async def frequencies_map(if_none_match: Optional[str] = Header(None)):
+    return precomputed.response("frequencies/map", if_none_match)
 
 @app.get("/api/app/settings")
-async def info(settings: config.Settings = Depends(config.get_settings)):
-    return settings
+async def info(if_none_match: Optional[str] = Header(None)):
+    return precomputed.response("app/settings", if_none_match)
 
 
 app.include_router(
@@ -0,0 +1,142 @@
+import json
+import inspect
+import hashlib
+import functools
+import aiof.config as config
+import aiof.fi.core as fi
+import aiof.analytics.core as analytics
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from typing import Callable, Dict, Optional, Tuple
+
+
+# Configs
+_settings = config.get_settings()
+
+# Zero-argument and default-argument calculators whose responses are computed once and served as pre-serialized bytes.
+# POST routes add their all-default response with `default_body()`
+_calculators: Dict[str, Callable] = {
+    "frequencies": lambda: _settings.Frequencies,
+    "frequencies/map": lambda: _settings.FrequenciesMap,
+    "app/settings": lambda: _settings,
+    "fi/cost/of/raising/children/families": fi.cost_of_raising_children_faimilies,
+    "analytics/life/event/types": analytics.life_event_types,
+    "fi/ten/million/dream": lambda: fi.ten_million_dream(None),
+}
+_responses: Dict[str, Tuple[bytes, str]] = {}
+
+
+def serialize(content) -> Tuple[bytes, str]:
+    """
+    Serialize `content` the same way `fastapi.responses.JSONResponse` does and compute its strong ETag
+
+    Returns
+    ----------
+    `Tuple[bytes, str]` of the JSON body and its quoted sha256 ETag
+    """
+    body = json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":")).encode("utf-8")
+    return body, '"{0}"'.format(hashlib.sha256(body).hexdigest())
+
+
+def warm() -> int:
+    """
+    Compute and serialize every registered calculator. Called once on startup
+
+    Returns
+    ----------
+    `int` number of responses warmed
+    """
+    for key, calculator in _calculators.items():
+        _responses[key] = serialize(calculator())
+    return len(_responses)
+
+
+def is_default(req: BaseModel) -> bool:
+    """
+    Whether every field of a request body is left at its default, e.g. an empty `{}` body
+    """
+    return all(getattr(req, name) == field.default for name, field in req.__fields__.items())
+
+
+def default_body(key: str):
+    """
+    Register a POST route's all-default response as a calculator and serve it precomputed
+
+    Parameters
+    ----------
+    `key` : str.
+        key of the registered calculator
+
+    Notes
+    ----------
+    The route must take its body as `req` and must not await anything, so its default response can be computed
+    on startup. Requests whose body and query parameters are all at their defaults get the pre-serialized bytes
+    and the ETag. Conditional requests only apply to GET, so `If-None-Match` isn't checked here. Any other
+    request runs the route as usual
+    """
+    def decorator(route: Callable):
+        signature = inspect.signature(route)
+        model = signature.parameters["req"].annotation
+        query_defaults = { name: p.default for name, p in signature.parameters.items() if name != "req" }
+        _calculators[key] = lambda: _run(route(req=model(), **query_defaults))
+
+        @functools.wraps(route)
+        async def wrapper(req, **kwargs):
+            if is_default(req) and kwargs == query_defaults:
+                return response(key)
+            return await route(req=req, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _run(coroutine):
+    """
+    Result of a coroutine that completes without suspending
+    """
+    try:
+        coroutine.send(None)
+    except StopIteration as result:
+        return result.value
+    coroutine.close()
+    raise RuntimeError("Precomputed routes must not await")
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """
+    Whether an `If-None-Match` header matches `etag`. Uses the weak comparison `If-None-Match` calls for
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.replace("W/", "", 1) == etag:
+            return True
+    return False
+
+
+def response(key: str, if_none_match: Optional[str] = None) -> Response:
+    """
+    Serve a precomputed response. Returns `304 Not Modified` without a body when `if_none_match`
+    matches its ETag
+
+    Parameters
+    ----------
+    `key` : str.
+        one of the registered calculators\n
+    `if_none_match` : str or None.
+        the request's `If-None-Match` header
+    """
+    if key not in _responses:
+        _responses[key] = serialize(_calculators[key]())
+    body, etag = _responses[key]
+
+    if etag_matches(etag, if_none_match):
+        return Response(status_code=304, headers={ "ETag": etag })
+    return Response(content=body, media_type="application/json", headers={ "ETag": etag })
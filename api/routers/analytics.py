@@ -1,9 +1,11 @@
 import aiof.analytics.core as a
+import api.precomputed as precomputed
 
 from aiof.data.analytics import AssetsLiabilitiesRequest, DebtToIncomeRatioRequest
 from aiof.data.life_event import LifeEventRequest
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header
+from typing import Optional
 
 
 router = APIRouter()
@@ -17,8 +19,8 @@ async def analyze(req: AssetsLiabilitiesRequest):
         annual_income   = req.annualIncome)
 
 @router.get("/life/event/types")
-async def get_life_event_types():
-    return a.life_event_types()
+async def get_life_event_types(if_none_match: Optional[str] = Header(None)):
+    return precomputed.response("analytics/life/event/types", if_none_match)
 
 
 @router.post("/life/event")
@@ -1,16 +1,19 @@
 import aiof.fi.core as fi
 import aiof.fi.health as fihealth
 import aiof.fi.re as fire
+import api.precomputed as precomputed
 
 from aiof.data.fi import *
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header
+from typing import Optional
 
 
 router = APIRouter()
 
 
 @router.post("/time")
+@precomputed.default_body("fi/time")
 async def time_to_fi(req: FiTime):
     return fi.time_to_fi(
         starting_amount                 = req.startingAmount,
@@ -19,7 +22,35 @@ async def time_to_fi(req: FiTime):
         desired_annual_spending         = req.desiredAnnualSpending
     )
 
+@router.post("/time/batch")
+@precomputed.default_body("fi/time/batch")
+async def time_to_fi_batch(req: FiTimeBatch):
+    return fi.time_to_fi_batch(
+        starting_amounts                = req.startingAmounts,
+        monthly_investments             = req.monthlyInvestments,
+        desired_years_expenses_for_fi   = req.desiredYearsExpensesForFi,
+        desired_annual_spendings        = req.desiredAnnualSpendings,
+        interests                       = req.interests
+    )
+
+@router.post("/time/monte/carlo")
+async def time_to_fi_monte_carlo(req: FiTimeMonteCarlo):
+    return fi.time_to_fi_monte_carlo(
+        starting_amount                 = req.startingAmount,
+        monthly_investment              = req.monthlyInvestment,
+        desired_years_expenses_for_fi   = req.desiredYearsExpensesForFi,
+        desired_annual_spending         = req.desiredAnnualSpending,
+        mean                            = req.mean,
+        volatility                      = req.volatility,
+        distribution                    = req.distribution,
+        paths                           = req.paths,
+        max_years                       = req.maxYears,
+        percentiles                     = req.percentiles,
+        seed                            = req.seed
+    )
+
 @router.post("/rule/of/72")
+@precomputed.default_body("fi/rule/of/72")
 async def rule_of_72(req: FiRuleOf72):
     return fi.rule_of_72(
         starting_amount = req.startingAmount,
@@ -27,17 +58,26 @@ async def rule_of_72(req: FiRuleOf72):
     )
 
 @router.post("/added/time")
+@precomputed.default_body("fi/added/time")
 async def added_time(req: FiAddedTime):
     return fi.added_time_to_fi(
         monthly_investment          = req.monthlyInvestment,
         total_additional_expense    = req.totalAdditionalExpense
     )
 
+@router.get("/ten/million/dream/cache/info")
+async def ten_million_dream_cache_info():
+    return fi.ten_million_dream_cache_info()
+
 @router.get("/ten/million/dream/{monthlyInvestment}")
-async def ten_million_dream(monthlyInvestment: float):
+async def ten_million_dream(monthlyInvestment: float, if_none_match: Optional[str] = Header(None)):
+    # The default monthly investment is precomputed
+    if monthlyInvestment == 10000:
+        return precomputed.response("fi/ten/million/dream", if_none_match)
     return fi.ten_million_dream(monthly_investment = monthlyInvestment)
 
 @router.post("/compound/interest")
+@precomputed.default_body("fi/compound/interest")
 async def compound_interest(req: FiCompoundInterest):
     return fi.compound_interest(
         starting_amount     = req.startingAmount,
@@ -48,7 +88,22 @@ async def compound_interest(req: FiCompoundInterest):
         tax_drag            = req.taxDrag
     )
 
+@router.post("/compound/interest/grid")
+@precomputed.default_body("fi/compound/interest/grid")
+async def compound_interest_grid(req: FiCompoundInterestGrid, records: bool = False):
+    return fi.compound_interest_grid(
+        starting_amount     = req.startingAmount,
+        monthly_investment  = req.monthlyInvestment,
+        interest_rates      = req.interests,
+        numbers_of_years    = req.numbersOfYears,
+        investment_fees     = req.investmentFees,
+        tax_drag            = req.taxDrag,
+        frequencies         = req.frequencies,
+        as_records          = records
+    )
+
 @router.post("/investment/fees/effect")
+@precomputed.default_body("fi/investment/fees/effect")
 async def investment_fees_effect(req: FiInvestmentFeesEffect):
     return fi.investment_fees_effect(
         age_at_career_start             = req.ageAtCareerStart,
@@ -57,10 +112,13 @@ async def investment_fees_effect(req: FiInvestmentFeesEffect):
         tax_drag                        = req.taxDrag,
         annual_savings_1_decade         = req.annualSavingsFirstDecade,
         annual_savings_2_decade         = req.annualSavingsSecondDecade,
-        annual_withdrawal_3_decade      = req.annualWithdrawalThirdDecade
+        annual_withdrawal_3_decade      = req.annualWithdrawalThirdDecade,
+        fees                            = req.fees,
+        retirement_decades              = req.retirementDecades
     )
 
 @router.post("/cost/of/raising/children")
+@precomputed.default_body("fi/cost/of/raising/children")
 async def cost_of_raising_children(req: FiRaisingChildren):
     return fi.cost_of_raising_children(
         annual_expenses_start       =req.annualExpensesStart,
@@ -68,11 +126,23 @@ async def cost_of_raising_children(req: FiRaisingChildren):
         children                    =req.children,
         interests                   =req.interests
     )
+@router.post("/cost/of/raising/children/grid")
+@precomputed.default_body("fi/cost/of/raising/children/grid")
+async def cost_of_raising_children_grid(req: FiRaisingChildrenGrid, records: bool = False):
+    return fi.cost_of_raising_children_grid(
+        annual_expenses_start       = req.annualExpensesStart,
+        annual_expenses_increment   = req.annualExpensesIncrement,
+        children                    = req.children,
+        interests                   = req.interests,
+        years                       = req.years,
+        as_records                  = records
+    )
 @router.get("/cost/of/raising/children/families")
-async def cost_of_raising_children_families():
-    return fi.cost_of_raising_children_faimilies()
+async def cost_of_raising_children_families(if_none_match: Optional[str] = Header(None)):
+    return precomputed.response("fi/cost/of/raising/children/families", if_none_match)
 
 @router.post("/savings/rate")
+@precomputed.default_body("fi/savings/rate")
 async def savings_rate(req: SavingsRate):
     return fi.savings_rate(
         salary                              = req.salary,
@@ -96,6 +166,32 @@ async def savings_rate(req: SavingsRate):
         current_nest_egg                    = req.currentNestEgg
     )
 
+@router.post("/savings/rate/batch")
+@precomputed.default_body("fi/savings/rate/batch")
+async def savings_rate_batch(req: SavingsRateBatch):
+    return fi.savings_rate_batch(
+        salary                              = req.salary,
+        match_and_profit_sharing            = req.matchAndProfitSharing,
+        federal_income_tax                  = req.federalIncomeTax,
+        state_income_tax                    = req.stateIncomeTax,
+        fica                                = req.fica,
+        health_and_dental_insurance         = req.healthAndDentalInsurance,
+        other_deductible_benefits           = req.otherDeductibleBenefits,
+        hsa_investment                      = req.hsaInvestment,
+        four_oh_one_k_or_four_oh_three_b    = req.fourOhOneKOrFourOhThreeB,
+        four_five_seven_b                   = req.fourFiveSevenB,
+        sep_ira                             = req.sepIra,
+        other_tax_deferred                  = req.otherTaxDeferred,
+        roth_ira                            = req.rothIra,
+        taxable_account                     = req.taxableAccount,
+        education                           = req.education,
+        mortgage_principal                  = req.mortgagePrincipal,
+        student_loan_principal              = req.studentLoanPrincipal,
+        other_post_tax_investment           = req.otherPostTaxInvestment,
+        current_nest_egg                    = req.currentNestEgg,
+        interests                           = req.interests
+    )
+
 
 @router.post("/health/bmi/imperial")
 async def bmi_imperial(req: BmiImperial):
@@ -119,4 +215,29 @@ async def re_sample(req: CoastFireSavingsRequest):
         coast_savings           = req.savings,
         initial_interest_rate   = req.initialInterestRate,
         current_balance         = req.currentBalance
-    )
\ No newline at end of file
+    )
+
+@router.post("/coast/savings/columnar")
+async def coast_fire_savings_columnar(req: CoastFireSavingsColumnar):
+    return fire.coast_fire_savings_columns(
+        ages                    = req.ages,
+        years                   = req.years,
+        contributions           = req.contributions,
+        yearly_returns          = req.yearlyReturns,
+        initial_interest_rate   = req.initialInterestRate,
+        current_balance         = req.currentBalance
+    )
+
+@router.post("/coast/target")
+async def coast_fire_target(req: CoastFireTargetRequest):
+    return fire.coast_fire_target(
+        current_age         = req.currentAge,
+        retirement_age      = req.retirementAge,
+        target_spending     = req.targetSpending,
+        yearly_returns      = req.yearlyReturns,
+        withdrawal_rate     = req.withdrawalRate,
+        coast_ages          = req.coastAges,
+        solve_for           = req.solveFor,
+        current_balance     = req.currentBalance,
+        contribution        = req.contribution
+    )
@@ -1,9 +1,11 @@
 import aiof.helpers as helpers
 
-from aiof.data.asset import Asset
+from aiof.data.asset import Asset, AssetsColumnar
+from aiof.data.loan import LoanPaymentsRequest, LoanPaymentsTotalsRequest
+from api.export import export_response
 
-from typing import List
-from fastapi import APIRouter
+from typing import List, Optional
+from fastapi import APIRouter, Header
 
 
 router = APIRouter()
@@ -11,4 +13,33 @@ router = APIRouter()
 
 @router.post("/assets/to/df")
 async def mortgage_calc(req: List[Asset]):
-    return helpers.assets_to_df(req)
\ No newline at end of file
+    return helpers.assets_to_df(req)
+
+@router.post("/assets/to/df/columnar")
+async def assets_columnar_to_df(req: AssetsColumnar):
+    df = helpers.assets_columns_to_df(
+        names       = req.names,
+        type_names  = req.typeNames,
+        values      = req.values)
+    return {
+        "assets": df.to_dict(orient="list"),
+        "totals": helpers.assets_totals_by_type(df)
+    }
+
+@router.post("/loan/payments/totals")
+async def loan_payments_totals(req: LoanPaymentsTotalsRequest):
+    return helpers.loan_payments_totals(
+        loan_amounts        = req.loanAmounts,
+        numbers_of_years    = req.numberOfYears,
+        rates_of_interest   = req.ratesOfInterest,
+        frequencies         = req.frequencies,
+        as_json             = True)
+
+@router.post("/loan/payments/download")
+async def loan_payments_download(req: LoanPaymentsRequest, format: Optional[str] = None, accept: Optional[str] = Header(None)):
+    df = helpers.loan_payments_calc_as_table(
+        loan_amount         = req.loanAmount,
+        number_of_years     = req.numberOfYears,
+        rate_of_interest    = req.rateOfInterest,
+        frequency           = req.frequency)
+    return export_response(df, "loan-payments", format, accept)
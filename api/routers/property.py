@@ -2,7 +2,10 @@ import aiof.property.core as property
 
 from aiof.data.property import MortgageCalculatorRequest
 
-from fastapi import APIRouter
+from api.export import export_response
+
+from typing import Optional
+from fastapi import APIRouter, Header
 
 
 router = APIRouter()
@@ -19,4 +22,17 @@ async def mortgage_calc(req: MortgageCalculatorRequest):
         pmi                         = req.pmi,
         property_insurance          = req.propertyInsurance,
         monthly_hoa                 = req.monthlyHoa,
-        as_json                     = True)
\ No newline at end of file
+        as_json                     = True)
+
+@router.post("/mortgage/download")
+async def mortgage_download(req: MortgageCalculatorRequest, format: Optional[str] = None, accept: Optional[str] = Header(None)):
+    df = property.mortgage_calc(
+        property_value              = req.propertyValue,
+        down_payment                = req.downPayment,
+        interest_rate               = req.interestRate,
+        loan_term_years             = req.loanTermYears,
+        start_date                  = req.startDate,
+        pmi                         = req.pmi,
+        property_insurance          = req.propertyInsurance,
+        monthly_hoa                 = req.monthlyHoa)
+    return export_response(df, "mortgage", format, accept)
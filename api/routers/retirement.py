@@ -1,9 +1,18 @@
 import aiof.retirement.core as retirement
+import aiof.retirement.backtest as backtest
+import aiof.retirement.safe_withdrawal as safe_withdrawal
+import aiof.retirement.strategy as strategy
+import aiof.retirement.decumulation as decumulation
+import api.precomputed as precomputed
 
-from aiof.data.retirement import WithdrawalRequest, CommonInvestmentsRequest
-from aiof.data.retirement import NumberSimpleRequest, NumberRequest
+from aiof.data.retirement import WithdrawalRequest, WithdrawalBatchRequest, WithdrawalBacktestRequest, SafeWithdrawalRateRequest, CommonInvestmentsRequest
+from aiof.data.retirement import WithdrawalStrategiesRequest, InvestmentAccountsRequest, DecumulationRequest
+from aiof.data.retirement import NumberSimpleRequest, NumberRequest, NumberBatchRequest
 
-from fastapi import APIRouter
+from api.export import export_response
+
+from typing import Optional
+from fastapi import APIRouter, Header
 
 
 router = APIRouter()
@@ -17,6 +26,67 @@ async def withdrawal_calc_async(req: WithdrawalRequest):
         number_of_years     = req.numberOfYears,
         as_json             = True)
 
+@router.post("/withdrawal/download")
+async def withdrawal_download_async(req: WithdrawalRequest, format: Optional[str] = None, accept: Optional[str] = Header(None)):
+    df = retirement.withdrawal_calc(
+        retirement_number   = req.retirementNumber,
+        take_out_percentage = req.takeOutPercentage,
+        number_of_years     = req.numberOfYears)
+    return export_response(df, "withdrawal", format, accept)
+
+@router.post("/withdrawal/batch")
+@precomputed.default_body("retirement/withdrawal/batch")
+async def withdrawal_batch_async(req: WithdrawalBatchRequest):
+    return retirement.withdrawal_balances(
+        retirement_numbers      = req.retirementNumbers,
+        take_out_percentages    = req.takeOutPercentages,
+        number_of_years         = req.numberOfYears,
+        interests               = req.interests)
+
+@router.post("/withdrawal/backtest")
+@precomputed.default_body("retirement/withdrawal/backtest")
+async def withdrawal_backtest_async(req: WithdrawalBacktestRequest):
+    return backtest.withdrawal_backtest(
+        retirement_number   = req.retirementNumber,
+        take_out_percentage = req.takeOutPercentage,
+        number_of_years     = req.numberOfYears,
+        stocks_allocation   = req.stocksAllocation,
+        inflation_adjusted  = req.inflationAdjusted,
+        as_json             = True)
+
+@router.post("/withdrawal/safe/rate")
+@precomputed.default_body("retirement/withdrawal/safe/rate")
+async def safe_withdrawal_rate_async(req: SafeWithdrawalRateRequest):
+    return safe_withdrawal.safe_withdrawal_rate(
+        numbers_of_years    = req.numbersOfYears,
+        success_rates       = req.successRates,
+        method              = req.method,
+        retirement_number   = req.retirementNumber,
+        interests           = req.interests,
+        mean                = req.mean,
+        volatility          = req.volatility,
+        distribution        = req.distribution,
+        paths               = req.paths,
+        seed                = req.seed,
+        stocks_allocations  = req.stocksAllocations,
+        inflation_adjusted  = req.inflationAdjusted)
+
+@router.post("/withdrawal/strategies")
+async def withdrawal_strategies_async(req: WithdrawalStrategiesRequest):
+    return strategy.compare_strategies(
+        strategy_names      = req.strategies,
+        retirement_number   = req.retirementNumber,
+        take_out_percentage = req.takeOutPercentage,
+        number_of_years     = req.numberOfYears,
+        method              = req.method,
+        mean                = req.mean,
+        volatility          = req.volatility,
+        distribution        = req.distribution,
+        paths               = req.paths,
+        seed                = req.seed,
+        stocks_allocation   = req.stocksAllocation,
+        params              = req.params)
+
 @router.post("/common/investments")
 async def common_investments_async(req: CommonInvestmentsRequest):
     return retirement.common_investments(
@@ -32,13 +102,87 @@ async def common_investments_async(req: CommonInvestmentsRequest):
         brokerage_monthly_contributions     = req.brokerageMonthlyContributions,
         as_json                             = True)
 
+@router.post("/common/investments/download")
+async def common_investments_download_async(req: CommonInvestmentsRequest, format: Optional[str] = None, accept: Optional[str] = Header(None)):
+    df = retirement.common_investments(
+        interest                            = req.interest,
+        start_year                          = req.startYear,
+        end_year                            = req.endYear,
+        compouding_periods                  = req.compoundingPeriods,
+        fourohone_k_starting_amount         = req.fourOhOneKStartingAmount,
+        fourohone_k_monthly_contributions   = req.fourOhOneKMonthlyContributions,
+        roth_ira_starting_amount            = req.rothIraStartingAmount,
+        roth_ira_monthly_contributions      = req.rothIraMonthlyContributions,
+        brokerage_starting_amount           = req.brokerageStartingAmount,
+        brokerage_monthly_contributions     = req.brokerageMonthlyContributions)
+    return export_response(df, "common-investments", format, accept)
+
+@router.post("/investment/accounts")
+async def investment_accounts_async(req: InvestmentAccountsRequest):
+    return retirement.investment_accounts(
+        names                   = req.names,
+        starting_amounts        = req.startingAmounts,
+        monthly_contributions   = req.monthlyContributions,
+        interests               = req.interests,
+        contribution_growths    = req.contributionGrowths,
+        start_year              = req.startYear,
+        end_year                = req.endYear,
+        compouding_periods      = req.compoundingPeriods,
+        as_json                 = True)
+
+@router.post("/investment/accounts/download")
+async def investment_accounts_download_async(req: InvestmentAccountsRequest, format: Optional[str] = None, accept: Optional[str] = Header(None)):
+    df = retirement.investment_accounts(
+        names                   = req.names,
+        starting_amounts        = req.startingAmounts,
+        monthly_contributions   = req.monthlyContributions,
+        interests               = req.interests,
+        contribution_growths    = req.contributionGrowths,
+        start_year              = req.startYear,
+        end_year                = req.endYear,
+        compouding_periods      = req.compoundingPeriods)
+    return export_response(df, "investment-accounts", format, accept)
+
+@router.post("/decumulation/plan")
+@precomputed.default_body("retirement/decumulation/plan")
+async def decumulation_plan_async(req: DecumulationRequest):
+    return decumulation.decumulation_plan(
+        fourohone_k_balance         = req.fourOhOneKBalance,
+        roth_ira_balance            = req.rothIraBalance,
+        brokerage_balance           = req.brokerageBalance,
+        brokerage_basis_percentage  = req.brokerageBasisPercentage,
+        annual_spending             = req.annualSpending,
+        other_income                = req.otherIncome,
+        number_of_years             = req.numberOfYears,
+        interest                    = req.interest,
+        inflation                   = req.inflation,
+        orderings                   = req.orderings,
+        conversions                 = req.conversions,
+        tax_brackets                = req.taxBrackets,
+        standard_deduction          = req.standardDeduction,
+        capital_gains_rate          = req.capitalGainsRate,
+        ending_tax_rate             = req.endingTaxRate)
+
 @router.post("/number/simple")
+@precomputed.default_body("retirement/number/simple")
 async def number_simple_async(req: NumberSimpleRequest):
     return retirement.number_simple(current_salary = req.currentSalary)
 
 @router.post("/number")
+@precomputed.default_body("retirement/number")
 async def number_async(req: NumberRequest):
     return retirement.number(
         desired_retirement_age  = req.desiredRetirementAge,
         desired_monthly_income  = req.desiredMonthlyIncome,
-        retirement_end_age      = req.retirementEndAge)
\ No newline at end of file
+        retirement_end_age      = req.retirementEndAge)
+
+@router.post("/number/batch")
+@precomputed.default_body("retirement/number/batch")
+async def number_batch_async(req: NumberBatchRequest):
+    return retirement.number_batch(
+        current_ages            = req.currentAges,
+        desired_retirement_ages = req.desiredRetirementAges,
+        retirement_end_ages     = req.retirementEndAges,
+        desired_monthly_incomes = req.desiredMonthlyIncomes,
+        inflations              = req.inflations,
+        interests               = req.interests)
@@ -0,0 +1,82 @@
+"""
+Benchmark the array based amortization engine against the original row-by-row loop
+
+Run it from the repository root
+
+    python -m benchmarks.loan_amortization
+"""
+import timeit
+import numpy as np
+import pandas as pd
+
+import aiof.config as config
+
+from aiof.helpers import convert_frequency, to_percentage, loan_payments_calc, loan_payments_calc_as_table
+
+
+# Configs
+_settings = config.get_settings()
+_frequency_text = _settings.FrequenciesMap
+
+_loan_amount = 300000
+_number_of_years = 30
+_rate_of_interest = 4.5
+
+
+def loan_payments_calc_as_table_loop(loan_amount, number_of_years, rate_of_interest, frequency="monthly"):
+    """
+    The original implementation of `aiof.helpers.loan_payments_calc_as_table`, kept as the baseline
+    """
+    payments = loan_payments_calc(loan_amount, number_of_years, rate_of_interest, frequency)
+    interest = to_percentage(rate_of_interest)
+    frequency_int = convert_frequency(frequency, as_int=True)
+    frequency_num = frequency_int * number_of_years
+    frequency_text = _frequency_text[frequency]
+
+    loan_df = np.zeros((frequency_num, 6))
+    loan_df = pd.DataFrame(loan_df)
+    loan_df.columns = [frequency_text, "initialBalance", "payment", "interest",
+                                "principal", "endingBalance"]
+    loan_df.iloc[0, 0] = 1
+    loan_df.iloc[0, 1] = loan_amount
+    loan_df.iloc[0, 2] = payments
+    loan_df.iloc[0, 3] = loan_amount * (interest / frequency_int)
+    loan_df.iloc[0, 4] = payments - (loan_amount * (interest / frequency_int))
+    loan_df.iloc[0, 5] = loan_amount - (payments - (loan_amount * (interest / frequency_int)))
+    for i in range(1, frequency_num):
+        loan_df.iloc[i, 0] = i + 1
+        loan_df.iloc[i, 1] = loan_df.iloc[(i - 1), 5]
+        loan_df.iloc[i, 2] = payments
+        loan_df.iloc[i, 3] = loan_df.iloc[i, 1] * (interest / frequency_int)
+        loan_df.iloc[i, 4] = payments - (loan_df.iloc[i, 1] * (interest / frequency_int))
+        loan_df.iloc[i, 5] = loan_df.iloc[i, 1] - (payments - (loan_df.iloc[i, 1] * (interest / frequency_int)))
+
+    loan_df = loan_df.round(2)
+    loan_df[frequency_text] = loan_df[frequency_text].astype(int)
+    return loan_df
+
+
+def main():
+    print("{0:<10} {1:>8} {2:>12} {3:>12} {4:>9} {5:>12}".format(
+        "frequency", "periods", "loop (ms)", "array (ms)", "speedup", "max diff"))
+
+    for frequency in _settings.Frequencies:
+        args = (_loan_amount, _number_of_years, _rate_of_interest, frequency)
+        repeat = 1 if frequency == "daily" else 3
+
+        loop_s = min(timeit.repeat(lambda: loan_payments_calc_as_table_loop(*args), number=1, repeat=repeat))
+        array_s = min(timeit.repeat(lambda: loan_payments_calc_as_table(*args), number=10, repeat=3)) / 10
+
+        max_diff = (loan_payments_calc_as_table_loop(*args) - loan_payments_calc_as_table(*args)).abs().max().max()
+
+        print("{0:<10} {1:>8} {2:>12.2f} {3:>12.3f} {4:>8.0f}x {5:>12.2f}".format(
+            frequency,
+            convert_frequency(frequency, as_int=True) * _number_of_years,
+            loop_s * 1000,
+            array_s * 1000,
+            loop_s / array_s,
+            max_diff))
+
+
+if __name__ == "__main__":
+    main()
@@ -18,5 +18,6 @@ if __name__ == "__main__":
         author_email = "aiof@email.com",
         url = "https://github.com/gkama/aiof-metadata",
         license = license,
-        packages = find_packages(exclude=("tests", "docs"))
+        packages = find_packages(exclude=("tests", "docs")),
+        package_data = { "aiof.data": [ "annual_returns.csv" ] }
     )
\ No newline at end of file
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+from aiof.retirement.backtest import *
+
+
+class BacktestTestCase(unittest.TestCase):
+    """
+    Historical backtest unit tests
+    """
+
+    def test_load_annual_returns(self):
+        df = load_annual_returns()
+
+        assert list(df.columns) == [ "year", "stocks", "bonds", "inflation" ]
+        assert df["year"].iloc[0] == 1928
+        assert (df["year"].diff().dropna() == 1).all()
+
+    def test_load_annual_returns_local_file(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "returns.csv")
+            pd.DataFrame({ "year": [2001, 2000], "stocks": [5, 10], "bonds": [2, 3], "inflation": [1, 2] }).to_csv(path, index=False)
+            df = load_annual_returns(path)
+
+        assert df["year"].tolist() == [2000, 2001]
+    def test_load_annual_returns_missing_columns(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "returns.csv")
+            pd.DataFrame({ "year": [2000], "stocks": [5] }).to_csv(path, index=False)
+            with self.assertRaises(ValueError):
+                load_annual_returns(path)
+
+    def test_rolling_windows(self):
+        windows = rolling_windows(np.arange(5.0), 3)
+
+        assert windows.tolist() == [[0, 1, 2], [1, 2, 3], [2, 3, 4]]
+        assert not windows.flags.writeable
+
+    def test_withdrawal_backtest_defaults(self):
+        df = withdrawal_backtest()
+
+        assert len(df) == len(load_annual_returns()) - 30 + 1
+        assert (df["endYear"] - df["startYear"] == 29).all()
+        assert (df["endingBalance"] >= 0).all()
+        assert (df.loc[~df["success"], "yearsLasted"] < 30).all()
+    def test_withdrawal_backtest_matches_loop(self):
+        returns = load_annual_returns()
+        df = withdrawal_backtest(take_out_percentage=3, number_of_years=20, stocks_allocation=75)
+
+        for i in [0, 17, 40]:
+            balance = 1000000
+            withdrawal = 30000
+            for year in range(i, i + 20):
+                balance = (balance - withdrawal) * (1 + (0.75 * returns["stocks"][year] + 0.25 * returns["bonds"][year]) / 100)
+                withdrawal *= 1 + returns["inflation"][year] / 100
+            assert round(balance, 2) == df["endingBalance"][i]
+    def test_withdrawal_backtest_as_json(self):
+        resp = withdrawal_backtest(take_out_percentage=6, as_json=True)
+
+        assert 0 < resp["successRate"] < 100
+        assert resp["worstEndingBalance"] == 0
+        assert resp["worstYearsLasted"] == min(r["yearsLasted"] for r in resp["results"])
+        assert resp["windows"] == len(resp["results"])
+    def test_withdrawal_backtest_lower_rate_is_safer(self):
+        assert withdrawal_backtest(take_out_percentage=3, as_json=True)["successRate"] \
+            >= withdrawal_backtest(take_out_percentage=5, as_json=True)["successRate"]
+    def test_withdrawal_backtest_too_many_years(self):
+        with self.assertRaises(ValueError):
+            withdrawal_backtest(number_of_years=500)
@@ -0,0 +1,111 @@
+import unittest
+import itertools
+import numpy as np
+
+from aiof.retirement.decumulation import *
+
+
+class DecumulationTestCase(unittest.TestCase):
+    """
+    Decumulation unit tests
+    """
+    _brackets = [[0, 10], [10000, 20]]
+
+    def test_tax_table(self):
+        incomes, taxes, after_tax = tax_table(self._brackets, 5000)
+
+        assert np.interp(5000, incomes, taxes) == 0
+        assert np.isclose(np.interp(20000, incomes, taxes), 1000 + 1000)
+        assert np.isclose(np.interp(np.interp(20000, incomes, after_tax), after_tax, incomes), 20000)
+    def test_tax_table_invalid(self):
+        with self.assertRaises(ValueError):
+            tax_table([[100, 10]])
+        with self.assertRaises(ValueError):
+            tax_table([[0, 10], [0, 20]])
+        with self.assertRaises(ValueError):
+            tax_table([[0, 100]])
+
+    def test_decumulation_plan_defaults(self):
+        resp = decumulation_plan()
+
+        assert len(resp["candidates"]) == 6 * 11
+        assert resp["best"] == resp["candidates"][0]
+        assert resp["best"]["shortfall"] == 0
+        assert len(resp["plan"]) == 30
+        present_values = [c["presentValueTax"] for c in resp["candidates"] if c["shortfall"] == 0]
+        assert present_values == sorted(present_values)
+    def test_decumulation_plan_funds_spending_and_tax(self):
+        resp = decumulation_plan(inflation=0)
+
+        for year in resp["plan"]:
+            withdrawals = year["fourohoneKWithdrawal"] + year["rothIraWithdrawal"] + year["brokerageWithdrawal"]
+            assert abs(withdrawals - year["spending"] - year["tax"]) < 0.05
+    def test_decumulation_plan_funds_spending_and_tax_with_inflation(self):
+        for ordering in itertools.permutations(["fourohoneK", "rothIra", "brokerage"]):
+            plan = decumulation_plan(inflation=3, orderings=[list(ordering)], conversions=[25000])["plan"]
+
+            for year in plan:
+                withdrawals = year["fourohoneKWithdrawal"] + year["rothIraWithdrawal"] + year["brokerageWithdrawal"]
+                assert abs(withdrawals + year["shortfall"] - year["spending"] - year["tax"]) < 0.05
+    def test_decumulation_plan_brokerage_gains_tax(self):
+        resp = decumulation_plan(
+            fourohone_k_balance         = 0,
+            roth_ira_balance            = 0,
+            brokerage_balance           = 100000,
+            brokerage_basis_percentage  = 40,
+            annual_spending             = 9100,
+            number_of_years             = 1,
+            orderings                   = [["brokerage", "rothIra", "fourohoneK"]],
+            conversions                 = [0],
+            capital_gains_rate          = 15)
+        year = resp["plan"][0]
+
+        # 10,000 withdrawn, 60% of it is gains taxed at 15%
+        assert year["brokerageWithdrawal"] == 10000
+        assert year["tax"] == 10000 * 0.6 * 0.15
+    def test_decumulation_plan_negative_interest_has_no_loss_credit(self):
+        resp = decumulation_plan(
+            interest                    = -50,
+            brokerage_basis_percentage  = 100,
+            fourohone_k_balance         = 0,
+            roth_ira_balance            = 0,
+            brokerage_balance           = 1000000,
+            number_of_years             = 3,
+            conversions                 = [0],
+            orderings                   = [["brokerage", "rothIra", "fourohoneK"]])
+
+        assert resp["best"]["lifetimeTax"] == 0
+        for year in resp["plan"]:
+            assert year["tax"] == 0
+            assert year["brokerageWithdrawal"] == year["spending"]
+    def test_decumulation_plan_grosses_up_401k(self):
+        resp = decumulation_plan(
+            fourohone_k_balance = 1000000,
+            roth_ira_balance    = 0,
+            brokerage_balance   = 0,
+            annual_spending     = 17000,
+            number_of_years     = 1,
+            orderings           = [["fourohoneK", "rothIra", "brokerage"]],
+            conversions         = [0],
+            tax_brackets        = self._brackets,
+            standard_deduction  = 0)
+        year = resp["plan"][0]
+
+        # 20,000 withdrawn, 10,000 taxed at 10% and 10,000 at 20%
+        assert year["fourohoneKWithdrawal"] == 20000
+        assert year["tax"] == 3000
+    def test_decumulation_plan_roth_only_is_tax_free(self):
+        resp = decumulation_plan(fourohone_k_balance=0, brokerage_balance=0, roth_ira_balance=2000000)
+
+        assert all(c["lifetimeTax"] == 0 for c in resp["candidates"])
+    def test_decumulation_plan_shortfall(self):
+        resp = decumulation_plan(fourohone_k_balance=0, roth_ira_balance=100000, brokerage_balance=0, conversions=[0])
+
+        assert all(c["shortfall"] > 0 for c in resp["candidates"])
+        assert resp["plan"][-1]["shortfall"] > 0
+    def test_decumulation_plan_invalid_ordering_raises_valueerror(self):
+        with self.assertRaises(ValueError):
+            decumulation_plan(orderings=[["fourohoneK", "fourohoneK", "brokerage"]])
+    def test_decumulation_plan_negative_balance_raises_valueerror(self):
+        with self.assertRaises(ValueError):
+            decumulation_plan(roth_ira_balance=-1)
@@ -1,5 +1,6 @@
 import unittest
 import json
+import numpy as np
 
 from aiof.fi.core import *
 
@@ -52,6 +53,71 @@ class FiTestCase(unittest.TestCase):
 
 
 
+    def test_fi_time_to_fi_batch(self):
+        resp = time_to_fi_batch(
+            starting_amounts=[self._starting_amount, 800000],
+            monthly_investments=[self._monthly_investment, 5000],
+            desired_years_expenses_for_fi=self._desired_years_expenses_for_fi,
+            desired_annual_spendings=self._desired_annual_spending)
+        single = time_to_fi(
+            self._starting_amount, 
+            self._monthly_investment, 
+            self._desired_years_expenses_for_fi, 
+            self._desired_annual_spending)
+
+        assert resp["interests"] == [2, 4, 6, 8]
+        assert len(resp["years"]) == 2
+        assert resp["years"][0] == [y["years"] for y in single["years"]]
+        assert resp["currentDeficits"][0] == single["currentDeficit"]
+    def test_fi_time_to_fi_batch_defaults(self):
+        resp = time_to_fi_batch()
+
+        assert resp["startingAmounts"] == [800000]
+        assert len(resp["years"][0]) == 4
+    def test_fi_time_to_fi_batch_many_profiles(self):
+        n = 10000
+        resp = time_to_fi_batch(
+            starting_amounts=np.linspace(0, 1000000, n),
+            monthly_investments=5000,
+            interests=[3, 5, 7])
+
+        assert len(resp["years"]) == n
+        assert all(len(years) == 3 for years in resp["years"])
+        assert resp["years"][0][0] > resp["years"][-1][0]
+    def test_fi_time_to_fi_batch_unreachable(self):
+        resp = time_to_fi_batch(starting_amounts=[0], monthly_investments=[0], interests=[0, 5])
+
+        assert resp["years"] == [[None, None]]
+    def test_fi_time_to_fi_monte_carlo_defaults(self):
+        resp = time_to_fi_monte_carlo(paths=2000, seed=1)
+
+        probabilities = [p["probability"] for p in resp["probabilities"]]
+        assert len(probabilities) == 50
+        assert probabilities == sorted(probabilities)
+        assert 0 <= probabilities[0] <= probabilities[-1] <= 1
+        years = [p["years"] for p in resp["percentiles"]]
+        assert years == sorted(years)
+    def test_fi_time_to_fi_monte_carlo_seeded(self):
+        first = time_to_fi_monte_carlo(paths=3000, seed=42, chunk_size=700)
+        second = time_to_fi_monte_carlo(paths=3000, seed=42, chunk_size=3000)
+
+        assert first == second
+    def test_fi_time_to_fi_monte_carlo_no_volatility(self):
+        resp = time_to_fi_monte_carlo(mean=4, volatility=0, distribution="normal", paths=10, seed=1)
+        deterministic = time_to_fi(None, None, None, None)["years"][1]["years"]
+
+        assert all(abs(p["years"] - deterministic) < 0.2 for p in resp["percentiles"])
+    def test_fi_time_to_fi_monte_carlo_unreachable(self):
+        resp = time_to_fi_monte_carlo(starting_amount=0, monthly_investment=100, paths=100, max_years=5, seed=1)
+
+        assert all(p["probability"] == 0 for p in resp["probabilities"])
+        assert all(p["years"] is None for p in resp["percentiles"])
+    def test_fi_time_to_fi_monte_carlo_invalid_distribution(self):
+        with self.assertRaises(ValueError):
+            time_to_fi_monte_carlo(distribution="uniform", paths=10)
+
+
+
     def test_fi_rule_of_72_req_defaults(self):
         rule_of_72_resp = rule_of_72(
             starting_amount=self._starting_amount,
@@ -107,6 +173,21 @@ class FiTestCase(unittest.TestCase):
             for year in million["years"]:
                 assert year["interest"] >= 0
                 assert year["years"] > 0
+    def test_fi_ten_million_dream_grid(self):
+        resp = ten_million_dream(self._monthly_investment)
+
+        assert len(resp) == 11
+        assert all(len(million["years"]) == 11 for million in resp)
+        assert resp[0]["years"][0] == { "interest": 0, "years": round(1000000 / self._monthly_investment / 12, 1) }
+    def test_fi_ten_million_dream_cache(self):
+        before = ten_million_dream_cache_info()
+        ten_million_dream(1234.5)
+        ten_million_dream("1234.5")
+        after = ten_million_dream_cache_info()
+
+        assert after["misses"] == before["misses"] + 1
+        assert after["hits"] == before["hits"] + 1
+        assert after["currentSize"] <= after["maxSize"]
 
 
 
@@ -143,6 +224,44 @@ class FiTestCase(unittest.TestCase):
             assert r["taxDrag"] >= 0
             assert r["investmentFees"] >= 0
 
+    def test_fi_compound_interest_grid(self):
+        resp = compound_interest_grid(
+            monthly_investment=self._monthly_investment,
+            interest_rates=[4, 6, 8],
+            numbers_of_years=[10, 25],
+            investment_fees=[0.1, 0.5, 1])
+
+        shape = (3, 2, 3, len(resp["frequencies"]))
+        assert np.asarray(resp["compoundedBeginning"]).shape == shape
+        assert np.asarray(resp["compoundedEnd"]).shape == shape
+        assert (np.asarray(resp["compoundedBeginning"]) >= np.asarray(resp["compoundedEnd"])).all()
+    def test_fi_compound_interest_grid_records(self):
+        resp = compound_interest_grid(
+            monthly_investment=self._monthly_investment,
+            interest_rates=[6, self._interest],
+            numbers_of_years=[10, self._number_of_years],
+            investment_fees=[0.5],
+            tax_drag=0.5,
+            as_records=True)
+        single = compound_interest(0, self._monthly_investment, self._interest, self._number_of_years, 0.5, 0.5)
+
+        assert len(resp) == 4 * len(single)
+        assert resp[-len(single):] == single
+    def test_fi_compound_interest_grid_frequencies(self):
+        resp = compound_interest_grid(frequencies=[12], as_records=True)
+
+        assert len(resp) == 1
+        assert resp[0]["frequency"] == 12
+    def test_fi_compound_interest_grid_zero_rate(self):
+        resp = compound_interest_grid(starting_amount=1000, monthly_investment=100, interest_rates=[1], numbers_of_years=[10],
+            investment_fees=[0.5], tax_drag=0.5, frequencies=[12])
+
+        assert resp["compoundedBeginning"] == resp["compoundedEnd"] == [[[[1000 + 100 * 12 * 10]]]]
+    def test_fi_compound_interest_grid_invalid_frequencies_raises_valueerror(self):
+        for frequencies in ([0], [-12], [1.5], []):
+            with self.assertRaises(ValueError):
+                compound_interest_grid(frequencies=frequencies)
+
 
 
     def test_fi_investment_fees_effect_defaults(self):
@@ -166,6 +285,24 @@ class FiTestCase(unittest.TestCase):
             annual_savings_2_decade=2 * self._savings_first_decade,
             annual_withdrawal_3_decade=self._withdrawal)
         self.assert_fi_investment_fees_effect(resp)
+    def test_fi_investment_fees_effect_custom_fees(self):
+        fees = list(np.round(np.arange(0.01, 0.6, 0.01), 2))
+        resp = investment_fees_effect(None, None, None, None, None, None, None, fees=fees, retirement_decades=8)
+
+        assert [fee["fee"] for fee in resp["fees"]] == fees
+        assert resp["annualWithdrawals"][-1] == resp["annualSavingsFifthDecade"]
+        for fee in resp["fees"]:
+            assert len(fee["values"]) == 10
+            assert fee["values"][-1]["age"] == self._age + 100
+        assert resp["fees"][0]["values"][1]["value"] > resp["fees"][-1]["values"][1]["value"]
+    def test_fi_investment_fees_effect_one_retirement_decade(self):
+        resp = investment_fees_effect(None, None, None, None, None, None, None, fees=[1], retirement_decades=1)
+
+        assert resp["annualWithdrawals"] == [resp["annualWithdrawalThirdDecade"]]
+        assert len(resp["fees"][0]["values"]) == 3
+    def test_fi_investment_fees_effect_no_retirement_decades(self):
+        with self.assertRaises(ValueError):
+            investment_fees_effect(None, None, None, None, None, None, None, retirement_decades=0)
 
     def assert_fi_investment_fees_effect(self, resp):
         assert resp["ageAtCareerStart"] == self._age
@@ -211,6 +348,42 @@ class FiTestCase(unittest.TestCase):
                 8
             ])
         self.assert_fi_cost_of_raising_children(resp)
+    def test_fi_cost_of_raising_children_years(self):
+        resp = cost_of_raising_children(children=[2], interests=[0], years=10)
+
+        assert resp[0]["years"] == 10
+        assert resp[0]["totalExpenses"] == resp[0]["annualExpenses"] * 10
+        assert resp[0]["cost"][0]["value"] == resp[0]["totalExpenses"]
+
+    def test_fi_cost_of_raising_children_grid(self):
+        resp = cost_of_raising_children_grid(children=[1, 2, 3], interests=[2, 4, 6, 8], years=[10, 18])
+
+        assert np.asarray(resp["cost"]).shape == (3, 4, 2)
+        assert np.asarray(resp["totalExpenses"]).shape == (3, 2)
+        assert resp["annualExpenses"] == [5000, 9000, 13000]
+        assert resp["cost"][1][3][1] == cost_of_raising_children(children=[2], interests=[8])[0]["cost"][0]["value"]
+    def test_fi_cost_of_raising_children_grid_records(self):
+        resp = cost_of_raising_children_grid(children=[1, 2], interests=[4, 8], years=[5, 10, 18], as_records=True)
+        grid = cost_of_raising_children_grid(children=[1, 2], interests=[4, 8], years=[5, 10, 18])
+
+        assert len(resp) == 12
+        assert resp[-1] == {
+            "children": 2,
+            "interest": 8,
+            "years": 18,
+            "annualExpenses": grid["annualExpenses"][1],
+            "totalExpenses": grid["totalExpenses"][1][2],
+            "value": grid["cost"][1][1][2]
+        }
+    def test_fi_cost_of_raising_children_grid_large(self):
+        resp = cost_of_raising_children_grid(
+            children=np.arange(1, 11),
+            interests=np.linspace(0, 10, 50),
+            years=np.arange(1, 21),
+            as_arrays=True)
+
+        assert resp["cost"].shape == (10, 50, 20)
+        assert (np.diff(resp["cost"], axis=2) > 0).all()
 
     def assert_fi_cost_of_raising_children(self, resp):
         assert len(resp) > 0
@@ -268,6 +441,34 @@ class FiTestCase(unittest.TestCase):
             other_post_tax_investment=0,
             current_nest_egg=700000)
         self.assert_savings_rate(resp)
+    def test_fi_savings_rate_batch_defaults(self):
+        resp = savings_rate_batch()
+        single = savings_rate(*[None] * 19)
+
+        for key, value in single.items():
+            if key == "years":
+                assert resp["years"][0] == [year["years"] for year in value]
+            else:
+                assert resp[key] == [value]
+    def test_fi_savings_rate_batch(self):
+        salaries = np.linspace(100000, 500000, 1000)
+        resp = savings_rate_batch(
+            salary=salaries,
+            federal_income_tax=salaries * 0.2,
+            current_nest_egg=[100000],
+            interests=[3, 5, 7])
+
+        assert len(resp["salary"]) == len(resp["savingsRateGross"]) == 1000
+        assert np.asarray(resp["years"]).shape == (1000, 3)
+        assert resp["currentNestEgg"] == [100000] * 1000
+        assert resp["savingsRateGross"][0] > resp["savingsRateGross"][-1]
+        single = savings_rate(salaries[10], None, salaries[10] * 0.2, *[None] * 15, 100000)
+        assert resp["savingsRateNet"][10] == single["savingsRateNet"]
+    def test_fi_savings_rate_batch_undefined_rates(self):
+        resp = savings_rate_batch(salary=[0], match_and_profit_sharing=[0], as_arrays=True)
+
+        assert not np.isfinite(resp["savingsRateGross"][0])
+        assert savings_rate_batch(salary=[0], match_and_profit_sharing=[0])["savingsRateGross"] == [None]
 
     def assert_savings_rate(self, resp):
         assert len(resp["years"]) > 0
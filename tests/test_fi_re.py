@@ -1,5 +1,6 @@
 import unittest
 import datetime
+import numpy as np
 
 from aiof.fi.re import *
 from aiof.data.fi import CoastFireSavings, CoastFireSavingsRequest
@@ -53,4 +54,74 @@ class FireTestCase(unittest.TestCase):
             assert c.presentValueFour is not None
             assert c.presentValueThree is not None
             assert c.withdrawTwo is not None
-            
\ No newline at end of file
+            
+
+    def test_fi_re_coast_fire_savings_columns(self):
+        resp = coast_fire_savings_columns(
+            ages=[25, 26, 27, 28],
+            years=[2020, 2021, 2022, 2023],
+            contributions=[75000, 75000, 75000, 0],
+            yearly_returns=[0.08, 0.08, 0.08, 0.06],
+            initial_interest_rate=0.02,
+            current_balance=150000)
+
+        total = 150000
+        for i, (contribution, yearly_return) in enumerate(zip([75000, 75000, 75000, 0], [0.08, 0.08, 0.08, 0.06])):
+            total = (total + contribution) * (1 + yearly_return)
+            assert resp["total"][i] == round(total, 2)
+            assert resp["withdrawFour"][i] == round(total * 0.04, 2)
+            assert resp["presentValueTwo"][i] == round(total * 0.02 / 1.02, 2)
+    def test_fi_re_coast_fire_savings_columns_variants(self):
+        ages = np.arange(25, 101)
+        contributions = np.where(ages < 35, 50000, 0) * np.array([[1], [0.5], [0]])
+        resp = coast_fire_savings_columns(
+            ages=ages,
+            years=2020 + ages - 25,
+            contributions=contributions,
+            yearly_returns=0.07,
+            current_balance=[100000, 100000, 0],
+            as_arrays=True)
+
+        assert resp["total"].shape == (3, len(ages))
+        assert (resp["total"][0] > resp["total"][1]).all()
+        assert (resp["total"][2] == 0).all()
+    def test_fi_re_coast_fire_savings_matches_columns(self):
+        savings = [s.copy() for s in self.test_savings]
+        resp = coast_fire_savings(savings, 0.02, 150000)
+        columns = coast_fire_savings_columns(
+            ages=[s.age for s in self.test_savings],
+            years=[s.year for s in self.test_savings],
+            contributions=[s.contribution for s in self.test_savings],
+            yearly_returns=[s.yearlyReturn for s in self.test_savings],
+            initial_interest_rate=0.02,
+            current_balance=150000)
+
+        assert [c.total for c in resp] == columns["total"]
+        assert [c.presentValueFour for c in resp] == columns["presentValueFour"]
+
+    def test_fi_re_coast_fire_target_contribution(self):
+        resp = coast_fire_target(30, 60, 80000, yearly_returns=0.06, current_balance=50000)
+
+        assert resp["coastAge"][0] == 30 and resp["contribution"][0] is None
+        assert resp["contribution"][1:] == sorted(resp["contribution"][1:], reverse=True)
+        ages = np.arange(30, 60)
+        for coast_age, contribution in zip(resp["coastAge"][1:], resp["contribution"][1:]):
+            columns = coast_fire_savings_columns(ages, ages, np.where(ages < coast_age, contribution, 0), 0.06, 0.02, 50000)
+            assert abs(columns["withdrawFour"][-1] - 80000) < 1
+    def test_fi_re_coast_fire_target_balance(self):
+        resp = coast_fire_target(30, 60, 80000, yearly_returns=0.06, coast_ages=[30, 40], solve_for="balance", contribution=10000)
+        ages = np.arange(30, 60)
+
+        assert resp["currentBalance"][0] > resp["currentBalance"][1]
+        columns = coast_fire_savings_columns(ages, ages, np.where(ages < 40, 10000, 0), 0.06, 0.02, resp["currentBalance"][1])
+        assert abs(columns["withdrawFour"][-1] - 80000) < 1
+    def test_fi_re_coast_fire_target_already_reached(self):
+        resp = coast_fire_target(30, 60, 10000, current_balance=1000000)
+
+        assert all(c == 0 for c in resp["contribution"])
+    def test_fi_re_coast_fire_target_invalid(self):
+        with self.assertRaises(ValueError):
+            coast_fire_target(60, 30, 80000)
+        with self.assertRaises(ValueError):
+            coast_fire_target(30, 60, 80000, solve_for="age")
+
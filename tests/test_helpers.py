@@ -1,8 +1,14 @@
+import io
 import unittest
 import json
+import numpy as np
+import numpy_financial as npf
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from aiof.helpers import *
+from aiof.data.asset import Asset, ComparableAsset
 
 
 class HelpersTestCase(unittest.TestCase):
@@ -47,6 +53,42 @@ class HelpersTestCase(unittest.TestCase):
         for f in frequencies:
             assert compound_interest_calc(1000, 5, 8) > 0
 
+    def test_compound_interest_broadcast(self):
+        principals = np.array([1000, 5000, 25000])
+        frequencies = np.array(["daily", "monthly", "yearly"])
+        resp = compound_interest_calc(principals, 5, [8, 6, 4], frequencies)
+
+        assert resp.shape == (3,)
+        for i in range(0, 3):
+            assert round(resp[i], 6) == round(compound_interest_calc(principals[i], 5, [8, 6, 4][i], frequencies[i]), 6)
+
+    def test_compound_interest_grid(self):
+        resp = compound_interest_calc(1000, np.arange(1, 31)[:, None], np.linspace(1, 10, 10)[None, :], "monthly")
+
+        assert resp.shape == (30, 10)
+        assert (np.diff(resp, axis=0) > 0).all()
+        assert (np.diff(resp, axis=1) > 0).all()
+
+    def test_compound_interest_with_contributions_broadcast(self):
+        resp = compound_interest_with_contributions_calc(1000, [5, 10], [8, 6], 100, ["monthly", "yearly"])
+
+        assert round(resp[0], 6) == round(compound_interest_with_contributions_calc(1000, 5, 8, 100, "monthly"), 6)
+        assert round(resp[1], 6) == round(compound_interest_with_contributions_calc(1000, 10, 6, 100, "yearly"), 6)
+
+    def test_compound_interest_with_contributions_zero_rate(self):
+        with np.errstate(all="raise"):
+            resp = compound_interest_with_contributions_calc(1000, 10, [0, 5], 100)
+
+        assert resp[0] == 1000 + 100 * 12 * 10
+        assert round(resp[1], 2) == 17175.24
+
+    def test_convert_frequencies(self):
+        assert list(convert_frequencies(["daily", "monthly", "daily"], as_int=True)) == [365, 12, 365]
+        assert convert_frequencies("quarterly") == 4
+
+    def test_convert_frequencies_raises_exception(self):
+        with self.assertRaises(Exception): convert_frequencies(["monthly", "test"])
+
     
     def test_loan_payments_calc_monthly(self):
         assert loan_payments_calc(10000, 5, 7) > 0
@@ -76,19 +118,146 @@ class HelpersTestCase(unittest.TestCase):
     def test_loan_payments_calc_as_table_monthly_as_df(self):
         payments_df = loan_payments_calc_as_table(30000, 6, 4.5)
 
+    def test_loan_payments_calc_as_table_daily(self):
+        payments_df = loan_payments_calc_as_table(300000, 30, 4.5, "daily")
+
+        assert len(payments_df) == 365 * 30
+        assert payments_df["day"].iloc[-1] == 365 * 30
+        assert payments_df["endingBalance"].iloc[-1] == 0
+
+
+    def test_loan_amortization_schedule_recurrence(self):
+        schedule = loan_amortization_schedule(30000, 6, 4.5)
+        rate = 0.045 / 12
+
+        assert len(schedule["period"]) == 72
+        assert schedule["initialBalance"][0] == 30000
+        np.testing.assert_allclose(schedule["interest"], schedule["initialBalance"] * rate)
+        np.testing.assert_allclose(schedule["principal"], schedule["payment"] - schedule["interest"])
+        np.testing.assert_allclose(schedule["endingBalance"], schedule["initialBalance"] - schedule["principal"], atol=1e-6)
+        np.testing.assert_allclose(schedule["initialBalance"][1:], schedule["endingBalance"][:-1])
+        assert round(schedule["endingBalance"][-1], 2) == 0
+
+    def test_loan_amortization_schedule_zero_interest(self):
+        with np.errstate(all="raise"):
+            schedule = loan_amortization_schedule(12000, 1, 0)
+
+        assert all(schedule["interest"] == 0)
+        assert all(schedule["principal"] == 1000)
+        assert round(schedule["payment"][0], 2) == 1000
+        assert list(schedule["endingBalance"][:3]) == [11000, 10000, 9000]
+        assert round(schedule["endingBalance"][-1], 2) == 0
+
+
+    def test_loan_payments_calc_custom_stats(self):
+        stats_df = loan_payments_calc_custom_stats(30000, 6, 4.5, new_rate_of_interest=3.5)
+
+        assert len(stats_df) == 2
+        assert stats_df["totalInterest"].iloc[1] < stats_df["totalInterest"].iloc[0]
+        assert abs(stats_df["totalPayments"].iloc[0] - stats_df["totalInterest"].iloc[0] - 30000) < 1
+
+    def test_loan_payments_calc_custom_stats_rounded_totals(self):
+        stats_df = loan_payments_calc_custom_stats(30000, 5, 5, new_rate_of_interest=3)
+
+        assert stats_df["totalInterest"].iloc[0] == 3968.24
+        assert round(stats_df["totalPayments"].iloc[0], 2) == 33968.4
+
+    def test_loan_payments_calc_custom_multiple_stats(self):
+        stats_df = loan_payments_calc_custom_multiple_stats(30000, 6, 4.5,
+            new_loan_amounts=[25000, 30000],
+            new_number_of_years=[5, 6],
+            new_rate_of_interests=[3, 4.5],
+            new_frequencies=["monthly", "monthly"])
+
+        assert len(stats_df) == 3
+        assert stats_df["description"].iloc[0] == "original loan payments"
+        assert stats_df["totalInterest"].iloc[0] == stats_df["totalInterest"].iloc[2]
+        assert stats_df["totalInterest"].iloc[1] == loan_payments_calc_as_table(25000, 5, 3)["interest"].sum()
+
+    def test_loan_payments_calc_custom_multiple_stats_different_lengths(self):
+        with self.assertRaises(ValueError):
+            loan_payments_calc_custom_multiple_stats(30000, 6, 4.5,
+                new_loan_amounts=[25000, 30000],
+                new_number_of_years=[5],
+                new_rate_of_interests=[3, 4.5],
+                new_frequencies=["monthly", "monthly"])
+
+
+    def test_loan_payments_totals_matches_schedule(self):
+        frequencies = ["daily", "monthly", "quarterly", "half-year", "yearly"]
+        totals = loan_payments_totals(30000, 6, 4.5, frequencies)
+
+        for i, f in enumerate(frequencies):
+            schedule = loan_amortization_schedule(30000, 6, 4.5, f)
+            assert round(totals["totalPayments"][i], 2) == round(schedule["payment"].sum(), 2)
+            assert round(totals["totalInterest"][i], 2) == round(schedule["interest"].sum(), 2)
+
+    def test_loan_payments_totals_broadcast(self):
+        totals = loan_payments_totals(np.full(1000, 200000), 15, np.linspace(2, 8, 1000), "monthly")
+
+        assert totals["payment"].shape == (1000,)
+        assert round(totals["payment"][-1], 2) == round(loan_payments_calc(200000, 15, 8), 2)
+        assert all(np.diff(totals["totalInterest"]) > 0)
+
+    def test_loan_payments_totals_as_json(self):
+        totals = loan_payments_totals([30000, 200000], [6, 15], [4.5, 7.5], ["monthly", "monthly"], as_json=True)
+
+        assert totals["payment"] == [476.22, 1854.02]
+
+    def test_loan_payments_totals_invalid_frequency(self):
+        with self.assertRaises(Exception): loan_payments_totals(30000, 6, 4.5, ["monthly", "weekly"])
+
 
     def test_simple_interest_calc(self):
         assert simple_interest_calc(1000, 15, 5) == 7.5
+    def test_simple_interest_calc_broadcast(self):
+        assert list(simple_interest_calc([1000, 2000], 15, 5)) == [7.5, 15]
 
     
     def test_equated_monthly_installment_calc(self):
         assert equated_monthly_installment_calc(1000, 7.5, 36) > 0
+    def test_equated_monthly_installment_calc_broadcast(self):
+        resp = equated_monthly_installment_calc(1000, [5, 7.5], [[12], [36]])
+
+        assert resp.shape == (2, 2)
+        assert resp[1, 1] == equated_monthly_installment_calc(1000, 7.5, 36)
 
 
     def test_doubling_time_with_continuous_compounding_6_percent(self):
         assert round(doubling_time_with_continuous_compounding(6), 2) == 11.55
     def test_doubling_time_with_continuous_compounding_10_percent(self):
         assert round(doubling_time_with_continuous_compounding(10), 2) == 6.93
+    def test_doubling_time_with_continuous_compounding_broadcast(self):
+        assert list(np.round(doubling_time_with_continuous_compounding([6, 10]), 2)) == [11.55, 6.93]
+
+
+    def test_nper(self):
+        assert round(nper(0.05 / 12, -100, -1000, 10000), 6) == round(float(npf.nper(0.05 / 12, -100, -1000, 10000)), 6)
+    def test_nper_mixed_zero_rate(self):
+        periods = nper(np.array([0, 0.05]) / 12, -100, 0, 10000)
+
+        assert periods[0] == 100
+        assert round(periods[1], 6) == round(float(npf.nper(0.05 / 12, -100, 0, 10000)), 6)
+    def test_nper_broadcast(self):
+        assert nper(np.array([0.01, 0.02])[None, :], -100, 0, np.array([1000, 2000, 3000])[:, None], when="begin").shape == (3, 2)
+
+
+    def test_simulate_returns_shape(self):
+        assert simulate_returns(7, 15, 10, 24, seed=1).shape == (10, 24)
+    def test_simulate_returns_lognormal_moments(self):
+        returns = simulate_returns(7, 15, 20000, 12, "lognormal", seed=1)
+        annual = np.prod(1 + returns, axis=1) - 1
+
+        assert abs(annual.mean() - 0.07) < 0.005
+        assert abs(annual.std() - 0.15) < 0.005
+    def test_simulate_returns_chunked_stream(self):
+        rng = np.random.default_rng(7)
+        chunked = np.vstack([simulate_returns(5, 10, 3, 12, seed=rng), simulate_returns(5, 10, 4, 12, seed=rng)])
+
+        assert np.array_equal(chunked, simulate_returns(5, 10, 7, 12, seed=7))
+    def test_simulate_returns_invalid_distribution(self):
+        with self.assertRaises(ValueError):
+            simulate_returns(7, 15, 10, 12, "uniform")
 
 
     def test_fv(self):
@@ -114,6 +283,107 @@ class HelpersTestCase(unittest.TestCase):
         assert round(fv_res, 2) > 5000
 
 
+    def test_asset_breakdown(self):
+        asset = asset_breakdown(ComparableAsset(value=10000, years=3))
+
+        assert asset.marketValue == 12702.37
+        assert asset.marketBeginWithContributionValue > asset.marketWithContributionValue
+        assert asset.hysValue < asset.marketValue
+        assert asset.marketValueBreakdown["year"] == [1, 2, 3]
+        assert asset.marketValueBreakdown["value"][-1] == asset.marketValue
+        assert asset.hysWithContributionValueBreakdown["contribution"] == [500, 500, 500]
+        assert asset.hysWithContributionValueBreakdown["value"][-1] == asset.hysWithContributionValue
+
+    def test_asset_breakdown_as_records(self):
+        asset = asset_breakdown(ComparableAsset(value=10000, years=3), as_records=True)
+        table = asset_fv_breakdown_as_table(
+            asset_value=10000,
+            contribution=500,
+            years=3,
+            rate=(8 / 100) / 12,
+            frequency=12)
+
+        assert asset.marketWithContributionValueBreakdown == table.to_dict("records")
+
+    def test_asset_breakdown_zero_years(self):
+        asset = asset_breakdown(ComparableAsset(value=10000, years=0))
+
+        assert asset.marketValue == 10000
+        assert asset.marketValueBreakdown["year"] == []
+
+
+    def test_asset_fv_breakdown(self):
+        breakdown = asset_fv_breakdown(10000, 500, 3, 0.08 / 12, 12)
+
+        assert breakdown["year"] == [1, 2, 3]
+        assert breakdown["contribution"] == [500, 500, 500]
+        assert breakdown["rate"] == [0.0067, 0.0067, 0.0067]
+        assert breakdown["value"][-1] == round(fv(8, 3, 500, 10000), 2)
+
+    def test_asset_fv_breakdown_as_arrays(self):
+        breakdown = asset_fv_breakdown(10000, 500, 30, 0.08 / 12, 12, when="begin", as_arrays=True)
+
+        assert breakdown["year"].dtype == int
+        assert breakdown["value"].shape == (30,)
+        assert breakdown["value"][-1] == round(fv(8, 30, 500, 10000, when="begin"), 2)
+
+    def test_asset_fv_breakdown_as_table(self):
+        df = asset_fv_breakdown_as_table(10000, 500, 5, 0.08 / 12, 12)
+
+        assert list(df.columns) == ["year", "contribution", "rate", "value"]
+        assert df["year"].dtype == int
+        assert df.to_dict("list") == asset_fv_breakdown(10000, 500, 5, 0.08 / 12, 12)
+
+
+    def test_export_chunks_csv(self):
+        df = loan_payments_calc_as_table(30000, 6, 4.5)
+        chunks = list(export_chunks(df, format="csv", chunk_size=10))
+
+        assert len(chunks) == 8
+        assert chunks[0].startswith("month,")
+        assert not chunks[1].startswith("month,")
+        assert "".join(chunks) == df.to_csv(index=False)
+
+    def test_export_chunks_ndjson(self):
+        df = loan_payments_calc_as_table(30000, 6, 4.5)
+        lines = "".join(export_chunks(df, format="ndjson", chunk_size=25)).splitlines()
+
+        assert len(lines) == 72
+        assert json.loads(lines[-1])["month"] == 72
+
+    def test_export_chunks_empty(self):
+        df = pd.DataFrame(columns=["year", "value"])
+
+        assert "".join(export_chunks(df)) == "year,value\n"
+        assert "".join(export_chunks(df, format="ndjson")) == ""
+
+    def test_export_chunks_invalid_format(self):
+        with self.assertRaises(ValueError): export_chunks(pd.DataFrame(), format="xml")
+
+    def test_export_chunks_arrow(self):
+        df = loan_payments_calc_as_table(30000, 6, 4.5)
+        chunks = list(export_chunks(df, format="arrow", chunk_size=10))
+        table = pa.ipc.open_stream(b"".join(chunks)).read_all()
+
+        assert all(isinstance(c, bytes) for c in chunks)
+        assert table.num_rows == 72
+        assert table.schema.field("month").type == pa.int64()
+        assert table.schema.field("endingBalance").type == pa.float64()
+        assert table.to_pandas().equals(df)
+
+    def test_export_chunks_parquet(self):
+        df = loan_payments_calc_as_table(30000, 6, 4.5)
+        data = b"".join(export_chunks(df, format="parquet", chunk_size=10))
+
+        assert pq.ParquetFile(io.BytesIO(data)).num_row_groups == 8
+        assert pq.read_table(io.BytesIO(data)).to_pandas().equals(df)
+
+    def test_export_to_csv(self):
+        df = loan_payments_calc_as_table(10000, 6, 7, "yearly")
+
+        assert "".join(export_to_csv(df)) == df.to_csv(index=False)
+
+
     def test_get_current_month_first(self):
         datem = get_current_month_first()
         assert datem is not None
@@ -127,3 +397,31 @@ class HelpersTestCase(unittest.TestCase):
         assert df is not None
         assert df["month"].iloc[0] > 0
         assert df["year"].iloc[0] > 0
+
+
+    def test_assets_to_df(self):
+        df = assets_to_df([
+            Asset(name="checking", typeName="cash", value=1500),
+            Asset(name="brokerage", typeName="stock", value=25000),
+            Asset(name="savings", typeName="cash", value=8000)])
+
+        assert list(df.columns) == ["name", "typeName", "value"]
+        assert df["typeName"].dtype == "category"
+        assert df["value"].dtype == float
+        assert list(df["name"]) == ["checking", "brokerage", "savings"]
+
+    def test_assets_columns_to_df(self):
+        n = 5000
+        type_names = np.array(["cash", "stock", "401(k)", "house"])[np.arange(n) % 4]
+        df = assets_columns_to_df(None, type_names, np.ones(n))
+
+        assert len(df) == n
+        assert list(df["typeName"].cat.categories) == sorted(["cash", "stock", "401(k)", "house"])
+        assert assets_totals_by_type(df) == { "cash": 1250, "stock": 1250, "401(k)": 1250, "house": 1250 }
+
+    def test_assets_columns_to_df_different_lengths(self):
+        with self.assertRaises(ValueError):
+            assets_columns_to_df(["a"], ["cash", "stock"], [1, 2])
+
+    def test_assets_totals_by_type_empty(self):
+        assert assets_totals_by_type(assets_to_df([])) == {}
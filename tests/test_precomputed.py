@@ -0,0 +1,91 @@
+import unittest
+import json
+
+import api.precomputed as precomputed
+
+from api.main import app
+from aiof.fi.core import cost_of_raising_children_faimilies, ten_million_dream
+from fastapi.testclient import TestClient
+from unittest import mock
+
+
+class PrecomputedTestCase(unittest.TestCase):
+    """Precomputed responses unit tests"""
+
+    def test_warm(self):
+        assert precomputed.warm() == len(precomputed._calculators)
+
+    def test_response(self):
+        resp = precomputed.response("fi/cost/of/raising/children/families")
+
+        assert resp.status_code == 200
+        assert resp.headers["etag"].startswith('"')
+        assert json.loads(resp.body) == json.loads(json.dumps(cost_of_raising_children_faimilies()))
+    def test_response_not_modified(self):
+        etag = precomputed.response("frequencies").headers["etag"]
+        resp = precomputed.response("frequencies", if_none_match=etag)
+
+        assert resp.status_code == 304
+        assert resp.body == b""
+        assert resp.headers["etag"] == etag
+    def test_response_modified(self):
+        resp = precomputed.response("frequencies", if_none_match='"stale"')
+
+        assert resp.status_code == 200
+        assert json.loads(resp.body) == precomputed._settings.Frequencies
+
+    def test_serialize_etag_is_stable(self):
+        assert precomputed.serialize({ "a": 1 }) == precomputed.serialize({ "a": 1 })
+        assert precomputed.serialize({ "a": 1 })[1] != precomputed.serialize({ "a": 2 })[1]
+
+    def test_etag_matches(self):
+        assert precomputed.etag_matches('"abc"', '"abc"')
+        assert precomputed.etag_matches('"abc"', 'W/"abc"')
+        assert precomputed.etag_matches('"abc"', '"xyz", "abc"')
+        assert precomputed.etag_matches('"abc"', '*')
+        assert not precomputed.etag_matches('"abc"', '"xyz"')
+        assert not precomputed.etag_matches('"abc"', None)
+
+
+class PrecomputedDefaultBodyTestCase(unittest.TestCase):
+    """Precomputed default-argument responses, through the API"""
+
+    _client = TestClient(app)
+    _routes = [key for key in precomputed._calculators if key.startswith(("fi/", "retirement/")) and key not in (
+        "fi/cost/of/raising/children/families", "fi/ten/million/dream")]
+
+    def test_default_body_registered(self):
+        assert "fi/compound/interest" in self._routes
+        assert "retirement/decumulation/plan" in self._routes
+
+    def test_default_body_matches_live_response(self):
+        for key in self._routes:
+            precomputed_resp = self._client.post("/api/" + key, json={})
+            with mock.patch.object(precomputed, "is_default", return_value=False):
+                live_resp = self._client.post("/api/" + key, json={})
+
+            assert precomputed_resp.status_code == live_resp.status_code == 200, key
+            assert precomputed_resp.headers["etag"] == precomputed.response(key).headers["etag"], key
+            assert "etag" not in live_resp.headers, key
+            assert precomputed_resp.json() == live_resp.json(), key
+    def test_default_body_non_default_is_computed(self):
+        resp = self._client.post("/api/fi/compound/interest", json={ "interest": 8 })
+
+        assert resp.status_code == 200
+        assert "etag" not in resp.headers
+        assert resp.json()[0]["interest"] == 8
+    def test_default_body_non_default_query_is_computed(self):
+        resp = self._client.post("/api/fi/compound/interest/grid?records=true", json={})
+
+        assert "etag" not in resp.headers
+        assert isinstance(resp.json(), list)
+    def test_default_body_invalid_is_still_rejected(self):
+        assert self._client.post("/api/retirement/number/batch", json={ "currentAges": [99] }).status_code == 400
+
+    def test_ten_million_dream_default(self):
+        resp = self._client.get("/api/fi/ten/million/dream/10000")
+        not_modified = self._client.get("/api/fi/ten/million/dream/10000", headers={ "If-None-Match": resp.headers["etag"] })
+
+        assert resp.json() == json.loads(json.dumps(ten_million_dream(10000)))
+        assert not_modified.status_code == 304
+        assert "etag" not in self._client.get("/api/fi/ten/million/dream/5000").headers
@@ -1,6 +1,8 @@
 import unittest
 import json
 import math
+import numpy as np
+import numpy_financial as npf
 
 from aiof.retirement.core import *
 from aiof.data.retirement import CommonInvestmentsRequest, NumberSimpleRequest, NumberRequest
@@ -49,6 +51,40 @@ class RetirementTestCase(unittest.TestCase):
             take_out_percentage = 3.5,
             number_of_years     = 40))
 
+    def test_withdrawal_calc_recurrence(self):
+        df = withdrawal_calc(
+            retirement_number   = 1000000,
+            take_out_percentage = 4,
+            number_of_years     = 30)
+
+        balance = 1000000
+        for year in range(30):
+            balance = (balance - 40000) * 1.07
+            assert df["endingRetirementNumber"].iloc[year] == round(balance, 2)
+        assert (df["startingRetirementNumber"].iloc[1:].values == df["endingRetirementNumber"].iloc[:-1].values).all()
+
+    def test_withdrawal_balances(self):
+        resp = withdrawal_balances(
+            retirement_numbers      = [1000000, 2000000, 500000],
+            take_out_percentages    = [4, 3, 8],
+            number_of_years         = 40,
+            interests               = [7, 5, 7],
+            as_arrays               = True)
+
+        assert resp["endingRetirementNumber"].shape == (3, 40)
+        for i, (b, w, r) in enumerate([(1000000, 40000, 0.07), (2000000, 60000, 0.05), (500000, 40000, 0.07)]):
+            for year in range(40):
+                assert np.isclose(resp["startingRetirementNumber"][i, year], b)
+                b = (b - w) * (1 + r)
+                assert np.isclose(resp["endingRetirementNumber"][i, year], b)
+    def test_withdrawal_balances_zero_interest(self):
+        resp = withdrawal_balances(retirement_numbers=[100000], take_out_percentages=[10], number_of_years=10, interests=[0])
+
+        assert resp["endingRetirementNumber"][0] == [100000 - 10000 * year for year in range(1, 11)]
+    def test_withdrawal_balances_number_of_years_bigger_than_100(self):
+        with self.assertRaises(ValueError):
+            withdrawal_balances(number_of_years=101)
+
     def test_withdrawal_calc_retirement_number_0(self):
         with self.assertRaises(ValueError): 
             withdrawal_calc(
@@ -344,6 +380,71 @@ class RetirementTestCase(unittest.TestCase):
             assert df.loc[i, "total"] >= 0
             assert df.loc[i, "totalMonthlyContributions"] >= 0
 
+    def test_investment_accounts_matches_common_investments(self):
+        req = self.common_investments_req
+        df = investment_accounts(
+            names                   = ["fourohoneK", "rothIra", "brokerage"],
+            starting_amounts        = [req.fourOhOneKStartingAmount, req.rothIraStartingAmount, req.brokerageStartingAmount],
+            monthly_contributions   = [req.fourOhOneKMonthlyContributions, req.rothIraMonthlyContributions, req.brokerageMonthlyContributions],
+            interests               = [req.interest],
+            start_year              = req.startYear,
+            end_year                = req.endYear,
+            compouding_periods      = req.compoundingPeriods)
+
+        assert len(df) == req.endYear - req.startYear + 1
+        for i in range(1, len(df)):
+            expected = -npf.fv(req.interest / 100 / 12, 12, req.rothIraMonthlyContributions, df.loc[i - 1, "rothIra"])
+            assert abs(df.loc[i, "rothIra"] - expected) < 0.02
+        self.assert_common_investments(df)
+
+    def test_investment_accounts_many_accounts(self):
+        arrays = investment_accounts(
+            starting_amounts        = [0, 1000, 5000, 200, 0, 10000, 50, 0],
+            monthly_contributions   = [100, 200, 300, 400, 0, 600, 700, 800],
+            interests               = [0, 2, 4, 6, 8, 10, 12, 14],
+            contribution_growths    = [0, 3, 0, 0, 0, 0, 0, 0],
+            start_year              = 2025,
+            end_year                = 2055,
+            as_arrays               = True)
+
+        assert arrays["names"] == [f"account{i}" for i in range(1, 9)]
+        assert arrays["balances"].shape == arrays["monthlyContributions"].shape == (31, 8)
+        # 0% interest only adds up the contributions
+        assert np.isclose(arrays["balances"][-1, 0], 100 * 12 * 30)
+        # Contributions grow 3% a year, starting with the second year
+        assert np.isclose(arrays["monthlyContributions"][2, 1], 200 * 1.03)
+
+    def test_investment_accounts_step(self):
+        arrays = investment_accounts(
+            starting_amounts        = [1000],
+            monthly_contributions   = [100],
+            interests               = [6],
+            contribution_growths    = [5],
+            compouding_periods      = 4,
+            as_arrays               = True)
+        balances, contributions = arrays["balances"][:, 0], arrays["monthlyContributions"][:, 0]
+
+        for i in range(1, len(balances)):
+            assert np.isclose(balances[i], -npf.fv(0.015, 4, contributions[i], balances[i - 1]))
+
+    def test_investment_accounts_names_mismatch_raises_valueerror(self):
+        with self.assertRaises(ValueError):
+            investment_accounts(names=["hsa"], starting_amounts=[0, 1])
+    
+    def test_investment_accounts_duplicate_names_raises_valueerror(self):
+        with self.assertRaises(ValueError):
+            investment_accounts(names=["hsa", "hsa"], starting_amounts=[0, 1])
+
+    def test_investment_accounts_reserved_names_raises_valueerror(self):
+        for names in [["year", "hsa"], ["total", "hsa"], ["compoundingPeriods", "hsa"],
+            ["totalMonthlyContributions", "hsa"], ["hsa", "hsaMonthlyContributions"]]:
+            with self.assertRaises(ValueError):
+                investment_accounts(names=names, starting_amounts=[0, 1])
+
+    def test_investment_accounts_negative_contributions_raises_valueerror(self):
+        with self.assertRaises(ValueError):
+            investment_accounts(monthly_contributions=[100, -100])
+
 
     def test_number_simple_defaults(self):
         res = number_simple(current_salary = self.number_simple_req.currentSalary)
@@ -404,6 +505,45 @@ class RetirementTestCase(unittest.TestCase):
                 desired_monthly_income  =   self.number_req.desiredMonthlyIncome,
                 retirement_end_age      =   self.number_req.retirementEndAge * 0)
 
+    def test_number_batch_defaults(self):
+        resp = number_batch()
+
+        assert resp["firstYearIncome"] == [round(5000 * 12 * 1.03 ** 30, 2)]
+        assert resp["retirementNumber"][0] > resp["realRetirementNumber"][0] > resp["presentValue"][0] > 0
+    def test_number_batch_matches_number(self):
+        resp = number_batch(
+            current_ages            = [30, 40, 50],
+            desired_retirement_ages = [self.number_req.desiredRetirementAge],
+            retirement_end_ages     = [self.number_req.retirementEndAge],
+            desired_monthly_incomes = [self.number_req.desiredMonthlyIncome],
+            inflations              = [0],
+            interests               = [0])
+
+        expected = number(
+            desired_retirement_age  = self.number_req.desiredRetirementAge,
+            desired_monthly_income  = self.number_req.desiredMonthlyIncome,
+            retirement_end_age      = self.number_req.retirementEndAge)
+        assert resp["retirementNumber"] == [expected] * 3
+    def test_number_batch_growing_annuity(self):
+        arrays = number_batch(
+            current_ages            = [40],
+            desired_monthly_incomes = [4000, 8000],
+            inflations              = [2, 3],
+            interests               = [6, 3],
+            as_arrays               = True)
+
+        for i, (g, r) in enumerate([(0.02, 0.06), (0.03, 0.03)]):
+            income = arrays["firstYearIncome"][i]
+            expected = sum(income * (1 + g) ** k / (1 + r) ** k for k in range(30))
+            assert abs(arrays["retirementNumber"][i] - expected) < 0.05
+        assert np.isclose(arrays["firstYearIncome"][1], 8000 * 12 * 1.03 ** 25, atol=0.01)
+    def test_number_batch_retirement_age_smaller_than_current_age_raises_valueerror(self):
+        with self.assertRaises(ValueError):
+            number_batch(current_ages=[70])
+    def test_number_batch_negative_income_raises_valueerror(self):
+        with self.assertRaises(ValueError):
+            number_batch(desired_monthly_incomes=[5000, -1])
+
     def assert_number(self, number):
         assert number is not None
         assert number > 0
\ No newline at end of file
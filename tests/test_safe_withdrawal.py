@@ -0,0 +1,60 @@
+import unittest
+import numpy as np
+
+from aiof.retirement.core import withdrawal_calc
+from aiof.retirement.backtest import withdrawal_backtest
+from aiof.retirement.safe_withdrawal import *
+
+
+class SafeWithdrawalTestCase(unittest.TestCase):
+    """
+    Safe withdrawal rate unit tests
+    """
+
+    def test_sustainable_rates(self):
+        rates = sustainable_rates(np.zeros((1, 4)))
+
+        assert np.allclose(rates, [[1, 1 / 2, 1 / 3, 1 / 4]])
+    def test_sustainable_rates_inflation(self):
+        rates = sustainable_rates(np.zeros(3), np.full(3, 0.1))
+
+        assert np.isclose(rates[-1], 1 / (1 + 1.1 + 1.21))
+
+    def test_rate_at_success(self):
+        rates = np.array([[0.01, 0.02, 0.03, 0.04], [0.01, 0.02, np.nan, np.nan]])
+
+        assert rate_at_success(rates, np.array([75, 100])).tolist() == [0.02, 0.01]
+
+    def test_safe_withdrawal_rate_deterministic(self):
+        resp = safe_withdrawal_rate(numbers_of_years=[20, 35])
+
+        for rate, years in zip(resp["takeOutPercentages"], resp["numbersOfYears"]):
+            assert withdrawal_calc(1000000, rate - 0.01, years)["endingRetirementNumber"].iloc[-1] > 0
+            assert withdrawal_calc(1000000, rate + 0.01, years)["endingRetirementNumber"].iloc[-1] < 0
+    def test_safe_withdrawal_rate_historical(self):
+        resp = safe_withdrawal_rate(method="historical", numbers_of_years=[30, 20], success_rates=[95, 90], stocks_allocations=[60, 100])
+
+        for rate, years, success, allocation in zip(
+            resp["takeOutPercentages"], resp["numbersOfYears"], resp["successRates"], resp["stocksAllocations"]):
+            assert withdrawal_backtest(take_out_percentage=rate - 0.01, number_of_years=years, stocks_allocation=allocation, as_json=True)["successRate"] >= success
+            assert withdrawal_backtest(take_out_percentage=rate + 0.02, number_of_years=years, stocks_allocation=allocation, as_json=True)["successRate"] < success
+    def test_safe_withdrawal_rate_simulated(self):
+        resp = safe_withdrawal_rate(method="simulated", numbers_of_years=[20, 30, 40], paths=2000, seed=1)
+
+        assert resp["takeOutPercentages"] == sorted(resp["takeOutPercentages"], reverse=True)
+        assert resp == safe_withdrawal_rate(method="simulated", numbers_of_years=[20, 30, 40], paths=2000, seed=1)
+    def test_safe_withdrawal_rate_higher_success_is_lower_rate(self):
+        resp = safe_withdrawal_rate(method="historical", success_rates=[50, 90, 100])
+
+        assert resp["takeOutPercentages"] == sorted(resp["takeOutPercentages"], reverse=True)
+    def test_safe_withdrawal_rate_invalid_method(self):
+        with self.assertRaises(ValueError):
+            safe_withdrawal_rate(method="guess")
+    def test_safe_withdrawal_rate_invalid_success_rate(self):
+        for success_rate in [0, -5, 100.5]:
+            with self.assertRaisesRegex(ValueError, "greater than 0 and at most 100"):
+                safe_withdrawal_rate(success_rates=[success_rate])
+    def test_safe_withdrawal_rate_fractional_success_rate(self):
+        resp = safe_withdrawal_rate(success_rates=[0.5, 100])
+
+        assert resp["successRates"] == [0.5, 100]
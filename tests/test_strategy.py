@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+from aiof.retirement.core import withdrawal_calc
+from aiof.retirement.backtest import withdrawal_backtest
+from aiof.retirement.strategy import *
+
+
+class StrategyTestCase(unittest.TestCase):
+    """
+    Withdrawal strategy unit tests
+    """
+    _returns = np.random.default_rng(1).normal(0.05, 0.12, (500, 30))
+
+    def test_run_strategy_constant_dollar_matches_withdrawal_calc(self):
+        run = run_strategy("constant_dollar", np.full((3, 30), 0.07), 1000000, 4)
+
+        assert run["endingBalances"].shape == (3, 30)
+        assert np.allclose(run["endingBalances"][0], withdrawal_calc(1000000, 4, 30)["endingRetirementNumber"], atol=0.01)
+    def test_run_strategy_constant_dollar_inflation(self):
+        run = run_strategy("constant_dollar", np.zeros((1, 3)), 1000000, 4, inflation=np.full((1, 3), 0.1))
+
+        assert np.allclose(run["withdrawals"][0], [40000, 44000, 48400])
+    def test_run_strategy_constant_percentage(self):
+        run = run_strategy("constant_percentage", self._returns, 1000000, 5)
+        starting = np.concatenate((np.full((500, 1), 1000000), run["endingBalances"][:, :-1]), axis=1)
+
+        assert np.allclose(run["withdrawals"], starting * 0.05)
+    def test_run_strategy_vpw_spends_everything(self):
+        run = run_strategy("vpw", np.full((2, 20), 0.05), 1000000, 4, expected_return=5)
+
+        assert np.allclose(run["endingBalances"][:, -1], 0, atol=1e-6)
+        assert np.allclose(run["withdrawals"], run["withdrawals"][0, 0])
+    def test_run_strategy_floor_ceiling(self):
+        run = run_strategy("floor_ceiling", self._returns, 1000000, 4, floor=90, ceiling=110)
+        funded = run["withdrawals"] == run["plannedWithdrawals"]
+
+        assert (run["withdrawals"][funded] >= 36000 - 1e-6).all()
+        assert (run["withdrawals"] <= 44000 + 1e-6).all()
+    def test_run_strategy_guyton_klinger_guardrails(self):
+        crash = np.concatenate((np.full((1, 1), -0.5), np.zeros((1, 29))), axis=1)
+        run = run_strategy("guyton_klinger", crash, 1000000, 4)
+
+        # Year 2 is frozen after a negative return and then cut by the capital preservation rule
+        assert np.isclose(run["plannedWithdrawals"][0, 1], 36000)
+    def test_run_strategy_invalid(self):
+        with self.assertRaises(ValueError):
+            run_strategy("yolo", self._returns)
+
+    def test_compare_strategies_simulated(self):
+        resp = compare_strategies(paths=1000, seed=1)
+
+        assert [s["strategy"] for s in resp["strategies"]] == list(strategies)
+        rates = { s["strategy"]: s["successRate"] for s in resp["strategies"] }
+        assert rates["constant_percentage"] == rates["vpw"] == 100
+        assert resp == compare_strategies(paths=1000, seed=1)
+    def test_compare_strategies_historical(self):
+        resp = compare_strategies(strategy_names=["constant_dollar"], method="historical")
+
+        assert resp["strategies"][0]["successRate"] == withdrawal_backtest(as_json=True)["successRate"]
+    def test_compare_strategies_params(self):
+        resp = compare_strategies(
+            strategy_names=["floor_ceiling"], 
+            paths=500, 
+            seed=1, 
+            params={ "floor_ceiling": { "floor": 100, "ceiling": 100 } })
+        constant = compare_strategies(strategy_names=["constant_dollar"], paths=500, seed=1)
+
+        assert resp["strategies"][0]["successRate"] == constant["strategies"][0]["successRate"]
+    def test_compare_strategies_unknown_params_raises_valueerror(self):
+        with self.assertRaises(ValueError):
+            compare_strategies(paths=10, params={ "floor_ceiling": { "flor": 90 } })
+        with self.assertRaises(ValueError):
+            compare_strategies(paths=10, params={ "yolo": {} })
+    def test_compare_strategies_paths_0_raises_valueerror(self):
+        with self.assertRaises(ValueError):
+            compare_strategies(paths=0)
+    def test_compare_strategies_stocks_allocation_out_of_range_raises_valueerror(self):
+        with self.assertRaises(ValueError):
+            compare_strategies(method="historical", stocks_allocation=150)
+        with self.assertRaises(ValueError):
+            compare_strategies(method="historical", stocks_allocation=-10)
+    def test_compare_strategies_returns_path(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "returns.csv")
+            pd.DataFrame({ "year": [2000, 2001, 2002], "stocks": [-50, -50, -50], "bonds": [0, 0, 0], "inflation": [0, 0, 0] }).to_csv(path, index=False)
+            resp = compare_strategies(
+                strategy_names      = ["constant_dollar"],
+                take_out_percentage = 40,
+                number_of_years     = 2,
+                method              = "historical",
+                stocks_allocation   = 100,
+                returns_path        = path)
+
+        # 2 windows, both run out in the second year
+        assert resp["paths"] == 2
+        assert resp["strategies"][0]["successRate"] == 0
+
+    def test_strategy_parameters(self):
+        assert strategy_parameters("floor_ceiling") == ["floor", "ceiling"]
+        assert strategy_parameters("constant_dollar") == []
+    def test_withdrawal_strategies_request_has_no_returns_path(self):
+        from aiof.data.retirement import WithdrawalStrategiesRequest
+
+        # Custom historical returns are operator only, through `Settings.HistoricalReturnsPath`
+        assert "returnsPath" not in WithdrawalStrategiesRequest.__fields__